@@ -5,30 +5,34 @@ This script:
 - Initializes logging
 - Creates the WebSocket client
 - Starts data ingestion
-- Displays live trade data
+- Traces live trade data (TICK logger, DEBUG)
 - Handles graceful shutdown on Ctrl+C
 """
 
 import asyncio
 import logging
 import signal
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 
 from src.config import (
     ANALYTICS_UPDATE_INTERVAL,
     DATABASE_PATH,
+    INGEST_BATCH_MAX_DELAY,
+    INGEST_BATCH_MAX_TICKS,
     LOG_DATE_FORMAT,
     LOG_FORMAT,
     LOG_LEVEL,
     RESAMPLE_INTERVALS,
     STATUS_UPDATE_INTERVAL,
     SYMBOLS,
+    TICK_LOG_LEVEL,
 )
 from src.ingestion import BinanceWebSocketClient
 from src.storage import DatabaseManager
 from src.analytics.resampler import TickResampler  # Direct import to avoid circular dependency
-from src.analytics.engine import AnalyticsEngine  # Phase 3: Analytics orchestrator
+from src.analytics.engine import run_analytics_once, warm_up_analytics  # Phase 3: Analytics orchestrator
 
 
 def setup_logging() -> None:
@@ -38,15 +42,18 @@ def setup_logging() -> None:
         format=LOG_FORMAT,
         datefmt=LOG_DATE_FORMAT,
     )
+    
+    # Raw tick traces are off unless explicitly enabled
+    logging.getLogger("TICK").setLevel(TICK_LOG_LEVEL)
 
 
 async def resample_and_persist(client: BinanceWebSocketClient, db: DatabaseManager) -> None:
     """
-    Consume ticks from WebSocket queues, persist to database, and generate OHLC bars.
+    Consume ticks from the WebSocket fan-in queue, persist to database, and generate OHLC bars.
     
     This task replaces the display_ticks task from Phase 1.
     It handles:
-    - Tick persistence (batched for performance)
+    - Tick persistence (micro-batched: one transaction per drained batch)
     - OHLC bar generation (1s, 1m, 5m intervals)
     - Logging of finalized bars
     
@@ -56,22 +63,39 @@ async def resample_and_persist(client: BinanceWebSocketClient, db: DatabaseManag
     """
     resampler = TickResampler(db, RESAMPLE_INTERVALS)
     logger = logging.getLogger("TICK")
+    loop = asyncio.get_running_loop()
     
-    while True:
-        for symbol in client.symbols:
+    try:
+        while True:
+            # Block on the shared fan-in queue - no polling, no timeouts
+            batch = [await client.fanin.get()]
+            
+            # Drain whatever else is already queued into the same batch
+            batch_start = loop.time()
+            while (
+                len(batch) < INGEST_BATCH_MAX_TICKS
+                and loop.time() - batch_start < INGEST_BATCH_MAX_DELAY
+            ):
+                try:
+                    batch.append(client.fanin.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
             try:
-                tick = await client.get_next_tick(symbol, timeout=0.01)
-                if tick:
-                    # Log tick to console (Phase 1 behavior preserved)
-                    logger.info(str(tick))
-                    
-                    # Process tick: persist + resample (Phase 2)
-                    await resampler.process_tick(tick)
-                    
+                # Trace ticks only when the TICK logger is at DEBUG
+                if logger.isEnabledFor(logging.DEBUG):
+                    for tick in batch:
+                        logger.debug("%s", tick)
+                
+                # Process batch: persist in one transaction + resample (Phase 2)
+                await resampler.process_batch(batch)
+                
             except Exception as e:
-                logging.error(f"Error processing tick for {symbol.upper()}: {e}")
-        
-        await asyncio.sleep(0.001)
+                logging.error(f"Error processing batch of {len(batch)} ticks: {e}")
+    
+    finally:
+        # Write bars already finalized but still waiting for a batch
+        await resampler.flush_bars()
 
 
 async def print_status(client: BinanceWebSocketClient) -> None:
@@ -86,14 +110,17 @@ async def print_status(client: BinanceWebSocketClient) -> None:
     while True:
         await asyncio.sleep(STATUS_UPDATE_INTERVAL)
         
-        counts = client.get_tick_counts()
-        status_parts = [f"{symbol.upper()}: {count} ticks" for symbol, count in counts.items()]
-        status = "Status - " + ", ".join(status_parts)
-        
-        logger.info(status)
+        logger.info(client.format_status())
+
+
+def init_analytics_worker() -> None:
+    """Analytics worker process setup: logging, JIT warm-up, and leave Ctrl+C to the parent."""
+    setup_logging()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    warm_up_analytics()
 
 
-async def analytics_update_task(db: DatabaseManager) -> None:
+async def analytics_update_task(pool: ProcessPoolExecutor) -> None:
     """
     Background task to periodically compute and cache analytics.
     
@@ -101,16 +128,27 @@ async def analytics_update_task(db: DatabaseManager) -> None:
     - Price/volume statistics for all symbols
     - Pairs trading analytics (regression, spread, z-score, ADF, correlation)
     
-    Results are cached to provide fast API responses.
+    The computation runs in a worker process with its own read-only
+    database connection, so it never blocks tick ingestion on this loop.
     
     Args:
-        db: Database manager instance
+        pool: Single-worker process pool for analytics
     """
     logger = logging.getLogger("ANALYTICS")
     logger.info("Starting analytics engine")
+    loop = asyncio.get_running_loop()
+    
+    # Wait for initial data to accumulate
+    await asyncio.sleep(60)
+    logger.info("Initial data collection period complete, starting analytics updates")
     
-    engine = AnalyticsEngine(db)
-    await engine.update_analytics_loop(interval_seconds=ANALYTICS_UPDATE_INTERVAL)
+    while True:
+        try:
+            await loop.run_in_executor(pool, run_analytics_once, DATABASE_PATH)
+        except Exception as e:
+            logger.error(f"Analytics update error: {e}")
+        
+        await asyncio.sleep(ANALYTICS_UPDATE_INTERVAL)
 
 
 async def main() -> None:
@@ -130,6 +168,9 @@ async def main() -> None:
     # Create WebSocket client
     client = BinanceWebSocketClient(SYMBOLS)
     
+    # Analytics run out of process (CPU-bound work off the ingest loop)
+    analytics_pool = ProcessPoolExecutor(max_workers=1, initializer=init_analytics_worker)
+    
     # Setup shutdown event
     shutdown_event = asyncio.Event()
     
@@ -149,7 +190,7 @@ async def main() -> None:
         
         # Create tasks for resampling, analytics, and status
         resample_task = asyncio.create_task(resample_and_persist(client, db))
-        analytics_task = asyncio.create_task(analytics_update_task(db))  # Phase 3
+        analytics_task = asyncio.create_task(analytics_update_task(analytics_pool))  # Phase 3
         status_task = asyncio.create_task(print_status(client))
         
         # Wait for shutdown signal
@@ -160,18 +201,22 @@ async def main() -> None:
         analytics_task.cancel()
         status_task.cancel()
         
-        # Wait for tasks to complete
-        await asyncio.gather(
-            resample_task,
-            analytics_task,
-            status_task,
-            return_exceptions=True
+        # Wait (bounded) for tasks to unwind; db.close() drains its own writer
+        done, pending = await asyncio.wait(
+            {resample_task, analytics_task, status_task},
+            timeout=5.0,
+            return_when=asyncio.ALL_COMPLETED
         )
+        for task in pending:
+            logger.warning(f"Task still running at shutdown: {task.get_coro().__name__}")
         
     finally:
         # Stop WebSocket client
         await client.stop()
         
+        # Don't wait for an in-flight analytics cycle
+        analytics_pool.shutdown(wait=False)
+        
         # Close database (will flush remaining ticks)
         await db.close()
         
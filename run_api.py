@@ -6,7 +6,7 @@ Usage:
 """
 
 import logging
-from src.api.flask_server import app
+from src.api.flask_server import app, close_resources
 from src.config import FLASK_HOST, FLASK_PORT, FLASK_DEBUG
 
 if __name__ == '__main__':
@@ -25,8 +25,11 @@ if __name__ == '__main__':
     print("   GET /api/export/csv/<x>/<y> - Export CSV")
     print()
     
-    app.run(
-        host=FLASK_HOST,
-        port=FLASK_PORT,
-        debug=FLASK_DEBUG
-    )
+    try:
+        app.run(
+            host=FLASK_HOST,
+            port=FLASK_PORT,
+            debug=FLASK_DEBUG
+        )
+    finally:
+        close_resources()
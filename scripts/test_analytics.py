@@ -16,6 +16,9 @@ Usage:
 import asyncio
 import sys
 from pathlib import Path
+from typing import List
+
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -27,11 +30,13 @@ from src.config import DATABASE_PATH
 
 async def test_analytics():
     """Run comprehensive analytics tests."""
+    # Report lines are collected and written in one go at the end
+    out: List[str] = [""]
     
-    print("=" * 80)
-    print("CRYPTO ANALYTICS PLATFORM - Phase 3 Analytics Test")
-    print("=" * 80)
-    print()
+    out.append("=" * 80)
+    out.append("CRYPTO ANALYTICS PLATFORM - Phase 3 Analytics Test")
+    out.append("=" * 80)
+    out.append("")
     
     try:
         # Initialize database and engine
@@ -43,8 +48,8 @@ async def test_analytics():
         # =====================================================================
         # Test 1: Single Symbol Analytics (BTCUSDT)
         # =====================================================================
-        print("📊 TEST 1: Single Symbol Analytics - BTCUSDT")
-        print("-" * 80)
+        out.append("📊 TEST 1: Single Symbol Analytics - BTCUSDT")
+        out.append("-" * 80)
         
         btc_analytics = await engine.get_symbol_analytics("BTCUSDT", "1m")
         
@@ -52,53 +57,53 @@ async def test_analytics():
             stats = btc_analytics['stats']
             vol_stats = btc_analytics['volume_stats']
             
-            print(f"✅ Price Statistics:")
-            print(f"   Symbol: {stats.symbol}")
-            print(f"   Interval: {stats.interval}")
-            print(f"   Window: {stats.window_size} bars")
-            print(f"   Mean: ${stats.mean:,.2f}")
-            print(f"   Std Dev: ${stats.std:,.2f}")
-            print(f"   Min: ${stats.min:,.2f}")
-            print(f"   Max: ${stats.max:,.2f}")
-            print(f"   Current: ${stats.current:,.2f}")
-            print(f"   Change: {stats.change_pct:+.2f}%")
-            print()
+            out.append(f"✅ Price Statistics:")
+            out.append(f"   Symbol: {stats.symbol}")
+            out.append(f"   Interval: {stats.interval}")
+            out.append(f"   Window: {stats.window_size} bars")
+            out.append(f"   Mean: ${stats.mean:,.2f}")
+            out.append(f"   Std Dev: ${stats.std:,.2f}")
+            out.append(f"   Min: ${stats.min:,.2f}")
+            out.append(f"   Max: ${stats.max:,.2f}")
+            out.append(f"   Current: ${stats.current:,.2f}")
+            out.append(f"   Change: {stats.change_pct:+.2f}%")
+            out.append("")
             
-            print(f"✅ Volume Statistics:")
-            print(f"   Mean Volume: {vol_stats.mean_volume:.6f}")
-            print(f"   Std Volume: {vol_stats.std_volume:.6f}")
-            print(f"   Total Volume: {vol_stats.total_volume:.6f}")
+            out.append(f"✅ Volume Statistics:")
+            out.append(f"   Mean Volume: {vol_stats.mean_volume:.6f}")
+            out.append(f"   Std Volume: {vol_stats.std_volume:.6f}")
+            out.append(f"   Total Volume: {vol_stats.total_volume:.6f}")
         else:
-            print("❌ FAIL: Insufficient data for BTCUSDT analytics")
-            print("   Please run main.py for at least 5 minutes")
+            out.append("❌ FAIL: Insufficient data for BTCUSDT analytics")
+            out.append("   Please run main.py for at least 5 minutes")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Test 2: Single Symbol Analytics (ETHUSDT)
         # =====================================================================
-        print("📊 TEST 2: Single Symbol Analytics - ETHUSDT")
-        print("-" * 80)
+        out.append("📊 TEST 2: Single Symbol Analytics - ETHUSDT")
+        out.append("-" * 80)
         
         eth_analytics = await engine.get_symbol_analytics("ETHUSDT", "1m")
         
         if eth_analytics:
             stats = eth_analytics['stats']
-            print(f"✅ Price Statistics:")
-            print(f"   Mean: ${stats.mean:,.2f}")
-            print(f"   Std Dev: ${stats.std:,.2f}")
-            print(f"   Current: ${stats.current:,.2f}")
-            print(f"   Change: {stats.change_pct:+.2f}%")
+            out.append(f"✅ Price Statistics:")
+            out.append(f"   Mean: ${stats.mean:,.2f}")
+            out.append(f"   Std Dev: ${stats.std:,.2f}")
+            out.append(f"   Current: ${stats.current:,.2f}")
+            out.append(f"   Change: {stats.change_pct:+.2f}%")
         else:
-            print("❌ FAIL: Insufficient data for ETHUSDT analytics")
+            out.append("❌ FAIL: Insufficient data for ETHUSDT analytics")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Test 3: Pairs Trading Analytics (BTC-ETH)
         # =====================================================================
-        print("📈 TEST 3: Pairs Trading Analytics - BTCUSDT vs ETHUSDT")
-        print("-" * 80)
+        out.append("📈 TEST 3: Pairs Trading Analytics - BTCUSDT vs ETHUSDT")
+        out.append("-" * 80)
         
         pairs = await engine.get_pairs_analytics("BTCUSDT", "ETHUSDT", "1m")
         
@@ -109,29 +114,29 @@ async def test_analytics():
             adf = pairs['adf_test']
             corr = pairs['correlation']
             
-            print(f"✅ OLS Regression:")
-            print(f"   Equation: {regression.symbol_y} = "
-                  f"{regression.intercept:.2f} + "
-                  f"{regression.hedge_ratio:.6f} × {regression.symbol_x}")
-            print(f"   Hedge Ratio (β): {regression.hedge_ratio:.6f}")
-            print(f"     → If BTC moves $1, ETH moves ${regression.hedge_ratio:.6f}")
-            print(f"   R² (fit): {regression.r_squared:.4f}")
-            print(f"     →{regression.r_squared * 100:.2f}% of ETH variance explained by BTC")
-            print(f"   Std Error: {regression.std_error:.4f}")
-            print()
+            out.append(f"✅ OLS Regression:")
+            out.append(f"   Equation: {regression.symbol_y} = "
+                       f"{regression.intercept:.2f} + "
+                       f"{regression.hedge_ratio:.6f} × {regression.symbol_x}")
+            out.append(f"   Hedge Ratio (β): {regression.hedge_ratio:.6f}")
+            out.append(f"     → If BTC moves $1, ETH moves ${regression.hedge_ratio:.6f}")
+            out.append(f"   R² (fit): {regression.r_squared:.4f}")
+            out.append(f"     →{regression.r_squared * 100:.2f}% of ETH variance explained by BTC")
+            out.append(f"   Std Error: {regression.std_error:.4f}")
+            out.append("")
             
-            print(f"✅ Spread Analysis:")
-            print(f"   Data Points: {len(spread)}")
-            if spread:
-                print(f"   Latest Spread: ${spread[-1]:.2f}")
-                print(f"   Mean Spread: ${sum(spread)/len(spread):.2f}")
-            print()
+            out.append(f"✅ Spread Analysis:")
+            out.append(f"   Data Points: {spread.size}")
+            if spread.size:
+                out.append(f"   Latest Spread: ${spread[-1]:.2f}")
+                out.append(f"   Mean Spread: ${spread.mean():.2f}")
+            out.append("")
             
-            print(f"✅ Z-Score (Trading Signal):")
-            valid_z = [z for z in z_scores if not str(z) == 'nan']
-            if valid_z:
+            out.append(f"✅ Z-Score (Trading Signal):")
+            valid_z = z_scores[~np.isnan(z_scores)]
+            if valid_z.size:
                 latest_z = valid_z[-1]
-                print(f"   Latest Z-Score: {latest_z:.2f}")
+                out.append(f"   Latest Z-Score: {latest_z:.2f}")
                 
                 if latest_z > 2:
                     signal = "🔴 OVERBOUGHT - Consider shorting spread"
@@ -142,29 +147,29 @@ async def test_analytics():
                 else:
                     signal = "🟡 NEUTRAL - Watch for extremes"
                 
-                print(f"   Signal: {signal}")
-            print()
+                out.append(f"   Signal: {signal}")
+            out.append("")
             
             if adf:
-                print(f"✅ ADF Stationarity Test:")
-                print(f"   Test Statistic: {adf.test_statistic:.4f}")
-                print(f"   P-Value: {adf.p_value:.4f}")
-                print(f"   Critical Values:")
+                out.append(f"✅ ADF Stationarity Test:")
+                out.append(f"   Test Statistic: {adf.test_statistic:.4f}")
+                out.append(f"   P-Value: {adf.p_value:.4f}")
+                out.append(f"   Critical Values:")
                 for level, value in adf.critical_values.items():
-                    print(f"     {level:>4}: {value:.4f}")
-                print(f"   Result: {'✅ STATIONARY' if adf.is_stationary else '❌ NON-STATIONARY'}")
+                    out.append(f"     {level:>4}: {value:.4f}")
+                out.append(f"   Result: {'✅ STATIONARY' if adf.is_stationary else '❌ NON-STATIONARY'}")
                 if adf.is_stationary:
-                    print(f"   → Spread is mean-reverting, suitable for pairs trading!")
+                    out.append(f"   → Spread is mean-reverting, suitable for pairs trading!")
                 else:
-                    print(f"   → Spread may not be mean-reverting, use caution")
-                print()
-                print(f"   Interpretation:")
-                print(f"   {adf.interpretation}")
-            print()
+                    out.append(f"   → Spread may not be mean-reverting, use caution")
+                out.append("")
+                out.append(f"   Interpretation:")
+                out.append(f"   {adf.interpretation}")
+            out.append("")
             
             if corr:
-                print(f"✅ Correlation Analysis:")
-                print(f"   Latest Correlation: {corr.correlation:.4f}")
+                out.append(f"✅ Correlation Analysis:")
+                out.append(f"   Latest Correlation: {corr.correlation:.4f}")
                 
                 if corr.correlation > 0.8:
                     strength = "🟢 VERY STRONG positive"
@@ -177,63 +182,65 @@ async def test_analytics():
                 else:
                     strength = "🔴 STRONG negative"
                 
-                print(f"   Strength: {strength}")
-                print(f"   History Points: {len(corr.correlation_history)}")
+                out.append(f"   Strength: {strength}")
+                out.append(f"   History Points: {corr.correlation_history_values.size}")
             
         else:
-            print("❌ FAIL: Insufficient data for pairs analytics")
-            print("   Please run main.py for at least 5 minutes to collect enough data")
-            print("   Required: ~30 aligned 1m OHLC bars for BTCUSDT and ETHUSDT")
+            out.append("❌ FAIL: Insufficient data for pairs analytics")
+            out.append("   Please run main.py for at least 5 minutes to collect enough data")
+            out.append("   Required: ~30 aligned 1m OHLC bars for BTCUSDT and ETHUSDT")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Summary
         # =====================================================================
-        print("=" * 80)
-        print("TEST SUMMARY")
-        print("=" * 80)
+        out.append("=" * 80)
+        out.append("TEST SUMMARY")
+        out.append("=" * 80)
         
         if btc_analytics and eth_analytics and pairs:
-            print("✅ ALL TESTS PASSED!")
-            print()
-            print("Phase 3 Analytics Engine is working correctly!")
-            print()
-            print("Key Metrics:")
+            out.append("✅ ALL TESTS PASSED!")
+            out.append("")
+            out.append("Phase 3 Analytics Engine is working correctly!")
+            out.append("")
+            out.append("Key Metrics:")
             if pairs:
-                print(f"  • Hedge Ratio: {pairs['regression'].hedge_ratio:.6f}")
-                print(f"  • R²: {pairs['regression'].r_squared:.4f}")
+                out.append(f"  • Hedge Ratio: {pairs['regression'].hedge_ratio:.6f}")
+                out.append(f"  • R²: {pairs['regression'].r_squared:.4f}")
                 if pairs['adf_test']:
-                    print(f"  • Stationary: {pairs['adf_test'].is_stationary}")
+                    out.append(f"  • Stationary: {pairs['adf_test'].is_stationary}")
                 if pairs['correlation']:
-                    print(f"  • Correlation: {pairs['correlation'].correlation:.4f}")
+                    out.append(f"  • Correlation: {pairs['correlation'].correlation:.4f}")
         else:
-            print("⚠️  PARTIAL SUCCESS")
-            print()
-            print("Some analytics could not be computed due to insufficient data.")
-            print("Recommendation: Run main.py for 5-10 minutes, then retry this test.")
+            out.append("⚠️  PARTIAL SUCCESS")
+            out.append("")
+            out.append("Some analytics could not be computed due to insufficient data.")
+            out.append("Recommendation: Run main.py for 5-10 minutes, then retry this test.")
         
-        print("=" * 80)
+        out.append("=" * 80)
         
         # Close database
         await db.close()
         
     except FileNotFoundError:
-        print("❌ ERROR: Database file not found!")
-        print(f"   Expected location: {DATABASE_PATH}")
-        print()
-        print("   Please run: python main.py")
-        print("   Let it run for at least 5 minutes, then try again.")
-        print("=" * 80)
+        out.append("❌ ERROR: Database file not found!")
+        out.append(f"   Expected location: {DATABASE_PATH}")
+        out.append("")
+        out.append("   Please run: python main.py")
+        out.append("   Let it run for at least 5 minutes, then try again.")
+        out.append("=" * 80)
         
     except Exception as e:
-        print(f"❌ ERROR: {e}")
-        print("=" * 80)
+        out.append(f"❌ ERROR: {e}")
+        out.append("=" * 80)
         import traceback
-        traceback.print_exc()
+        out.append(traceback.format_exc().rstrip())
+    
+    finally:
+        out.append("")
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
-    print()
     asyncio.run(test_analytics())
-    print()
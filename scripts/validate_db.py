@@ -15,6 +15,7 @@ import asyncio
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import List
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -23,13 +24,26 @@ from src.storage.database import DatabaseManager
 from src.config import DATABASE_PATH
 
 
+def format_bar(bars, i: int) -> str:
+    """Format row i of a columnar OHLC result (see DatabaseManager.get_ohlc_multi)."""
+    ts = bars['timestamp'][i].astype(datetime)
+    return (
+        f"{ts.strftime('%H:%M:%S')} | "
+        f"O: ${bars['open'][i]:,.2f} | H: ${bars['high'][i]:,.2f} | "
+        f"L: ${bars['low'][i]:,.2f} | C: ${bars['close'][i]:,.2f} | "
+        f"V: {bars['volume'][i]:.6f} | Trades: {bars['trade_count'][i]}"
+    )
+
+
 async def validate():
     """Run validation checks on the database."""
+    # Report lines are collected and written in one go at the end
+    out: List[str] = [""]
     
-    print("=" * 70)
-    print("CRYPTO ANALYTICS PLATFORM - DATABASE VALIDATION")
-    print("=" * 70)
-    print()
+    out.append("=" * 70)
+    out.append("CRYPTO ANALYTICS PLATFORM - DATABASE VALIDATION")
+    out.append("=" * 70)
+    out.append("")
     
     try:
         # Initialize database connection
@@ -40,14 +54,14 @@ async def validate():
         end = datetime.now()
         start = end - timedelta(minutes=2)
         
-        print(f"Time Range: {start.strftime('%Y-%m-%d %H:%M:%S')} to {end.strftime('%Y-%m-%d %H:%M:%S')}")
-        print()
+        out.append(f"Time Range: {start.strftime('%Y-%m-%d %H:%M:%S')} to {end.strftime('%Y-%m-%d %H:%M:%S')}")
+        out.append("")
         
         # =====================================================================
         # Test 1: Tick Count Validation
         # =====================================================================
-        print("📊 TEST 1: Tick Persistence")
-        print("-" * 70)
+        out.append("📊 TEST 1: Tick Persistence")
+        out.append("-" * 70)
         
         symbols = ["BTCUSDT", "ETHUSDT"]
         total_ticks = 0
@@ -58,143 +72,139 @@ async def validate():
             total_ticks += count
             
             status = "✅ PASS" if count > 0 else "❌ FAIL (No ticks found)"
-            print(f"  {symbol:12} {count:6,} ticks  {status}")
+            out.append(f"  {symbol:12} {count:6,} ticks  {status}")
             
             # Show sample tick if available
             if ticks:
                 sample = ticks[0]
-                print(f"    Sample: {sample.timestamp.strftime('%H:%M:%S.%f')[:-3]} | "
-                      f"${sample.price:,.2f} | {sample.size:.6f}")
+                out.append(f"    Sample: {sample.timestamp.strftime('%H:%M:%S.%f')[:-3]} | "
+                           f"${sample.price:,.2f} | {sample.size:.6f}")
         
-        print(f"\n  Total ticks: {total_ticks:,}")
-        print()
+        out.append(f"\n  Total ticks: {total_ticks:,}")
+        out.append("")
         
         # =====================================================================
         # Test 2: OHLC Bar Generation (1s interval)
         # =====================================================================
-        print("📈 TEST 2: OHLC Bars (1-second interval)")
-        print("-" * 70)
+        out.append("📈 TEST 2: OHLC Bars (1-second interval)")
+        out.append("-" * 70)
+        
+        ohlc_1s = await db.get_ohlc_multi(symbols, "1s", start, end)
         
         for symbol in symbols:
-            bars_1s = await db.get_ohlc(symbol, "1s", start, end)
-            count = len(bars_1s)
+            bars_1s = ohlc_1s[symbol]
+            count = bars_1s['timestamp'].size
             
             # Expect at least some bars in 2 minutes (expect ~60-120)
             status = "✅ PASS" if count > 10 else "⚠️  WARNING (Few bars)"
-            print(f"  {symbol:12} {count:6} bars  {status}")
+            out.append(f"  {symbol:12} {count:6} bars  {status}")
             
             # Show sample bar if available
-            if bars_1s:
-                bar = bars_1s[0]
-                print(f"    Sample: {bar.timestamp.strftime('%H:%M:%S')} | "
-                      f"O: ${bar.open:,.2f} | H: ${bar.high:,.2f} | "
-                      f"L: ${bar.low:,.2f} | C: ${bar.close:,.2f} | "
-                      f"V: {bar.volume:.6f} | Trades: {bar.trade_count}")
+            if count:
+                out.append(f"    Sample: {format_bar(bars_1s, 0)}")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Test 3: OHLC Bar Generation (1m interval)
         # =====================================================================
-        print("📈 TEST 3: OHLC Bars (1-minute interval)")
-        print("-" * 70)
+        out.append("📈 TEST 3: OHLC Bars (1-minute interval)")
+        out.append("-" * 70)
+        
+        ohlc_1m = await db.get_ohlc_multi(symbols, "1m", start, end)
         
         for symbol in symbols:
-            bars_1m = await db.get_ohlc(symbol, "1m", start, end)
-            count = len(bars_1m)
+            bars_1m = ohlc_1m[symbol]
+            count = bars_1m['timestamp'].size
             
             # Expect 1-2 bars (depends on when you ran it)
             status = "✅ PASS" if count > 0 else "⚠️  WARNING (No bars yet)"
-            print(f"  {symbol:12} {count:6} bars  {status}")
+            out.append(f"  {symbol:12} {count:6} bars  {status}")
             
             # Show detailed bar info
-            if bars_1m:
-                for bar in bars_1m:
-                    print(f"    {bar.timestamp.strftime('%H:%M:%S')} | "
-                          f"O: ${bar.open:,.2f} | H: ${bar.high:,.2f} | "
-                          f"L: ${bar.low:,.2f} | C: ${bar.close:,.2f} | "
-                          f"V: {bar.volume:.6f} | Trades: {bar.trade_count}")
+            for i in range(count):
+                out.append(f"    {format_bar(bars_1m, i)}")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Test 4: OHLC Bar Generation (5m interval)
         # =====================================================================
-        print("📈 TEST 4: OHLC Bars (5-minute interval)")
-        print("-" * 70)
+        out.append("📈 TEST 4: OHLC Bars (5-minute interval)")
+        out.append("-" * 70)
+        
+        ohlc_5m = await db.get_ohlc_multi(symbols, "5m", start, end)
         
         for symbol in symbols:
-            bars_5m = await db.get_ohlc(symbol, "5m", start, end)
-            count = len(bars_5m)
+            bars_5m = ohlc_5m[symbol]
+            count = bars_5m['timestamp'].size
             
             # May or may not have completed a 5m bar yet
             status = "✅ PASS" if count >= 0 else "❌ FAIL"
-            print(f"  {symbol:12} {count:6} bars  {status}")
+            out.append(f"  {symbol:12} {count:6} bars  {status}")
             
-            if bars_5m:
-                bar = bars_5m[0]
-                print(f"    {bar.timestamp.strftime('%H:%M:%S')} | "
-                      f"O: ${bar.open:,.2f} | H: ${bar.high:,.2f} | "
-                      f"L: ${bar.low:,.2f} | C: ${bar.close:,.2f} | "
-                      f"V: {bar.volume:.6f} | Trades: {bar.trade_count}")
+            if count:
+                out.append(f"    {format_bar(bars_5m, 0)}")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Test 5: Latest Price Query
         # =====================================================================
-        print("💰 TEST 5: Latest Price Query")
-        print("-" * 70)
+        out.append("💰 TEST 5: Latest Price Query")
+        out.append("-" * 70)
         
         for symbol in symbols:
             latest_price = await db.get_latest_price(symbol)
             
             if latest_price:
                 status = "✅ PASS"
-                print(f"  {symbol:12} ${latest_price:,.2f}  {status}")
+                out.append(f"  {symbol:12} ${latest_price:,.2f}  {status}")
             else:
                 status = "❌ FAIL"
-                print(f"  {symbol:12} No price data  {status}")
+                out.append(f"  {symbol:12} No price data  {status}")
         
-        print()
+        out.append("")
         
         # =====================================================================
         # Summary
         # =====================================================================
-        print("=" * 70)
-        print("VALIDATION SUMMARY")
-        print("=" * 70)
+        out.append("=" * 70)
+        out.append("VALIDATION SUMMARY")
+        out.append("=" * 70)
         
         if total_ticks > 100:
-            print("✅ Database persistence: WORKING")
-            print("✅ Tick ingestion: ACTIVE")
+            out.append("✅ Database persistence: WORKING")
+            out.append("✅ Tick ingestion: ACTIVE")
         else:
-            print("⚠️  Low tick count - run main.py for longer")
+            out.append("⚠️  Low tick count - run main.py for longer")
         
-        print()
-        print(f"Database file: {DATABASE_PATH}")
-        print(f"Validation completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 70)
+        out.append("")
+        out.append(f"Database file: {DATABASE_PATH}")
+        out.append(f"Validation completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        out.append("=" * 70)
         
         # Close database
         await db.close()
         
     except FileNotFoundError:
-        print("❌ ERROR: Database file not found!")
-        print(f"   Expected location: {DATABASE_PATH}")
-        print()
-        print("   Please run: python main.py")
-        print("   Let it run for at least 1 minute, then try again.")
-        print("=" * 70)
+        out.append("❌ ERROR: Database file not found!")
+        out.append(f"   Expected location: {DATABASE_PATH}")
+        out.append("")
+        out.append("   Please run: python main.py")
+        out.append("   Let it run for at least 1 minute, then try again.")
+        out.append("=" * 70)
         
     except Exception as e:
-        print(f"❌ ERROR: {e}")
-        print("=" * 70)
+        out.append(f"❌ ERROR: {e}")
+        out.append("=" * 70)
         import traceback
-        traceback.print_exc()
+        out.append(traceback.format_exc().rstrip())
+    
+    finally:
+        out.append("")
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
-    print()
     asyncio.run(validate())
-    print()
@@ -28,5 +28,6 @@ __all__ = [
 # from src.analytics.regression import RegressionAnalyzer
 # from src.analytics.stationarity import StationarityAnalyzer
 # from src.analytics.correlation import CorrelationAnalyzer
+# from src.analytics.pairs import PairsAnalyzer
 # from src.analytics.resampler import TickResampler
 # from src.analytics.engine import AnalyticsEngine
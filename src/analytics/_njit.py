@@ -0,0 +1,47 @@
+"""
+Optional Numba JIT support for analytics kernels.
+
+Exposes an `njit` decorator that compiles with Numba when it is installed
+and otherwise returns the plain Python function unchanged, so the platform
+runs (more slowly) without Numba.
+
+Kernels should use `@njit(cache=True)`: compiled machine code is written to
+a repo-local `.numba_cache/` (override with NUMBA_CACHE_DIR), so only the
+first start after a code change pays the JIT compile cost.
+"""
+
+import os
+from pathlib import Path
+
+# Must be set before numba is imported; an explicit env var wins
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR",
+    str(Path(__file__).resolve().parents[2] / ".numba_cache")
+)
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """
+    Drop-in replacement for `numba.njit` with a pure-Python fallback.
+
+    Supports both bare (`@njit`) and configured (`@njit(cache=True)`) usage.
+    """
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    # Bare decorator: @njit
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    # Configured decorator: @njit(...)
+    def decorator(func):
+        return func
+
+    return decorator
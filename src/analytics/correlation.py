@@ -5,20 +5,169 @@ This module provides Pearson correlation calculations for measuring
 the relationship strength between trading pairs.
 """
 
+import asyncio
 import logging
+import threading
+from collections import deque
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from functools import partial, reduce
 from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from scipy.linalg.blas import dsyrk
 
-from ..storage.database import DatabaseManager
+from ..storage.database import DatabaseManager, select_ohlc_window
 from ..config import CORRELATION_WINDOW, MIN_DATA_POINTS_CORRELATION
+from ._kernels import merge_sorted_indices, rolling_corr
 from .models import CorrelationResult
 
 logger = logging.getLogger(__name__)
 
 
+class RollingCorrState:
+    """
+    Incremental rolling-correlation state for one symbol pair.
+    
+    Holds the running sums of the last `window` aligned prices plus the
+    correlation history, so a new update only has to advance over the bars
+    that arrived since `last_ts` (O(new bars) instead of O(lookback)).
+    Bars written before `last_ts` later on (a backfill) are caught by
+    is_intact(), which forces a rebuild.
+    
+    Prices are centred on a fixed reference (the mean when the state was
+    built) to keep the sums well conditioned, and rounded to float32 like
+    the from-scratch path.
+    
+    Updates run in worker threads, so callers hold `lock` while reading or
+    advancing the state.
+    """
+    
+    def __init__(self):
+        """Create an empty state; it is built by reset() on first use."""
+        self.lock = threading.Lock()
+        self.window: Optional[int] = None
+        self.lookback: Optional[int] = None
+        self.last_ts: Optional[np.datetime64] = None
+    
+    def is_compatible(self, window: int, lookback: int) -> bool:
+        """Check if the state was built for these parameters."""
+        return self.last_ts is not None and self.window == window and self.lookback == lookback
+    
+    def is_intact(self, ts_x: np.ndarray, ts_y: np.ndarray) -> bool:
+        """
+        Check that the aligned bars the state covers are unchanged.
+        
+        Bars inserted over [span_ts[0], last_ts] after the state was built
+        change the history but are not later than last_ts; they show up as
+        a different first aligned bar or a different aligned bar count.
+        
+        Args:
+            ts_x, ts_y: Timestamps (datetime64, ascending) of both series
+        """
+        first = self.span_ts[0]
+        ts_x = ts_x.astype('datetime64[us]', copy=False)
+        ts_y = ts_y.astype('datetime64[us]', copy=False)
+        i = int(np.searchsorted(ts_x, first, side='left'))
+        j = int(np.searchsorted(ts_y, first, side='left'))
+        ix, _ = merge_sorted_indices(
+            ts_x[i:np.searchsorted(ts_x, self.last_ts, side='right')].view(np.int64),
+            ts_y[j:np.searchsorted(ts_y, self.last_ts, side='right')].view(np.int64)
+        )
+        return ix.size == self.span_ts.size and ts_x[i + ix[0]] == first
+    
+    def invalidate(self) -> None:
+        """Drop the state; the next update rebuilds it from scratch."""
+        self.last_ts = None
+    
+    def reset(
+        self,
+        ts: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        rolling: np.ndarray,
+        window: int,
+        lookback: int
+    ) -> None:
+        """
+        Rebuild the state from a from-scratch computation.
+        
+        Args:
+            ts: Aligned timestamps (datetime64[us], at least `window` points)
+            x, y: Aligned prices (float32)
+            rolling: rolling_corr(x, y, window) output
+            window: Rolling window size
+            lookback: Number of aligned points the history covers
+        """
+        self.window = window
+        self.lookback = lookback
+        self.last_ts = ts[-1]
+        
+        self.ref_x = float(x.mean(dtype=np.float64))
+        self.ref_y = float(y.mean(dtype=np.float64))
+        
+        a = x[-window:].astype(np.float64) - self.ref_x
+        b = y[-window:].astype(np.float64) - self.ref_y
+        self.buf_x = deque(a.tolist(), maxlen=window)
+        self.buf_y = deque(b.tolist(), maxlen=window)
+        self.sx = float(a.sum())
+        self.sy = float(b.sum())
+        self.sxx = float(a @ a)
+        self.syy = float(b @ b)
+        self.sxy = float(a @ b)
+        
+        # History keeps NaN entries so it trims by point count, like tail(lookback)
+        self.hist_ts = ts[window - 1:]
+        self.hist_values = rolling[window - 1:]
+        
+        # Every aligned timestamp the history was computed from
+        self.span_ts = ts
+    
+    def advance(self, ts: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Push new aligned bars (all later than last_ts) through the window.
+        
+        Args:
+            ts: Aligned timestamps of the new bars (datetime64[us], ascending)
+            x, y: Aligned prices of the new bars (float32)
+        """
+        n = self.window
+        values = np.empty(ts.size, dtype=np.float32)
+        
+        for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist())):
+            a = xi - self.ref_x
+            b = yi - self.ref_y
+            
+            # Full deque: the oldest pair drops out as the new one is appended
+            a_out = self.buf_x[0]
+            b_out = self.buf_y[0]
+            self.buf_x.append(a)
+            self.buf_y.append(b)
+            
+            self.sx += a - a_out
+            self.sy += b - b_out
+            self.sxx += a * a - a_out * a_out
+            self.syy += b * b - b_out * b_out
+            self.sxy += a * b - a_out * b_out
+            
+            vx = n * self.sxx - self.sx * self.sx
+            vy = n * self.syy - self.sy * self.sy
+            
+            # Same constant-window tolerance as the rolling_corr kernel
+            if vx > 1e-12 * n * self.sxx and vy > 1e-12 * n * self.syy:
+                r = (n * self.sxy - self.sx * self.sy) / np.sqrt(vx * vy)
+                values[i] = min(1.0, max(-1.0, r))
+            else:
+                values[i] = np.nan
+        
+        keep = self.lookback - n + 1
+        self.hist_ts = np.concatenate([self.hist_ts, ts])[-keep:]
+        self.hist_values = np.concatenate([self.hist_values, values])[-keep:]
+        self.span_ts = np.concatenate([self.span_ts, ts])[-self.lookback:]
+        self.last_ts = ts[-1]
+
+
 class CorrelationAnalyzer:
     """
     Pearson correlation analyzer for symbol pairs.
@@ -86,77 +235,231 @@ class CorrelationAnalyzer:
             end = datetime.now()
             start = end - timedelta(hours=48)  # Extra buffer
             
-            bars_x = await self.db.get_ohlc(symbol_x, interval, start, end, limit=lookback * 2)
-            bars_y = await self.db.get_ohlc(symbol_y, interval, start, end, limit=lookback * 2)
-            
-            if len(bars_x) < MIN_DATA_POINTS_CORRELATION or len(bars_y) < MIN_DATA_POINTS_CORRELATION:
-                logger.warning(
-                    f"Insufficient data for correlation: X={len(bars_x)}, Y={len(bars_y)} "
-                    f"(min: {MIN_DATA_POINTS_CORRELATION})"
-                )
-                return None
-            
-            # Align timestamps
-            timestamps_x = {bar.timestamp: bar.close for bar in bars_x}
-            timestamps_y = {bar.timestamp: bar.close for bar in bars_y}
-            
-            common_timestamps = sorted(set(timestamps_x.keys()) & set(timestamps_y.keys()))
-            
-            if len(common_timestamps) < window:
-                logger.warning(
-                    f"Insufficient aligned data for correlation: {len(common_timestamps)} "
-                    f"(window: {window})"
-                )
-                return None
-            
-            # Take last 'lookback' aligned points
-            common_timestamps = common_timestamps[-lookback:]
-            
-            # Create aligned price series
-            prices_x = np.array([timestamps_x[ts] for ts in common_timestamps])
-            prices_y = np.array([timestamps_y[ts] for ts in common_timestamps])
-            
-            # Compute rolling correlation using pandas
-            df = pd.DataFrame({
-                'timestamp': common_timestamps,
-                'x': prices_x,
-                'y': prices_y
-            })
-            
-            # Rolling correlation
-            rolling_corr = df['x'].rolling(window=window).corr(df['y'])
-            
-            # Build correlation history (timestamp, correlation)
-            correlation_history: List[Tuple[datetime, float]] = []
-            for i, (ts, corr) in enumerate(zip(common_timestamps, rolling_corr)):
-                if not np.isnan(corr):
-                    correlation_history.append((ts, float(corr)))
-            
-            # Latest correlation
-            latest_corr = correlation_history[-1][1] if correlation_history else 0.0
-            
-            result = CorrelationResult(
-                symbol_x=symbol_x,
-                symbol_y=symbol_y,
-                interval=interval,
-                correlation=latest_corr,
-                rolling_window=window,
-                correlation_history=correlation_history,
-                timestamp=datetime.now()
-            )
-            
-            logger.info(
-                f"Correlation {symbol_x}-{symbol_y}: r={latest_corr:.4f}, "
-                f"history={len(correlation_history)} points"
-            )
-            
-            return result
+            # Whole range: the history is taken from the bars ending at `end`
+            ts_x, px = await self.db.get_ohlc_closes(symbol_x, interval, start, end)
+            ts_y, py = await self.db.get_ohlc_closes(symbol_y, interval, start, end)
             
         except Exception as e:
             logger.error(
                 f"Failed to compute rolling correlation {symbol_x}-{symbol_y}: {e}"
             )
             return None
+        
+        return await self.compute_rolling_correlation_arrays(
+            symbol_x, symbol_y, ts_x, px, ts_y, py, interval, window, lookback
+        )
+    
+    async def compute_rolling_correlation_arrays(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray,
+        interval: str = '1m',
+        window: int = CORRELATION_WINDOW,
+        lookback: int = 1440,
+        state: Optional[RollingCorrState] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[CorrelationResult]:
+        """
+        Rolling Pearson correlation on pre-fetched close prices.
+        
+        Same computation as compute_rolling_correlation(), for callers that
+        already hold the prices (e.g. a shared price panel). The arrays may
+        cover a wider range: the same selection (last 48h, first
+        lookback*2 bars) is applied in memory.
+        
+        With a `state` from a previous call (same window and lookback), only
+        the bars newer than the state's last aligned point are processed;
+        otherwise the history is computed from scratch and stored in `state`.
+        
+        The computation runs in a worker thread (asyncio.to_thread), so the
+        event loop stays responsive while it runs.
+        
+        Args:
+            symbol_x: First symbol
+            symbol_y: Second symbol
+            ts_x, px: Timestamps (datetime64, ascending) and closes for symbol_x
+            ts_y, py: Timestamps (datetime64, ascending) and closes for symbol_y
+            interval: Time interval of the bars
+            window: Rolling window for correlation (e.g., 60 bars)
+            lookback: How far back to compute history (e.g., 1440 = 1 day)
+            state: Incremental state for this pair, updated in place (optional)
+            now: Reference time for the 48h range and the result timestamp
+                (defaults to datetime.now())
+        
+        Returns:
+            CorrelationResult with latest value and full history
+        """
+        return await asyncio.to_thread(
+            self._compute_rolling_correlation_arrays_sync,
+            symbol_x, symbol_y, ts_x, px, ts_y, py, interval, window,
+            lookback, state, now
+        )
+    
+    def _compute_rolling_correlation_arrays_sync(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray,
+        interval: str = '1m',
+        window: int = CORRELATION_WINDOW,
+        lookback: int = 1440,
+        state: Optional[RollingCorrState] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[CorrelationResult]:
+        """Synchronous body of compute_rolling_correlation_arrays()."""
+        now = now or datetime.now()
+        
+        with state.lock if state is not None else nullcontext():
+            try:
+                incremental = (
+                    state is not None
+                    and state.is_compatible(window, lookback)
+                    and state.is_intact(ts_x, ts_y)
+                )
+                
+                if incremental:
+                    # Only the bars after the last aligned point the state has seen
+                    i = int(np.searchsorted(ts_x, state.last_ts, side='right'))
+                    j = int(np.searchsorted(ts_y, state.last_ts, side='right'))
+                    new_ts, new_x, new_y = self._align(ts_x[i:], px[i:], ts_y[j:], py[j:])
+                    
+                    # After a long gap a full recompute is as cheap (and re-anchors the sums)
+                    incremental = new_ts.size < lookback
+                
+                if incremental:
+                    if new_ts.size:
+                        state.advance(new_ts, new_x, new_y)
+                    
+                    aligned_ts, rolling = state.hist_ts, state.hist_values
+                else:
+                    start = now - timedelta(hours=48)
+                    ts_x, px = select_ohlc_window(ts_x, px, start=start)
+                    ts_y, py = select_ohlc_window(ts_y, py, start=start)
+                    
+                    # The latest bars, like the incremental path: the first
+                    # ones after `start` would rebuild a window from 48h ago
+                    ts_x, px = ts_x[-lookback * 2:], px[-lookback * 2:]
+                    ts_y, py = ts_y[-lookback * 2:], py[-lookback * 2:]
+                    
+                    if px.size < MIN_DATA_POINTS_CORRELATION or py.size < MIN_DATA_POINTS_CORRELATION:
+                        logger.warning(
+                            f"Insufficient data for correlation: X={px.size}, Y={py.size} "
+                            f"(min: {MIN_DATA_POINTS_CORRELATION})"
+                        )
+                        return None
+                    
+                    aligned_ts, x, y = self._align(ts_x, px, ts_y, py)
+                    
+                    if aligned_ts.size < window:
+                        logger.warning(
+                            f"Insufficient aligned data for correlation: {aligned_ts.size} "
+                            f"(window: {window})"
+                        )
+                        return None
+                    
+                    # Take last 'lookback' aligned points
+                    aligned_ts, x, y = aligned_ts[-lookback:], x[-lookback:], y[-lookback:]
+                    
+                    # Rolling correlation (the kernel accumulates in float64)
+                    rolling = rolling_corr(x, y, window)
+                    
+                    if state is not None:
+                        state.reset(aligned_ts, x, y, rolling, window, lookback)
+                
+                # Correlation history as parallel arrays (defined points only)
+                mask = ~np.isnan(rolling)
+                history_ts = aligned_ts[mask]
+                history_values = rolling[mask]
+                
+                # Latest correlation
+                latest_corr = float(history_values[-1]) if history_values.size else 0.0
+                
+                result = CorrelationResult(
+                    symbol_x=symbol_x,
+                    symbol_y=symbol_y,
+                    interval=interval,
+                    correlation=latest_corr,
+                    rolling_window=window,
+                    correlation_history_ts=history_ts,
+                    correlation_history_values=history_values,
+                    timestamp=now
+                )
+                
+                logger.info(
+                    f"Correlation {symbol_x}-{symbol_y}: r={latest_corr:.4f}, "
+                    f"history={history_values.size} points"
+                )
+                
+                return result
+                
+            except Exception as e:
+                logger.error(
+                    f"Failed to compute rolling correlation {symbol_x}-{symbol_y}: {e}"
+                )
+                return None
+    
+    @staticmethod
+    def _align(
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Inner-join two close series on timestamp.
+        
+        Both series come back from the DB ascending and with unique
+        timestamps (primary key), so one two-pointer pass over the int64
+        timestamps gives the positions of the common bars in each series.
+        
+        Returns:
+            (timestamps datetime64[us], x, y) in ascending time order, with
+            prices as float32 (~7 significant digits covers crypto closes)
+        """
+        ts_x = ts_x.astype('datetime64[us]', copy=False)
+        ts_y = ts_y.astype('datetime64[us]', copy=False)
+        ix, iy = merge_sorted_indices(ts_x.view(np.int64), ts_y.view(np.int64))
+        
+        return (
+            ts_x[ix],
+            # The gather already copies: no second copy for float32 panels
+            px[ix].astype(np.float32, copy=False),
+            py[iy].astype(np.float32, copy=False)
+        )
+    
+    @staticmethod
+    def _corr_matrix(panel: np.ndarray) -> np.ndarray:
+        """
+        Pearson correlation matrix of the columns of an (N, K) panel.
+        
+        Columns are centred and scaled to unit norm (in float64), so the
+        correlation matrix is the Gram matrix Xnᵀ·Xn. It is symmetric, so
+        only its upper triangle is computed (BLAS syrk, K·(K+1)/2 dot
+        products instead of K²) and then mirrored.
+        
+        Args:
+            panel: Aligned prices, one column per symbol
+        
+        Returns:
+            (K, K) float64 correlation matrix (NaN rows/columns for
+            constant series)
+        """
+        xc = panel - panel.mean(axis=0, dtype=np.float64)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            xn = xc / np.linalg.norm(xc, axis=0)
+        
+        upper = np.triu(dsyrk(1.0, xn, trans=1))
+        corr = upper + np.triu(upper, 1).T
+        
+        return np.clip(corr, -1.0, 1.0)
     
     async def compute_correlation_matrix(
         self,
@@ -187,47 +490,57 @@ class CorrelationAnalyzer:
             end = datetime.now()
             start = end - timedelta(hours=24)
             
-            price_data = {}
-            all_timestamps = set()
+            # Fetch all symbols concurrently
+            fetched = await asyncio.gather(
+                *(
+                    self.db.get_ohlc_closes(symbol, interval, start, end, limit=window * 2)
+                    for symbol in symbols
+                ),
+                return_exceptions=True
+            )
             
-            for symbol in symbols:
-                bars = await self.db.get_ohlc(symbol, interval, start, end, limit=window * 2)
-                if len(bars) < window:
+            # (timestamps, closes) per symbol with enough data
+            names = []
+            columns = []
+            for symbol, result in zip(symbols, fetched):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to fetch {symbol} for correlation matrix: {result}")
+                    continue
+                
+                ts, closes = result
+                if closes.size < window:
                     logger.warning(f"Insufficient data for {symbol} in correlation matrix")
                     continue
                 
-                price_data[symbol] = {bar.timestamp: bar.close for bar in bars}
-                all_timestamps.update(price_data[symbol].keys())
+                names.append(symbol)
+                columns.append((ts, closes))
             
-            if len(price_data) < 2:
+            if len(columns) < 2:
                 logger.warning("Need at least 2 symbols with sufficient data")
                 return None
             
-            # Find common timestamps
-            common_timestamps = sorted(all_timestamps)
-            
-            for symbol in list(price_data.keys()):
-                # Remove timestamps not present in this symbol
-                price_data[symbol] = {
-                    ts: price_data[symbol][ts]
-                    for ts in common_timestamps
-                    if ts in price_data[symbol]
-                }
-            
-            # Build DataFrame
-            df_dict = {}
-            for symbol in symbols:
-                if symbol in price_data:
-                    timestamps = sorted(price_data[symbol].keys())[-window:]
-                    df_dict[symbol] = [price_data[symbol][ts] for ts in timestamps]
-            
-            if not df_dict:
+            # Timestamps present for every symbol (chained sorted-merge
+            # intersections), last 'window' of them
+            common_timestamps = reduce(
+                partial(np.intersect1d, assume_unique=True),
+                (ts for ts, _ in columns)
+            )[-window:]
+            
+            if common_timestamps.size < MIN_DATA_POINTS_CORRELATION:
+                logger.warning(
+                    f"Insufficient aligned data for correlation matrix: {common_timestamps.size} "
+                    f"(min: {MIN_DATA_POINTS_CORRELATION})"
+                )
                 return None
             
-            df = pd.DataFrame(df_dict)
+            # Single aligned (N timestamps, K symbols) float32 panel
+            panel = np.empty((common_timestamps.size, len(columns)), dtype=np.float32)
+            for k, (ts, closes) in enumerate(columns):
+                panel[:, k] = closes[np.searchsorted(ts, common_timestamps)]
             
-            # Compute correlation matrix
-            corr_matrix = df.corr()
+            # Compute correlation matrix (off the event loop)
+            corr = await asyncio.to_thread(self._corr_matrix, panel)
+            corr_matrix = pd.DataFrame(corr, index=names, columns=names)
             
             logger.info(f"Computed correlation matrix for {len(symbols)} symbols")
             
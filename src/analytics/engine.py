@@ -7,25 +7,36 @@ stationarity, correlation) and provides a unified interface with caching.
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from ..storage.database import DatabaseManager
+import numpy as np
+
+from ..storage.database import DatabaseManager, select_ohlc_window
 from ..config import (
     ANALYTICS_UPDATE_INTERVAL,
+    CACHE_MAX_AGE,
     CACHE_TTL_STATS,
     CACHE_TTL_REGRESSION,
     CACHE_TTL_ADF,
     CACHE_TTL_CORRELATION,
     DEFAULT_SYMBOL_PAIRS,
+    MAX_CACHE_ENTRIES,
 )
 from .statistics import StatisticsCalculator
-from .regression import RegressionAnalyzer
+from .regression import RegressionAnalyzer, RollingOLSState
 from .stationarity import StationarityAnalyzer
-from .correlation import CorrelationAnalyzer
+from .correlation import CorrelationAnalyzer, RollingCorrState
+from ._kernels import warm_up
 
 logger = logging.getLogger(__name__)
 
+# Time range of the shared price panel: the widest range any pairs
+# analytic selects from (rolling correlation looks back 48h)
+PANEL_LOOKBACK = timedelta(hours=48)
+
 
 class AnalyticsEngine:
     """
@@ -33,7 +44,8 @@ class AnalyticsEngine:
     
     Coordinates all analytics modules and provides:
     - Unified API for accessing analytics
-    - TTL-based caching to reduce computation overhead
+    - TTL-based caching, extended while no new bars arrive (data version),
+      bounded to MAX_CACHE_ENTRIES with LRU eviction
     - Background update tasks for pre-computation
     - Error handling and graceful degradation
     """
@@ -53,11 +65,27 @@ class AnalyticsEngine:
         self.stationarity = StationarityAnalyzer(db)
         self.correlation = CorrelationAnalyzer(db)
         
-        # Cache storage: {cache_key: result}
-        self._cache: Dict[str, Any] = {}
+        # Cache storage: {cache_key: result}, least recently used first
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        
+        # Cache insert times: {cache_key: time.monotonic() seconds}
+        self._cache_time: Dict[str, float] = {}
+        
+        # Data version each entry was computed from: {cache_key: (latest bar ts, ...)}
+        self._cache_version: Dict[str, Tuple] = {}
+        
+        # Rolling-correlation running sums per pair, advanced by new bars only
+        self._corr_state: Dict[Tuple[str, str, str], RollingCorrState] = {}
+        
+        # Log-returns regression running sums per pair, advanced by new bars only
+        self._ols_state: Dict[Tuple[str, str, str], RollingOLSState] = {}
         
-        # Cache timestamps: {cache_key: datetime}
-        self._cache_time: Dict[str, datetime] = {}
+        # Last fetched price panel columns: {(symbol, interval): (timestamps, closes)}
+        self._panel_cache: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        
+        # Cache lookup counters (see cache_stats())
+        self._cache_hits = 0
+        self._cache_misses = 0
         
         logger.info("Analytics engine initialized")
     
@@ -70,20 +98,187 @@ class AnalyticsEngine:
         if cache_key not in self._cache_time:
             return False
         
-        age = (datetime.now() - self._cache_time[cache_key]).total_seconds()
-        return age < ttl
+        return time.monotonic() - self._cache_time[cache_key] < ttl
     
     def _get_cached(self, cache_key: str, ttl: float) -> Optional[Any]:
         """Get cached value if valid, otherwise None."""
         if not self._is_cache_valid(cache_key, ttl):
             return None
         
-        return self._cache.get(cache_key)
+        value = self._cache.get(cache_key)
+        if value is not None:
+            self._cache.move_to_end(cache_key)
+            self._cache_hits += 1
+        
+        return value
     
-    def _set_cache(self, cache_key: str, value: Any) -> None:
-        """Store value in cache with current timestamp."""
+    def _set_cache(self, cache_key: str, value: Any, version: Optional[Tuple] = None) -> None:
+        """
+        Store value in cache with current timestamp and data version.
+        
+        Evicts least recently used entries beyond MAX_CACHE_ENTRIES.
+        """
         self._cache[cache_key] = value
-        self._cache_time[cache_key] = datetime.now()
+        self._cache.move_to_end(cache_key)
+        self._cache_time[cache_key] = time.monotonic()
+        self._cache_version[cache_key] = version
+        
+        while len(self._cache) > MAX_CACHE_ENTRIES:
+            evicted_key, _ = self._cache.popitem(last=False)
+            self._cache_time.pop(evicted_key, None)
+            self._cache_version.pop(evicted_key, None)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get cache size and hit/miss counters.
+        
+        A lookup counts as a miss only when neither the TTL nor the
+        data-version check can serve it (i.e. the result is recomputed).
+        
+        Returns:
+            Dictionary with 'entries', 'max_entries', 'hits', 'misses', 'hit_rate'
+        """
+        lookups = self._cache_hits + self._cache_misses
+        
+        return {
+            'entries': len(self._cache),
+            'max_entries': MAX_CACHE_ENTRIES,
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'hit_rate': self._cache_hits / lookups if lookups else 0.0
+        }
+    
+    def invalidate(self, symbol: str, interval: str) -> None:
+        """
+        Drop the incremental state built from a symbol's bars at an interval.
+        
+        The incremental paths only read bars later than the last one they
+        hold, and the data version only tracks the latest bar, so bars
+        inserted or rewritten before it (e.g. a backfill through
+        /api/upload/ohlc) are never seen. Writers of such bars call this;
+        the cached results of the symbol (single and pairs analytics), its
+        stats memo and the rolling correlation/OLS states of its pairs are
+        dropped, and the next request re-reads the price panel column in
+        full.
+        
+        Args:
+            symbol: Trading symbol whose bars were written
+            interval: Time interval of the written bars
+        """
+        self._panel_cache.pop((symbol, interval), None)
+        self.stats_calc.invalidate(symbol, interval)
+        
+        for states in (self._corr_state, self._ols_state):
+            for pair_key in [key for key in states if key[2] == interval and symbol in key[:2]]:
+                del states[pair_key]
+        
+        # Keys are "<category>:<symbol>[_<symbol>]_<interval>"
+        for cache_key in list(self._cache):
+            *symbols, key_interval = cache_key.split(':', 1)[1].split('_')
+            if key_interval == interval and symbol in symbols:
+                del self._cache[cache_key]
+                self._cache_time.pop(cache_key, None)
+                self._cache_version.pop(cache_key, None)
+    
+    async def _data_version(self, interval: str, *symbols: str) -> Tuple:
+        """Latest bar timestamp per symbol: changes iff new bars were written."""
+        return tuple(await asyncio.gather(*(
+            self.db.get_latest_timestamp(symbol, interval) for symbol in symbols
+        )))
+    
+    def _get_if_unchanged(self, cache_key: str, version: Tuple) -> Optional[Any]:
+        """
+        Get cached value past its TTL if no new data arrived since it was computed.
+        
+        Bounded by CACHE_MAX_AGE, since time-based windows still move forward.
+        """
+        value = None
+        if (
+            None not in version
+            and self._cache_version.get(cache_key) == version
+            and self._is_cache_valid(cache_key, CACHE_MAX_AGE)
+        ):
+            value = self._cache.get(cache_key)
+        
+        # Last lookup stage before recomputing, so it also records misses
+        if value is None:
+            self._cache_misses += 1
+        else:
+            self._cache.move_to_end(cache_key)
+            self._cache_hits += 1
+        
+        return value
+    
+    async def _fetch_panel(
+        self,
+        symbols: List[str],
+        interval: str,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Fetch a shared price panel: (timestamps, closes) per symbol.
+        
+        Each symbol is read once (concurrently) over PANEL_LOOKBACK; the
+        regression, spread and correlation steps of every pair then select
+        their own windows from these arrays instead of re-querying.
+        
+        Columns are kept between calls, so after the first fetch only the
+        bars from the last one held onward are queried (a narrow range scan
+        on the (symbol, interval, timestamp) key) and appended.
+        
+        Args:
+            symbols: Symbols to fetch
+            interval: Time interval
+            now: End of the range (defaults to datetime.now())
+        
+        Returns:
+            {symbol: (timestamps datetime64, closes float64)}
+        """
+        end = now or datetime.now()
+        start = end - PANEL_LOOKBACK
+        
+        results = await asyncio.gather(*(
+            self._fetch_panel_column(symbol, interval, start, end)
+            for symbol in symbols
+        ))
+        
+        return dict(zip(symbols, results))
+    
+    async def _fetch_panel_column(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One panel column over [start, end], fetching only the delta if cached.
+        
+        The last cached bar is re-read too (the range start is inclusive),
+        so a bar rewritten in place is picked up.
+        """
+        cached = self._panel_cache.get((symbol, interval))
+        
+        if cached is None or not cached[0].size:
+            ts, closes = await self.db.get_ohlc_closes(symbol, interval, start, end)
+        else:
+            old_ts, old_closes = cached
+            last = old_ts[-1]
+            
+            new_ts, new_closes = await self.db.get_ohlc_closes(
+                symbol, interval, last.astype(datetime), end
+            )
+            
+            keep = old_ts < last
+            ts = np.concatenate([old_ts[keep], new_ts])
+            closes = np.concatenate([old_closes[keep], new_closes])
+            
+            # Drop bars that moved out of the lookback range
+            ts, closes = select_ohlc_window(ts, closes, start=start)
+        
+        self._panel_cache[(symbol, interval)] = (ts, closes)
+        
+        return ts, closes
     
     async def get_symbol_analytics(
         self,
@@ -95,7 +290,8 @@ class AnalyticsEngine:
         Get all analytics for a single symbol.
         
         Returns price statistics, volume statistics, and latest update time.
-        Results are cached with CACHE_TTL_STATS TTL.
+        Results are cached with CACHE_TTL_STATS TTL, and reused past it
+        (up to CACHE_MAX_AGE) while no new bars arrive.
         
         Args:
             symbol: Trading symbol (e.g., "BTCUSDT")
@@ -113,20 +309,31 @@ class AnalyticsEngine:
             Or None if computation fails
         """
         try:
+            now = datetime.now()
             cache_key = self._get_cache_key('symbol_analytics', symbol, interval)
             
             # Check cache (unless force_refresh)
             if not force_refresh:
                 cached = self._get_cached(cache_key, CACHE_TTL_STATS)
                 if cached:
-                    logger.debug(f"Cache hit: symbol analytics for {symbol}")
+                    logger.debug("Cache hit: symbol analytics for %s", symbol)
+                    return cached
+            
+            # Past the TTL, reuse the cached result if no new bars have arrived
+            version = await self._data_version(interval, symbol)
+            if not force_refresh:
+                cached = self._get_if_unchanged(cache_key, version)
+                if cached:
+                    logger.debug("Cache hit (no new data): symbol analytics for %s", symbol)
                     return cached
             
             # Compute fresh analytics
-            logger.debug(f"Computing fresh symbol analytics for {symbol}")
+            logger.debug("Computing fresh symbol analytics for %s", symbol)
             
-            stats = await self.stats_calc.compute_price_stats(symbol, interval)
-            volume_stats = await self.stats_calc.compute_volume_stats(symbol, interval)
+            # Price and volume stats from one read of the bars
+            stats, volume_stats = await self.stats_calc.compute_symbol_stats(
+                symbol, interval, last_bar=version[0], force_refresh=force_refresh, now=now
+            )
             
             if not stats and not volume_stats:
                 logger.warning(f"No analytics available for {symbol}")
@@ -135,11 +342,11 @@ class AnalyticsEngine:
             result = {
                 'stats': stats,
                 'volume_stats': volume_stats,
-                'last_update': datetime.now()
+                'last_update': now
             }
             
             # Cache result
-            self._set_cache(cache_key, result)
+            self._set_cache(cache_key, result, version)
             
             return result
             
@@ -152,7 +359,10 @@ class AnalyticsEngine:
         symbol_x: str,
         symbol_y: str,
         interval: str = '1m',
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        panel: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+        now: Optional[datetime] = None,
+        keep_state: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get complete pairs trading analytics.
@@ -164,20 +374,28 @@ class AnalyticsEngine:
         4. ADF test on spread (stationarity)
         5. Rolling correlation
         
-        Results are cached with CACHE_TTL_REGRESSION TTL.
+        Results are cached with CACHE_TTL_REGRESSION TTL, and reused past it
+        (up to CACHE_MAX_AGE) while no new bars arrive.
         
         Args:
             symbol_x: First symbol (independent variable)
             symbol_y: Second symbol (dependent variable)
             interval: Time interval
-            force_refresh: If True, bypass cache
+            force_refresh: If True, bypass cache and rebuild the pair's
+                incremental state (see invalidate()) from the database
+            panel: Shared price panel from _fetch_panel() (fetched for
+                this pair if not given)
+            now: Reference time shared by every step (defaults to
+                datetime.now())
+            keep_state: With force_refresh, keep the incremental state
+                (for the background cycle, which only bypasses the cache)
         
         Returns:
             Dictionary containing:
             {
                 'regression': RegressionResult,
-                'spread': List[float],
-                'z_score': List[float],
+                'spread': np.ndarray (float64, read-only),
+                'z_score': np.ndarray (float64, read-only, NaN for warm-up window),
                 'adf_test': ADFTestResult,
                 'correlation': CorrelationResult,
                 'last_update': datetime
@@ -186,21 +404,43 @@ class AnalyticsEngine:
             Or None if insufficient data or computation fails
         """
         try:
+            now = now or datetime.now()
             cache_key = self._get_cache_key('pairs_analytics', symbol_x, symbol_y, interval)
             
+            if force_refresh and not keep_state:
+                self.invalidate(symbol_x, interval)
+                self.invalidate(symbol_y, interval)
+            
             # Check cache
             if not force_refresh:
                 cached = self._get_cached(cache_key, CACHE_TTL_REGRESSION)
                 if cached:
-                    logger.debug(f"Cache hit: pairs analytics for {symbol_x}-{symbol_y}")
+                    logger.debug("Cache hit: pairs analytics for %s-%s", symbol_x, symbol_y)
+                    return cached
+            
+            # Past the TTL, reuse the cached result if no new bars have arrived
+            version = await self._data_version(interval, symbol_x, symbol_y)
+            if not force_refresh:
+                cached = self._get_if_unchanged(cache_key, version)
+                if cached:
+                    logger.debug("Cache hit (no new data): pairs analytics for %s-%s", symbol_x, symbol_y)
                     return cached
             
             # Compute fresh analytics
             logger.info(f"Computing fresh pairs analytics: {symbol_x}-{symbol_y}")
             
+            # Prices for both legs, read once and shared by every step below
+            if panel is None:
+                panel = await self._fetch_panel([symbol_x, symbol_y], interval, now)
+            ts_x, px = panel[symbol_x]
+            ts_y, py = panel[symbol_y]
+            
             # Step 1: OLS Regression
-            regression_result = await self.regression.compute_ols_hedge_ratio(
-                symbol_x, symbol_y, interval
+            ols_state = self._ols_state.setdefault(
+                (symbol_x, symbol_y, interval), RollingOLSState()
+            )
+            regression_result = await self.regression.compute_ols_hedge_ratio_arrays(
+                symbol_x, symbol_y, ts_x, px, ts_y, py, interval, state=ols_state, now=now
             )
             
             if not regression_result:
@@ -208,40 +448,53 @@ class AnalyticsEngine:
                 return None
             
             # Step 2: Compute spread using hedge ratio
-            spread = await self.regression.compute_spread(
-                symbol_x, symbol_y, regression_result.hedge_ratio, interval
+            # (from the returns the regression already aligned)
+            spread = await self.regression.compute_spread_arrays(
+                symbol_x, symbol_y, regression_result.hedge_ratio, ts_x, px, ts_y, py,
+                cached_returns=(regression_result.returns_x, regression_result.returns_y)
             )
             
-            if not spread or len(spread) < 20:
+            if spread.size < 20:
                 logger.warning(f"Insufficient spread data for {symbol_x}-{symbol_y}")
                 return None
             
             # Step 3: Z-score of spread
             z_scores = await self.stats_calc.compute_zscore(spread, window=20)
             
-            # Step 4: ADF test on spread (is it stationary?)
-            adf_result = await self.stationarity.adf_test_on_values(
-                spread,
-                label=f"{symbol_x}-{symbol_y} spread"
+            # Step 4: ADF test on spread (is it stationary?) and
+            # Step 5: Rolling correlation - independent of each other, so
+            # both worker-thread computations run concurrently
+            corr_state = self._corr_state.setdefault(
+                (symbol_x, symbol_y, interval), RollingCorrState()
             )
-            
-            # Step 5: Rolling correlation
-            corr_result = await self.correlation.compute_rolling_correlation(
-                symbol_x, symbol_y, interval
+            adf_result, corr_result = await asyncio.gather(
+                self.stationarity.adf_test_on_values(
+                    spread,
+                    label=f"{symbol_x}-{symbol_y} spread",
+                    now=now
+                ),
+                self.correlation.compute_rolling_correlation_arrays(
+                    symbol_x, symbol_y, ts_x, px, ts_y, py, interval, state=corr_state, now=now
+                )
             )
             
-            # Build result
+            # Build result. spread/z_score are kept as float64 arrays (one
+            # contiguous buffer per column) and handed out from the cache to
+            # every request as is, so freeze them against in-place edits
+            spread.flags.writeable = False
+            z_scores.flags.writeable = False
+            
             result = {
                 'regression': regression_result,
                 'spread': spread,
                 'z_score': z_scores,
                 'adf_test': adf_result,
                 'correlation': corr_result,
-                'last_update': datetime.now()
+                'last_update': now
             }
             
             # Cache result
-            self._set_cache(cache_key, result)
+            self._set_cache(cache_key, result, version)
             
             logger.info(
                 f"Pairs analytics computed: {symbol_x}-{symbol_y} | "
@@ -268,13 +521,24 @@ class AnalyticsEngine:
             # Get symbols from config (currently BTCUSDT, ETHUSDT)
             from ..config import SYMBOLS
             
-            # Update single-symbol analytics
-            for symbol in SYMBOLS:
-                await self.get_symbol_analytics(symbol, interval='1m', force_refresh=True)
+            # Update single-symbol analytics (independent, so run concurrently)
+            await asyncio.gather(*(
+                self.get_symbol_analytics(symbol, interval='1m', force_refresh=True)
+                for symbol in SYMBOLS
+            ))
+            
+            # Update pairs analytics from one shared price panel
+            pair_symbols = sorted({symbol for pair in DEFAULT_SYMBOL_PAIRS for symbol in pair})
+            now = datetime.now()
+            panel = await self._fetch_panel(pair_symbols, '1m', now)
             
-            # Update pairs analytics
-            for symbol_x, symbol_y in DEFAULT_SYMBOL_PAIRS:
-                await self.get_pairs_analytics(symbol_x, symbol_y, interval='1m', force_refresh=True)
+            await asyncio.gather(*(
+                self.get_pairs_analytics(
+                    symbol_x, symbol_y, interval='1m', force_refresh=True, panel=panel,
+                    now=now, keep_state=True
+                )
+                for symbol_x, symbol_y in DEFAULT_SYMBOL_PAIRS
+            ))
             
             logger.info("Analytics update cycle complete")
             
@@ -304,3 +568,51 @@ class AnalyticsEngine:
                 logger.error(f"Analytics update loop error: {e}")
             
             await asyncio.sleep(interval_seconds)
+
+
+def warm_up_analytics() -> None:
+    """
+    Compile (or load) the JIT analytics kernels up front.
+    
+    Meant for a worker process initializer, so the first update cycle runs
+    at full speed.
+    """
+    warm_up()
+
+
+# Per-process state of an analytics worker: the event loop and the engine
+# are reused across cycles so the engine's incremental state (price panel,
+# correlation sums) carries over
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_engine: Optional[AnalyticsEngine] = None
+
+
+def run_analytics_once(db_path: str) -> None:
+    """
+    Run one analytics update cycle against the database at db_path.
+    
+    Entry point for a worker process (see main.py): opens its own read-only
+    connection, so CPU-bound analytics never run on the ingest event loop
+    and never contend for the ingest writer's lock. The engine is created on
+    the first call and kept for later ones; the connection is opened per
+    cycle (an open one would keep the worker process from exiting).
+    
+    Args:
+        db_path: Path to the SQLite database written by the ingest process
+    """
+    global _worker_loop, _worker_engine
+    
+    if _worker_engine is None or _worker_engine.db.db_path != db_path:
+        _worker_engine = AnalyticsEngine(DatabaseManager(db_path, read_only=True))
+    
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    
+    async def _run(engine: AnalyticsEngine) -> None:
+        await engine.db.initialize()
+        try:
+            await engine.update_all_analytics()
+        finally:
+            await engine.db.close()
+    
+    _worker_loop.run_until_complete(_run(_worker_engine))
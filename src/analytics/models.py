@@ -5,12 +5,14 @@ This module defines data structures for time-series resampling,
 OHLC (candlestick) bars, and analytics results.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class OHLCData:
     """
     OHLC (Open-High-Low-Close) candlestick bar data.
@@ -77,7 +79,7 @@ class OHLCData:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceStats:
     """
     Descriptive statistics for price data.
@@ -106,7 +108,7 @@ class PriceStats:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VolumeStats:
     """
     Descriptive statistics for volume data.
@@ -129,7 +131,7 @@ class VolumeStats:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegressionResult:
     """
     Results from OLS (Ordinary Least Squares) regression for pairs trading.
@@ -144,8 +146,14 @@ class RegressionResult:
         intercept: Alpha coefficient (y-intercept)
         r_squared: R² goodness of fit [0, 1] - proportion of variance explained
         std_error: Standard error of the regression
-        residuals: Regression residuals (spread values)
+        residuals: Regression residuals (spread values, float32 array)
         timestamp: When regression was computed
+        returns_x: Aligned log returns of X the fit used (float64, read-only, optional)
+        returns_y: Aligned log returns of Y the fit used (float64, read-only, optional)
+    
+    The residuals are stored as float32; the fit itself is computed in
+    float64, and the returns are kept in float64 because the spread and
+    its z-score are computed from them.
     """
     symbol_x: str
     symbol_y: str
@@ -154,11 +162,13 @@ class RegressionResult:
     intercept: float
     r_squared: float
     std_error: float
-    residuals: List[float]
+    residuals: np.ndarray = field(repr=False, compare=False)
     timestamp: datetime
+    returns_x: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    returns_y: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ADFTestResult:
     """
     Results from Augmented Dickey-Fuller stationarity test.
@@ -183,7 +193,7 @@ class ADFTestResult:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CorrelationResult:
     """
     Rolling correlation analysis between two symbols.
@@ -194,7 +204,8 @@ class CorrelationResult:
         interval: Time interval of underlying data
         correlation: Latest Pearson correlation coefficient [-1, 1]
         rolling_window: Window size for correlation calculation
-        correlation_history: Time series of (timestamp, correlation) tuples
+        correlation_history_ts: History timestamps (datetime64[us])
+        correlation_history_values: History correlations (float32, aligned with _ts)
         timestamp: When analysis was performed
     """
     symbol_x: str
@@ -202,5 +213,56 @@ class CorrelationResult:
     interval: str
     correlation: float
     rolling_window: int
-    correlation_history: List[Tuple[datetime, float]]
+    correlation_history_ts: np.ndarray = field(repr=False, compare=False)
+    correlation_history_values: np.ndarray = field(repr=False, compare=False)
     timestamp: datetime
+    
+    # Memoized history_payload() results: {last: payload}
+    _payload_cache: Dict[int, List[dict]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def correlation_history(self) -> List[Tuple[datetime, float]]:
+        """History as (timestamp, correlation) tuples (legacy view, built on access)."""
+        return list(zip(
+            self.correlation_history_ts.tolist(),
+            self.correlation_history_values.tolist()
+        ))
+    
+    def history_payload(self, last: int = 50) -> List[dict]:
+        """
+        JSON-ready tail of the correlation history.
+        
+        Built from the last `last` points only and memoized per instance
+        (results are immutable), so repeated API/dashboard hits on a cached
+        result skip the conversion.
+        
+        Args:
+            last: Number of most recent points to include
+        
+        Returns:
+            List of {"timestamp": ISO string, "value": float}
+        """
+        payload = self._payload_cache.get(last)
+        
+        if payload is None:
+            ts = self.correlation_history_ts[-last:]
+            
+            # Bar timestamps are whole seconds: format the slice in one call
+            # (same text as datetime.isoformat()); otherwise go per point
+            if ts.size and not (ts.astype('datetime64[us]').view(np.int64) % 1_000_000).any():
+                timestamps = np.datetime_as_string(ts, unit='s').tolist()
+            else:
+                timestamps = [t.isoformat() for t in ts.tolist()]
+            
+            payload = [
+                {"timestamp": timestamp, "value": value}
+                for timestamp, value in zip(
+                    timestamps,
+                    self.correlation_history_values[-last:].tolist()
+                )
+            ]
+            self._payload_cache[last] = payload
+        
+        return payload
@@ -0,0 +1,121 @@
+"""
+Pairs screening pipeline.
+
+This module chains the log-returns regression and the ADF stationarity test
+for candidate pairs, running the (expensive) ADF test only on pairs whose
+regression passed its sanity gates.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from ..storage.database import DatabaseManager
+from ..config import DEFAULT_ROLLING_WINDOW
+from .models import ADFTestResult, RegressionResult
+from .regression import RegressionAnalyzer
+from .stationarity import StationarityAnalyzer
+
+logger = logging.getLogger(__name__)
+
+PairAnalysis = Tuple[RegressionResult, Optional[ADFTestResult]]
+
+
+class PairsAnalyzer:
+    """
+    Regression → ADF pipeline for pairs trading candidates.
+    
+    A pair is rejected as soon as its regression is suppressed (|β| > 3,
+    R² < 0.3, σ(β) > |β| or insufficient data), so the ADF test only runs
+    on the pairs that survive.
+    """
+    
+    def __init__(
+        self,
+        db: DatabaseManager,
+        regression: Optional[RegressionAnalyzer] = None,
+        stationarity: Optional[StationarityAnalyzer] = None
+    ):
+        """
+        Initialize pairs analyzer.
+        
+        Args:
+            db: Database manager instance
+            regression: Regression analyzer to use (created from db if not given)
+            stationarity: Stationarity analyzer to use (created from db if not given)
+        """
+        self.db = db
+        self.regression = regression or RegressionAnalyzer(db)
+        self.stationarity = stationarity or StationarityAnalyzer(db)
+    
+    async def analyze_pair(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW
+    ) -> Optional[PairAnalysis]:
+        """
+        Regress symbol_y on symbol_x, then ADF-test the residuals.
+        
+        Args:
+            symbol_x: Independent variable (e.g., "BTCUSDT")
+            symbol_y: Dependent variable (e.g., "ETHUSDT")
+            interval: Time interval for OHLC data
+            window: Number of bars to use
+        
+        Returns:
+            (RegressionResult, ADFTestResult or None), or None if the
+            regression was suppressed (no ADF test is run then)
+        """
+        regression = await self.regression.compute_ols_hedge_ratio(
+            symbol_x, symbol_y, interval, window
+        )
+        if regression is None:
+            return None
+        
+        return regression, await self._test_residuals(regression)
+    
+    async def analyze_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW
+    ) -> Dict[Tuple[str, str], Optional[PairAnalysis]]:
+        """
+        Run the pipeline over many pairs concurrently.
+        
+        Regressions go through RegressionAnalyzer.compute_many() (one read
+        per distinct symbol); ADF tests then run concurrently for the
+        surviving pairs only.
+        
+        Args:
+            pairs: (symbol_x, symbol_y) pairs to analyze
+            interval: Time interval for OHLC data
+            window: Number of bars to use
+        
+        Returns:
+            Dict mapping each pair to (RegressionResult, ADFTestResult or
+            None), or to None if its regression was suppressed
+        """
+        regressions = await self.regression.compute_many(pairs, interval, window)
+        
+        survivors = [pair for pair in pairs if regressions[pair] is not None]
+        adf_results = await asyncio.gather(*(
+            self._test_residuals(regressions[pair]) for pair in survivors
+        ))
+        
+        logger.info(f"Pairs screening: {len(survivors)}/{len(pairs)} pairs passed regression gates")
+        
+        results: Dict[Tuple[str, str], Optional[PairAnalysis]] = dict.fromkeys(pairs)
+        for pair, adf in zip(survivors, adf_results):
+            results[pair] = (regressions[pair], adf)
+        return results
+    
+    async def _test_residuals(self, regression: RegressionResult) -> Optional[ADFTestResult]:
+        """ADF test on a regression's residuals (the log-return spread)."""
+        return await self.stationarity.adf_test_on_values(
+            regression.residuals,
+            label=f"{regression.symbol_x}-{regression.symbol_y} spread",
+            now=regression.timestamp
+        )
@@ -5,20 +5,219 @@ This module provides OLS (Ordinary Least Squares) regression for computing
 hedge ratios and spreads between correlated trading pairs.
 """
 
+import asyncio
 import logging
+import threading
+from collections import deque
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-from scipy import stats
 
-from ..storage.database import DatabaseManager
+from ..storage.database import DatabaseManager, select_ohlc_window
 from ..config import DEFAULT_ROLLING_WINDOW, MIN_DATA_POINTS_REGRESSION
+from ._kernels import gather_float64, merge_sorted_indices, ols_moments
 from .models import RegressionResult
 
 logger = logging.getLogger(__name__)
 
 
+class RollingOLSState:
+    """
+    Incremental log-returns regression state for one symbol pair.
+    
+    Holds the log returns of the last `window` aligned bars with their
+    running sums Sx, Sy, Sxx, Syy, Sxy, so a new update only takes the log
+    of the bars that arrived since `last_ts` and β, R² and σ(β) follow from
+    the sums in O(1). Bars written before `last_ts` later on (a backfill)
+    are caught by is_intact(), which forces a rebuild.
+    
+    Add/subtract updates accumulate rounding error, so the sums are rebuilt
+    from the buffered returns every REFRESH_EVERY pushed bars.
+    
+    Updates run in worker threads, so callers hold `lock` while reading or
+    advancing the state.
+    """
+    
+    REFRESH_EVERY = 1000
+    
+    def __init__(self):
+        """Create an empty state; it is built by reset() on first use."""
+        self.lock = threading.Lock()
+        self.window: Optional[int] = None
+        self.last_ts: Optional[np.datetime64] = None
+    
+    def is_compatible(self, window: int) -> bool:
+        """Check if the state was built for this window."""
+        return self.last_ts is not None and self.window == window
+    
+    def invalidate(self) -> None:
+        """Drop the state; the next update rebuilds it from scratch."""
+        self.last_ts = None
+    
+    def reset(self, ts: np.ndarray, log_x: np.ndarray, log_y: np.ndarray, window: int) -> None:
+        """
+        Rebuild the state from the aligned window.
+        
+        Args:
+            ts: Aligned timestamps (datetime64, ascending)
+            log_x, log_y: Aligned log prices (float64, at most `window` points)
+            window: Number of bars the regression uses
+        """
+        self.window = window
+        self.last_ts = ts[-1]
+        self.last_x = float(log_x[-1])
+        self.last_y = float(log_y[-1])
+        
+        # Aligned timestamps of the prices in the window
+        self.buf_ts = deque(ts, maxlen=window)
+        
+        # `window` prices give window-1 returns
+        self.buf_x = deque(np.diff(log_x).tolist(), maxlen=window - 1)
+        self.buf_y = deque(np.diff(log_y).tolist(), maxlen=window - 1)
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """Recompute the running sums from the buffered returns (O(window))."""
+        rx, ry = self.returns()
+        self.sx = float(rx.sum())
+        self.sy = float(ry.sum())
+        self.sxx = float(rx @ rx)
+        self.syy = float(ry @ ry)
+        self.sxy = float(rx @ ry)
+        self.updates = 0
+    
+    def advance(self, ts: np.ndarray, log_x: np.ndarray, log_y: np.ndarray) -> None:
+        """
+        Push new aligned bars (all later than last_ts) through the window.
+        
+        Args:
+            ts: Aligned timestamps of the new bars (datetime64, ascending)
+            log_x, log_y: Aligned log prices of the new bars (float64)
+        """
+        for lx, ly in zip(log_x.tolist(), log_y.tolist()):
+            a = lx - self.last_x
+            b = ly - self.last_y
+            self.last_x = lx
+            self.last_y = ly
+            
+            # Full deque: the oldest pair drops out as the new one is appended
+            if len(self.buf_x) == self.buf_x.maxlen:
+                a_out = self.buf_x[0]
+                b_out = self.buf_y[0]
+                self.sx -= a_out
+                self.sy -= b_out
+                self.sxx -= a_out * a_out
+                self.syy -= b_out * b_out
+                self.sxy -= a_out * b_out
+            
+            self.buf_x.append(a)
+            self.buf_y.append(b)
+            self.sx += a
+            self.sy += b
+            self.sxx += a * a
+            self.syy += b * b
+            self.sxy += a * b
+        
+        self.buf_ts.extend(ts)
+        self.last_ts = ts[-1]
+        self.updates += ts.size
+        if self.updates >= self.REFRESH_EVERY:
+            self.refresh()
+    
+    def returns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Buffered (returns_x, returns_y), oldest first, as float64 arrays."""
+        n = len(self.buf_x)
+        return (
+            np.fromiter(self.buf_x, dtype=np.float64, count=n),
+            np.fromiter(self.buf_y, dtype=np.float64, count=n)
+        )
+    
+    def moments(self) -> Tuple[int, float, float, float, float, float]:
+        """
+        Centred moments of the buffered returns from the running sums.
+        
+        Returns:
+            (n, mean_x, mean_y, ssx, ssy, sxy) with ss* the centred sums of
+            squares/products, e.g. ssx = Σ(r_x - mean_x)²
+        """
+        n = len(self.buf_x)
+        mean_x = self.sx / n
+        mean_y = self.sy / n
+        return (
+            n,
+            mean_x,
+            mean_y,
+            max(self.sxx - self.sx * mean_x, 0.0),
+            max(self.syy - self.sy * mean_y, 0.0),
+            self.sxy - self.sx * mean_y
+        )
+    
+    def is_intact(self, ts_x: np.ndarray, ts_y: np.ndarray) -> bool:
+        """
+        Check that the aligned bars in the window are unchanged.
+        
+        Bars inserted over [buf_ts[0], last_ts] after the state was built
+        are not later than last_ts; they show up as a different first
+        aligned bar or a different aligned bar count.
+        
+        Args:
+            ts_x, ts_y: Timestamps (datetime64, ascending) of both series
+        """
+        first = self.buf_ts[0]
+        ts_x = ts_x.astype('datetime64[us]', copy=False)
+        ts_y = ts_y.astype('datetime64[us]', copy=False)
+        i = int(np.searchsorted(ts_x, first, side='left'))
+        j = int(np.searchsorted(ts_y, first, side='left'))
+        ix, _ = merge_sorted_indices(
+            ts_x[i:np.searchsorted(ts_x, self.last_ts, side='right')].view(np.int64),
+            ts_y[j:np.searchsorted(ts_y, self.last_ts, side='right')].view(np.int64)
+        )
+        return ix.size == len(self.buf_ts) and ts_x[i + ix[0]] == first
+    
+    def extend(self, ts_x: np.ndarray, px: np.ndarray, ts_y: np.ndarray, py: np.ndarray) -> bool:
+        """
+        Advance over the bars of the price arrays later than last_ts.
+        
+        Args:
+            ts_x, px: Timestamps (datetime64, ascending) and closes for symbol_x
+            ts_y, py: Timestamps (datetime64, ascending) and closes for symbol_y
+        
+        Returns:
+            False (state untouched) if bars were written into the window
+            since it was built (see is_intact()), or the new bars fill a
+            whole window or contain non-finite/non-positive prices; the
+            caller then rebuilds from scratch
+        """
+        if not self.is_intact(ts_x, ts_y):
+            return False
+        
+        i = np.searchsorted(ts_x, self.last_ts, side='right')
+        j = np.searchsorted(ts_y, self.last_ts, side='right')
+        ts_x, px = ts_x[i:], px[i:]
+        ts_y, py = ts_y[j:], py[j:]
+        
+        ix, iy = merge_sorted_indices(
+            ts_x.astype('datetime64[us]', copy=False).view(np.int64),
+            ts_y.astype('datetime64[us]', copy=False).view(np.int64)
+        )
+        if ix.size >= self.window:
+            return False
+        if not ix.size:
+            return True
+        
+        new_x = gather_float64(px, ix)
+        new_y = gather_float64(py, iy)
+        if not (np.all(np.isfinite(new_x)) and np.all(np.isfinite(new_y))):
+            return False
+        if not (np.all(new_x > 0) and np.all(new_y > 0)):
+            return False
+        
+        self.advance(ts_x[ix], np.log(new_x), np.log(new_y))
+        return True
+
+
 class RegressionAnalyzer:
     """
     OLS regression analyzer for pairs trading.
@@ -89,135 +288,295 @@ class RegressionAnalyzer:
             RegressionResult or None if insufficient/invalid data
         """
         try:
-            # Get OHLC data for both symbols
+            # Get close prices for both symbols
             end = datetime.now()
             start = end - timedelta(hours=24)
             
-            bars_x = await self.db.get_ohlc(symbol_x, interval, start, end, limit=window * 2)
-            bars_y = await self.db.get_ohlc(symbol_y, interval, start, end, limit=window * 2)
-            
-            if len(bars_x) < MIN_DATA_POINTS_REGRESSION or len(bars_y) < MIN_DATA_POINTS_REGRESSION:
-                logger.warning(
-                    f"Insufficient data for regression: X={len(bars_x)}, Y={len(bars_y)} "
-                    f"(min: {MIN_DATA_POINTS_REGRESSION})"
-                )
-                return None
-            
-            # ============================================================
-            # CRITICAL: Strict timestamp alignment
-            # ============================================================
-            timestamps_x = {bar.timestamp: bar.close for bar in bars_x}
-            timestamps_y = {bar.timestamp: bar.close for bar in bars_y}
-            
-            common_timestamps = sorted(set(timestamps_x.keys()) & set(timestamps_y.keys()))
-            
-            if len(common_timestamps) < MIN_DATA_POINTS_REGRESSION + 1:
-                logger.warning(
-                    f"Insufficient aligned data: {len(common_timestamps)} timestamps "
-                    f"(min: {MIN_DATA_POINTS_REGRESSION + 1})"
-                )
-                return None
-            
-            # Take last N aligned points
-            common_timestamps = common_timestamps[-window:]
-            
-            # Extract aligned prices - STRICT synchronization
-            prices_x = np.array([timestamps_x[ts] for ts in common_timestamps])
-            prices_y = np.array([timestamps_y[ts] for ts in common_timestamps])
-            
-            # Validation: Same length, no NaN/Inf
-            assert len(prices_x) == len(prices_y), "Price arrays must be same length"
-            if not (np.all(np.isfinite(prices_x)) and np.all(np.isfinite(prices_y))):
-                logger.error("Non-finite prices detected, aborting regression")
-                return None
+            ts_x, px = await self.db.get_ohlc_closes(symbol_x, interval, start, end)
+            ts_y, py = await self.db.get_ohlc_closes(symbol_y, interval, start, end)
             
-            # ============================================================
-            # INDUSTRY FIX: Use LOG RETURNS (not percentage returns)
-            # ============================================================
-            # Log returns: r_t = log(P_t) - log(P_{t-1})
-            log_prices_x = np.log(prices_x)
-            log_prices_y = np.log(prices_y)
-            
-            returns_x = np.diff(log_prices_x)
-            returns_y = np.diff(log_prices_y)
-            
-            # Validation: Check for NaN/Inf after log
-            valid_mask = np.isfinite(returns_x) & np.isfinite(returns_y)
-            returns_x_clean = returns_x[valid_mask]
-            returns_y_clean = returns_y[valid_mask]
-            
-            if len(returns_x_clean) < MIN_DATA_POINTS_REGRESSION:
-                logger.warning(
-                    f"Insufficient valid returns after filtering: {len(returns_x_clean)} "
-                    f"(removed {len(returns_x) - len(returns_x_clean)} invalid points)"
-                )
-                return None
-            
-            # Check for near-zero variance (causes unstable regression)
-            if np.std(returns_x_clean) < 1e-8 or np.std(returns_y_clean) < 1e-8:
-                logger.warning("Near-zero return variance detected, regression unstable")
-                return None
-            
-            # Perform OLS regression on LOG RETURNS
-            # Direction: r_Y = α + β·r_X (Y depends on X)
-            slope, intercept, r_value, p_value, std_err = stats.linregress(returns_x_clean, returns_y_clean)
-            
-            # R-squared
-            r_squared = r_value ** 2
-            
-            # ============================================================
-            # SANITY GATES (Professional Standard)
-            # ============================================================
-            # Gate 1: Beta must be realistic
-            if abs(slope) > 3.0:
-                logger.warning(
-                    f"Beta unrealistic: β={slope:.2f} (|β| > 3.0). "
-                    f"Likely data misalignment or numerical issue. Suppressing regression."
-                )
+        except Exception as e:
+            logger.error(f"Failed to compute log-returns regression {symbol_x}->{symbol_y}: {e}")
+            return None
+        
+        return await self.compute_ols_hedge_ratio_arrays(
+            symbol_x, symbol_y, ts_x, px, ts_y, py, interval, window
+        )
+    
+    async def compute_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW
+    ) -> Dict[Tuple[str, str], Optional[RegressionResult]]:
+        """
+        Log-returns OLS regression for many pairs at once.
+        
+        Each distinct symbol is read once (a leg shared by several pairs,
+        e.g. BTC in BTC-ETH and BTC-SOL, is not re-read), the reads are
+        issued concurrently with asyncio.gather, and the per-pair fits run
+        concurrently in worker threads.
+        
+        Args:
+            pairs: (symbol_x, symbol_y) pairs to regress
+            interval: Time interval for OHLC data
+            window: Number of bars to use
+        
+        Returns:
+            Dict mapping each pair to its RegressionResult (None if
+            insufficient/invalid data or the symbol reads failed)
+        """
+        symbols = list(dict.fromkeys(s for pair in pairs for s in pair))
+        
+        end = datetime.now()
+        start = end - timedelta(hours=24)
+        
+        fetched = await asyncio.gather(
+            *(self.db.get_ohlc_closes(s, interval, start, end) for s in symbols),
+            return_exceptions=True
+        )
+        
+        closes = {}
+        for symbol, data in zip(symbols, fetched):
+            if isinstance(data, Exception):
+                logger.error(f"Failed to fetch closes for {symbol}: {data}")
+            else:
+                closes[symbol] = data
+        
+        async def fit(symbol_x: str, symbol_y: str) -> Optional[RegressionResult]:
+            if symbol_x not in closes or symbol_y not in closes:
                 return None
-            
-            # Gate 2: R² must show meaningful relationship
-            if r_squared < 0.3:
-                logger.warning(
-                    f"R² too low: {r_squared:.4f} (< 0.3). "
-                    f"Weak relationship, not suitable for pairs trading. Suppressing regression."
+            return await self.compute_ols_hedge_ratio_arrays(
+                symbol_x, symbol_y, *closes[symbol_x], *closes[symbol_y], interval, window
+            )
+        
+        results = await asyncio.gather(*(fit(x, y) for x, y in pairs))
+        return dict(zip(pairs, results))
+    
+    async def compute_ols_hedge_ratio_arrays(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray,
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW,
+        state: Optional[RollingOLSState] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[RegressionResult]:
+        """
+        Log-returns OLS regression on pre-fetched close prices.
+        
+        Same computation and sanity gates as compute_ols_hedge_ratio(), for
+        callers that already hold the prices (e.g. a shared price panel).
+        The arrays may cover a wider range: the regression uses the last
+        `window` aligned bars within the last 24h.
+        
+        With a `state` from a previous call (same window), only the bars
+        newer than the state's last aligned point are processed and β, R²
+        and σ(β) come from its running sums; otherwise the window is
+        computed from scratch and stored in `state`.
+        
+        The computation runs in a worker thread (asyncio.to_thread), so the
+        event loop stays responsive while it runs.
+        
+        Args:
+            symbol_x: Independent variable (e.g., "BTCUSDT")
+            symbol_y: Dependent variable (e.g., "ETHUSDT")
+            ts_x, px: Timestamps (datetime64, ascending) and closes for symbol_x
+            ts_y, py: Timestamps (datetime64, ascending) and closes for symbol_y
+            interval: Time interval of the bars
+            window: Number of bars to use
+            state: Incremental state for this pair, updated in place (optional)
+            now: Reference time for the 24h range and the result timestamp
+                (defaults to datetime.now())
+        
+        Returns:
+            RegressionResult or None if insufficient/invalid data
+        """
+        return await asyncio.to_thread(
+            self._compute_ols_hedge_ratio_arrays_sync,
+            symbol_x, symbol_y, ts_x, px, ts_y, py, interval, window, state, now
+        )
+    
+    def _compute_ols_hedge_ratio_arrays_sync(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray,
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW,
+        state: Optional[RollingOLSState] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[RegressionResult]:
+        """Synchronous body of compute_ols_hedge_ratio_arrays()."""
+        now = now or datetime.now()
+        
+        with state.lock if state is not None else nullcontext():
+            try:
+                # Incremental path: only the bars since the last update are new
+                if state is not None and state.is_compatible(window) and state.extend(ts_x, px, ts_y, py):
+                    returns_x, returns_y = state.returns()
+                    n, mean_x, mean_y, ssx, ssy, sxy = state.moments()
+                else:
+                    if state is not None:
+                        state.invalidate()
+                    
+                    start = now - timedelta(hours=24)
+                    ts_x, px = select_ohlc_window(ts_x, px, start=start)
+                    ts_y, py = select_ohlc_window(ts_y, py, start=start)
+                    
+                    if px.size < MIN_DATA_POINTS_REGRESSION or py.size < MIN_DATA_POINTS_REGRESSION:
+                        logger.warning(
+                            f"Insufficient data for regression: X={px.size}, Y={py.size} "
+                            f"(min: {MIN_DATA_POINTS_REGRESSION})"
+                        )
+                        return None
+                    
+                    # ============================================================
+                    # CRITICAL: Strict timestamp alignment
+                    # ============================================================
+                    # Both series are ascending with unique timestamps: one two-pointer pass
+                    ix, iy = merge_sorted_indices(
+                        ts_x.astype('datetime64[us]', copy=False).view(np.int64),
+                        ts_y.astype('datetime64[us]', copy=False).view(np.int64)
+                    )
+                    
+                    if ix.size < MIN_DATA_POINTS_REGRESSION + 1:
+                        logger.warning(
+                            f"Insufficient aligned data: {ix.size} timestamps "
+                            f"(min: {MIN_DATA_POINTS_REGRESSION + 1})"
+                        )
+                        return None
+                    
+                    # Extract aligned prices (last N aligned points) - STRICT synchronization
+                    ix = ix[-window:]
+                    iy = iy[-window:]
+                    prices_x = gather_float64(px, ix)
+                    prices_y = gather_float64(py, iy)
+                    
+                    # Validation: Same length, no NaN/Inf
+                    if len(prices_x) != len(prices_y):
+                        raise RuntimeError("alignment invariant broken: price arrays differ in length")
+                    if not (np.all(np.isfinite(prices_x)) and np.all(np.isfinite(prices_y))):
+                        logger.error("Non-finite prices detected, aborting regression")
+                        return None
+                    
+                    # Finite and positive prices give finite log returns (no post-log mask needed)
+                    if not (np.all(prices_x > 0) and np.all(prices_y > 0)):
+                        logger.error("Non-positive prices detected, aborting regression")
+                        return None
+                    
+                    # ============================================================
+                    # INDUSTRY FIX: Use LOG RETURNS (not percentage returns)
+                    # ============================================================
+                    # Log returns: r_t = log(P_t) - log(P_{t-1})
+                    log_x = np.log(prices_x)
+                    log_y = np.log(prices_y)
+                    returns_x = np.diff(log_x)
+                    returns_y = np.diff(log_y)
+                    
+                    if returns_x.size < MIN_DATA_POINTS_REGRESSION:
+                        logger.warning(
+                            f"Insufficient returns for regression: {returns_x.size} "
+                            f"(min: {MIN_DATA_POINTS_REGRESSION})"
+                        )
+                        return None
+                    
+                    # Centred sums (same formulas as scipy's linregress, without
+                    # the p-value it computes and we never use)
+                    if state is not None:
+                        state.reset(ts_x[ix], log_x, log_y, window)
+                        n, mean_x, mean_y, ssx, ssy, sxy = state.moments()
+                    else:
+                        n = returns_x.size
+                        mean_x, mean_y, ssx, ssy, sxy = ols_moments(returns_x, returns_y)
+                
+                # Check for near-zero variance (causes unstable regression)
+                if np.sqrt(ssx / n) < 1e-8 or np.sqrt(ssy / n) < 1e-8:
+                    logger.warning("Near-zero return variance detected, regression unstable")
+                    return None
+                
+                # Perform OLS regression on LOG RETURNS
+                # Direction: r_Y = α + β·r_X (Y depends on X)
+                slope = sxy / ssx
+                intercept = mean_y - slope * mean_x
+                
+                # R-squared
+                r_squared = min(1.0, (sxy * sxy) / (ssx * ssy))
+                
+                # Standard error of the slope: sqrt(SS_res / ((n - 2)·SSx))
+                std_err = float(np.sqrt(max(ssy - slope * sxy, 0.0) / ((n - 2) * ssx)))
+                
+                # ============================================================
+                # SANITY GATES (Professional Standard)
+                # ============================================================
+                # Gate 1: Beta must be realistic
+                if abs(slope) > 3.0:
+                    logger.warning(
+                        f"Beta unrealistic: β={slope:.2f} (|β| > 3.0). "
+                        f"Likely data misalignment or numerical issue. Suppressing regression."
+                    )
+                    return None
+                
+                # Gate 2: R² must show meaningful relationship
+                if r_squared < 0.3:
+                    logger.warning(
+                        f"R² too low: {r_squared:.4f} (< 0.3). "
+                        f"Weak relationship, not suitable for pairs trading. Suppressing regression."
+                    )
+                    return None
+                
+                # Gate 3: Standard error must be reasonable
+                if std_err > abs(slope):
+                    logger.warning(
+                        f"Standard error too large: σ(β)={std_err:.4f} > |β|={abs(slope):.4f}. "
+                        f"Estimate is unstable. Suppressing regression."
+                    )
+                    return None
+                
+                # Compute residuals (log return spread): r_Y - (α + β·r_X), from the centred returns
+                # Sums and fit stay float64; the stored residuals are narrowed
+                # to float32 (log returns ~1e-4..1e-2 need nowhere near 15 digits)
+                residuals = ((returns_y - mean_y) - slope * (returns_x - mean_x)).astype(np.float32)
+                
+                # The returns stay float64: the spread, its z-score and the
+                # alerting 'latest' value are computed from them
+                returns_x.flags.writeable = False
+                returns_y.flags.writeable = False
+                
+                result = RegressionResult(
+                    symbol_x=symbol_x,
+                    symbol_y=symbol_y,
+                    interval=interval,
+                    hedge_ratio=slope,         # Beta (return sensitivity)
+                    intercept=intercept,        # Should be near zero
+                    r_squared=r_squared,        # Should be 0.3-0.9
+                    std_error=std_err,          # Should be < |beta|
+                    residuals=residuals,        # Log return spread
+                    timestamp=now,
+                    returns_x=returns_x,        # Reused by compute_spread
+                    returns_y=returns_y
                 )
-                return None
-            
-            # Gate 3: Standard error must be reasonable
-            if std_err > abs(slope):
-                logger.warning(
-                    f"Standard error too large: σ(β)={std_err:.4f} > |β|={abs(slope):.4f}. "
-                    f"Estimate is unstable. Suppressing regression."
+                
+                logger.info(
+                    f"✅ Log-returns regression {symbol_x}->{symbol_y}: "
+                    f"β={slope:.4f}, R²={r_squared:.4f}, σ(β)={std_err:.4f}, n={returns_x.size}"
                 )
+                
+                return result
+                
+            except Exception as e:
+                # A failure mid-update may leave the running sums inconsistent
+                if state is not None:
+                    state.invalidate()
+                logger.error(f"Failed to compute log-returns regression {symbol_x}->{symbol_y}: {e}")
                 return None
-            
-            # Compute residuals (log return spread)
-            predicted_y = intercept + slope * returns_x_clean
-            residuals = (returns_y_clean - predicted_y).tolist()
-            
-            result = RegressionResult(
-                symbol_x=symbol_x,
-                symbol_y=symbol_y,
-                interval=interval,
-                hedge_ratio=slope,         # Beta (return sensitivity)
-                intercept=intercept,        # Should be near zero
-                r_squared=r_squared,        # Should be 0.3-0.9
-                std_error=std_err,          # Should be < |beta|
-                residuals=residuals,        # Log return spread
-                timestamp=datetime.now()
-            )
-            
-            logger.info(
-                f"✅ Log-returns regression {symbol_x}->{symbol_y}: "
-                f"β={slope:.4f}, R²={r_squared:.4f}, σ(β)={std_err:.4f}, n={len(returns_x_clean)}"
-            )
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to compute log-returns regression {symbol_x}->{symbol_y}: {e}")
-            return None
     
     async def compute_spread(
         self,
@@ -225,7 +584,8 @@ class RegressionAnalyzer:
         symbol_y: str,
         hedge_ratio: float,
         interval: str = '1m',
-        window: int = DEFAULT_ROLLING_WINDOW
+        window: int = DEFAULT_ROLLING_WINDOW,
+        cached_returns: Optional[Tuple[np.ndarray, np.ndarray]] = None
     ) -> List[float]:
         """
         Compute log-return spread: spread = r_Y - β·r_X
@@ -247,54 +607,141 @@ class RegressionAnalyzer:
             hedge_ratio: Beta from log-returns regression
             interval: Time interval
             window: Number of bars
+            cached_returns: Aligned (returns_x, returns_y) from the regression
+                that produced hedge_ratio (RegressionResult.returns_x/_y);
+                when given, the DB reads and alignment are skipped
         
         Returns:
             List of log-return spread values
         """
+        if cached_returns is not None:
+            return self._spread_from_returns(*cached_returns, hedge_ratio).tolist()
+        
         try:
-            # Get aligned prices (same logic as regression)
+            # Get close prices (same selection as regression)
             end = datetime.now()
             start = end - timedelta(hours=24)
             
-            bars_x = await self.db.get_ohlc(symbol_x, interval, start, end, limit=window * 2)
-            bars_y = await self.db.get_ohlc(symbol_y, interval, start, end, limit=window * 2)
+            ts_x, px = await self.db.get_ohlc_closes(symbol_x, interval, start, end)
+            ts_y, py = await self.db.get_ohlc_closes(symbol_y, interval, start, end)
             
-            if not bars_x or not bars_y:
-                logger.warning(f"No data for spread calculation: {symbol_x}, {symbol_y}")
-                return []
+        except Exception as e:
+            logger.error(f"Failed to compute log-return spread: {e}")
+            return []
+        
+        spread = await self.compute_spread_arrays(
+            symbol_x, symbol_y, hedge_ratio, ts_x, px, ts_y, py, window
+        )
+        return spread.tolist()
+    
+    async def compute_spread_arrays(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        hedge_ratio: float,
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray,
+        window: int = DEFAULT_ROLLING_WINDOW,
+        cached_returns: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Log-return spread (r_Y - β·r_X) on pre-fetched close prices.
+        
+        Same computation as compute_spread(), returned as a float64 array
+        rather than a list; the input arrays may cover a wider range and
+        are narrowed with the same selection in memory.
+        
+        The computation runs in a worker thread (asyncio.to_thread), so the
+        event loop stays responsive while it runs.
+        
+        Args:
+            symbol_x: First symbol
+            symbol_y: Second symbol
+            hedge_ratio: Beta from log-returns regression
+            ts_x, px: Timestamps (datetime64, ascending) and closes for symbol_x
+            ts_y, py: Timestamps (datetime64, ascending) and closes for symbol_y
+            window: Number of bars
+            cached_returns: Aligned (returns_x, returns_y) from the regression
+                that produced hedge_ratio; when given, the selection and
+                alignment are skipped
+            now: Reference time for the 24h range (defaults to datetime.now())
+        
+        Returns:
+            float64 array of log-return spread values (empty if unavailable)
+        """
+        if cached_returns is not None:
+            return self._spread_from_returns(*cached_returns, hedge_ratio)
+        
+        return await asyncio.to_thread(
+            self._compute_spread_arrays_sync,
+            symbol_x, symbol_y, hedge_ratio, ts_x, px, ts_y, py, window, now
+        )
+    
+    def _compute_spread_arrays_sync(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        hedge_ratio: float,
+        ts_x: np.ndarray,
+        px: np.ndarray,
+        ts_y: np.ndarray,
+        py: np.ndarray,
+        window: int = DEFAULT_ROLLING_WINDOW,
+        now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """Synchronous body of compute_spread_arrays()."""
+        try:
+            start = (now or datetime.now()) - timedelta(hours=24)
+            ts_x, px = select_ohlc_window(ts_x, px, start=start)
+            ts_y, py = select_ohlc_window(ts_y, py, start=start)
             
-            # Strict timestamp alignment
-            timestamps_x = {bar.timestamp: bar.close for bar in bars_x}
-            timestamps_y = {bar.timestamp: bar.close for bar in bars_y}
+            if not px.size or not py.size:
+                logger.warning(f"No data for spread calculation: {symbol_x}, {symbol_y}")
+                return np.empty(0)
             
-            common_timestamps = sorted(set(timestamps_x.keys()) & set(timestamps_y.keys()))
-            common_timestamps = common_timestamps[-window:]
+            # Strict timestamp alignment (two-pointer merge, as in regression)
+            ix, iy = merge_sorted_indices(
+                ts_x.astype('datetime64[us]', copy=False).view(np.int64),
+                ts_y.astype('datetime64[us]', copy=False).view(np.int64)
+            )
             
-            if len(common_timestamps) < 2:
-                return []
+            if min(ix.size, window) < 2:
+                return np.empty(0)
             
-            # Extract aligned prices
-            prices_x = np.array([timestamps_x[ts] for ts in common_timestamps])
-            prices_y = np.array([timestamps_y[ts] for ts in common_timestamps])
+            # Extract aligned prices (last N aligned points)
+            prices_x = gather_float64(px, ix[-window:])
+            prices_y = gather_float64(py, iy[-window:])
             
             # Calculate LOG returns (consistent with regression)
-            log_prices_x = np.log(prices_x)
-            log_prices_y = np.log(prices_y)
+            returns_x = np.diff(np.log(prices_x))
+            returns_y = np.diff(np.log(prices_y))
             
-            returns_x = np.diff(log_prices_x)
-            returns_y = np.diff(log_prices_y)
+            spreads = self._spread_from_returns(returns_x, returns_y, hedge_ratio)
             
-            # Compute log-return spread: spread = r_Y - β·r_X
-            spreads = []
-            for i in range(len(returns_x)):
-                if np.isfinite(returns_x[i]) and np.isfinite(returns_y[i]):
-                    spread = returns_y[i] - (hedge_ratio * returns_x[i])
-                    spreads.append(spread)
-            
-            logger.debug(f"Computed {len(spreads)} log-return spread values for {symbol_x}-{symbol_y}")
+            logger.debug("Computed %d log-return spread values for %s-%s", spreads.size, symbol_x, symbol_y)
             
             return spreads
             
         except Exception as e:
             logger.error(f"Failed to compute log-return spread: {e}")
-            return []
+            return np.empty(0)
+    
+    @staticmethod
+    def _spread_from_returns(
+        returns_x: np.ndarray,
+        returns_y: np.ndarray,
+        hedge_ratio: float
+    ) -> np.ndarray:
+        """Log-return spread r_Y - β·r_X (float64) from aligned returns (non-finite points dropped)."""
+        # Compute log-return spread: spread = r_Y - β·r_X
+        spread_values = returns_y - hedge_ratio * returns_x
+        
+        # Non-positive/non-finite prices give non-finite returns: drop those points
+        finite = np.isfinite(spread_values)
+        if not finite.all():
+            spread_values = spread_values[finite]
+        
+        return spread_values.astype(np.float64, copy=False)
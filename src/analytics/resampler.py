@@ -6,23 +6,64 @@ at various time intervals (1s, 1m, 5m, etc.) for charting and analysis.
 """
 
 import logging
-from collections import defaultdict
+import time
+from bisect import insort
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+from ..config import OHLC_BATCH_SIZE, OHLC_BATCH_TIMEOUT
 from ..ingestion.binance_websocket import TradeData
 from ..storage.database import DatabaseManager
 from .models import OHLCData
 
 logger = logging.getLogger(__name__)
 
+# Bucket width per supported interval
+INTERVAL_WIDTHS: Dict[str, timedelta] = {
+    '1s': timedelta(seconds=1),
+    '1m': timedelta(minutes=1),
+    '5m': timedelta(minutes=5),
+    '15m': timedelta(minutes=15),
+    '1h': timedelta(hours=1),
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class _BarAccumulator:
+    """
+    Running OHLC aggregate of one open bucket, updated per trade in O(1).
+    
+    Ticks arrive in time order, so open is the first price seen and close
+    the latest; no per-bucket tick list is kept.
+    """
+    
+    __slots__ = ('open', 'high', 'low', 'close', 'volume', 'count')
+    
+    def __init__(self, price: float, size: float):
+        """Start the bar from its first trade."""
+        self.open = self.high = self.low = self.close = price
+        self.volume = size
+        self.count = 1
+    
+    def add(self, price: float, size: float) -> None:
+        """Fold one more trade into the bar."""
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += size
+        self.count += 1
+
 
 class TickResampler:
     """
     Real-time tick-to-OHLC resampler with interval boundary handling.
     
-    Buffers incoming ticks by time interval buckets, computes OHLC bars
-    when intervals complete, and persists to database.
+    Folds incoming ticks into a running OHLC aggregate per time interval
+    bucket (constant memory per open bucket, whatever its trade count),
+    emits the bar when the interval completes, and persists to database.
     
     Key challenge: Determining when an interval is "complete"
     - We can't know an interval is done until we see a tick from the NEXT interval
@@ -31,7 +72,8 @@ class TickResampler:
     Attributes:
         db: Database manager instance
         intervals: List of time intervals to generate (e.g., ['1s', '1m', '5m'])
-        buffers: Nested dict structure {symbol: {interval: {bucket_start: [ticks]}}}
+        buffers: Flat dict {(symbol, interval, bucket_start): running bar}
+        pending_bars: Finalized bars awaiting a batched database write
     """
     
     def __init__(self, db: DatabaseManager, intervals: List[str]):
@@ -45,17 +87,37 @@ class TickResampler:
         self.db = db
         self.intervals = intervals
         
-        # Buffer structure: {symbol: {interval: {bucket_start: [ticks]}}}
-        # Example: {'BTCUSDT': {'1s': {datetime(...): [tick1, tick2, ...]}}}
-        self.buffers: Dict[str, Dict[str, Dict[datetime, List[TradeData]]]] = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(list))
-        )
+        unsupported = [interval for interval in intervals if interval not in INTERVAL_WIDTHS]
+        if unsupported:
+            raise ValueError(f"Unsupported intervals: {unsupported}")
+        
+        # Bucket widths, looked up once per tick and interval
+        self._bucket_widths: Dict[str, timedelta] = {
+            interval: INTERVAL_WIDTHS[interval] for interval in intervals
+        }
+        
+        # Buffer structure: {(symbol, interval, bucket_start): running OHLC}
+        # Example: {('BTCUSDT', '1s', datetime(...)): _BarAccumulator(...)}
+        self.buffers: Dict[Tuple[str, str, datetime], _BarAccumulator] = {}
+        
+        # Open bucket starts per (symbol, interval), ascending (normally just
+        # the current one), so finalization never scans the whole buffer
+        self._open_buckets: Dict[Tuple[str, str], List[datetime]] = {}
+        
+        # Latest tick time per symbol (arrival-order check, debug runs only)
+        self._last_tick_time: Dict[str, datetime] = {}
+        
+        # Finalized bars are written in batches (size or age, whichever first)
+        self._pending_bars: List[OHLCData] = []
+        self._last_bar_flush = time.monotonic()
     
     def get_interval_bucket(self, timestamp: datetime, interval: str) -> datetime:
         """
         Calculate the start of the interval bucket for a given timestamp.
         
-        Critical for aligning ticks to correct OHLC bars.
+        Critical for aligning ticks to correct OHLC bars. Integer-style
+        floor arithmetic on timedeltas (no datetime.replace() or interval
+        branching per tick).
         
         Args:
             timestamp: Tick timestamp
@@ -75,30 +137,16 @@ class TickResampler:
             >>> get_interval_bucket(ts, '5m')
             datetime(2025, 12, 16, 12, 15, 0, 0)   # 12:15:00.000 (not 12:18!)
         """
-        if interval == '1s':
-            # Round down to nearest second
-            return timestamp.replace(microsecond=0)
-        
-        elif interval == '1m':
-            # Round down to nearest minute
-            return timestamp.replace(second=0, microsecond=0)
-        
-        elif interval == '5m':
-            # Round down to nearest 5-minute mark (0, 5, 10, 15, ...)
-            minute = (timestamp.minute // 5) * 5
-            return timestamp.replace(minute=minute, second=0, microsecond=0)
-        
-        elif interval == '15m':
-            # Round down to nearest 15-minute mark (0, 15, 30, 45)
-            minute = (timestamp.minute // 15) * 15
-            return timestamp.replace(minute=minute, second=0, microsecond=0)
-        
-        elif interval == '1h':
-            # Round down to nearest hour
-            return timestamp.replace(minute=0, second=0, microsecond=0)
+        try:
+            width = self._bucket_widths[interval]
+        except KeyError:
+            raise ValueError(f"Unsupported interval: {interval}") from None
         
-        else:
-            raise ValueError(f"Unsupported interval: {interval}")
+        # Floor on wall-clock time since the epoch: for naive datetimes (and
+        # aware ones sharing the epoch's tzinfo) the subtraction ignores UTC
+        # offsets, so buckets match replace()-style rounding exactly
+        epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH.replace(tzinfo=timestamp.tzinfo)
+        return timestamp - (timestamp - epoch) % width
     
     async def process_tick(self, tick: TradeData) -> None:
         """
@@ -108,9 +156,9 @@ class TickResampler:
         1. Save tick to database (batched)
         2. For each interval (1s, 1m, 5m):
            a. Determine which bucket this tick belongs to
-           b. Add tick to that bucket's buffer
+           b. Fold tick into that bucket's running bar
            c. Check if any PREVIOUS buckets are now complete
-           d. If complete, compute OHLC and save to DB
+           d. If complete, queue their OHLC bars for a batched DB write
         
         Args:
             tick: Incoming trade data
@@ -120,16 +168,75 @@ class TickResampler:
             await self.db.insert_tick(tick)
             
             # 2. Process for each interval
+            if __debug__:
+                self._check_tick_order(tick)
             for interval in self.intervals:
-                await self._process_tick_for_interval(tick, interval)
+                self._process_tick_for_interval(tick, interval)
+            
+            # 3. Write out finalized bars if the batch is due
+            await self._maybe_flush_bars()
                 
         except Exception as e:
             logger.error(f"Error processing tick: {e}")
     
-    async def _process_tick_for_interval(self, tick: TradeData, interval: str) -> None:
+    async def process_batch(self, ticks: List[TradeData]) -> None:
+        """
+        Process a batch of ticks: queue for persistence, then resample.
+        
+        Resampling is still applied tick by tick (in arrival order); the
+        database's background writer persists the ticks in bulk.
+        
+        Args:
+            ticks: Incoming trade data, in arrival order
+        """
+        try:
+            # 1. Hand ticks to the background writer (no await per tick)
+            for tick in ticks:
+                self.db.enqueue_tick(tick)
+            
+            # 2. Update OHLC buffers per tick
+            for tick in ticks:
+                if __debug__:
+                    self._check_tick_order(tick)
+                for interval in self.intervals:
+                    self._process_tick_for_interval(tick, interval)
+            
+            # 3. Write out finalized bars if the batch is due
+            await self._maybe_flush_bars()
+                    
+        except Exception as e:
+            logger.error(f"Error processing tick batch: {e}")
+    
+    def _check_tick_order(self, tick: TradeData) -> None:
+        """
+        Warn when a tick is older than the previous tick of its symbol.
+        
+        The running bars take open/close from arrival order instead of
+        sorting by timestamp, which relies on the exchange stream being
+        time-ordered per symbol. Only called when __debug__ is set (i.e.
+        not under python -O); it logs rather than asserts so a stray tick
+        never drops the rest of its batch.
+        
+        Args:
+            tick: Incoming trade data
+        """
+        last = self._last_tick_time.get(tick.symbol)
+        if last is not None and tick.timestamp < last:
+            logger.warning(
+                f"Out-of-order tick for {tick.symbol}: {tick.timestamp.isoformat()} "
+                f"after {last.isoformat()}"
+            )
+        else:
+            self._last_tick_time[tick.symbol] = tick.timestamp
+    
+    def _process_tick_for_interval(self, tick: TradeData, interval: str) -> None:
         """
         Process tick for a specific interval.
         
+        Synchronous: completed bars are only queued here (written in
+        batches by _maybe_flush_bars), so there is nothing to await per
+        tick and interval.
+        
         Args:
             tick: Incoming trade data
             interval: Time interval to process (e.g., '1s')
@@ -137,20 +244,26 @@ class TickResampler:
         # Determine which bucket this tick belongs to
         bucket_start = self.get_interval_bucket(tick.timestamp, interval)
         
-        # Add tick to buffer
-        self.buffers[tick.symbol][interval][bucket_start].append(tick)
+        # Fold tick into its bucket's running bar
+        key = (tick.symbol, interval, bucket_start)
+        bar = self.buffers.get(key)
+        if bar is None:
+            self.buffers[key] = _BarAccumulator(tick.price, tick.size)
+            insort(self._open_buckets.setdefault((tick.symbol, interval), []), bucket_start)
+        else:
+            bar.add(tick.price, tick.size)
         
-        # Check if we can finalize any completed buckets
-        await self._finalize_completed_buckets(tick.symbol, interval, tick.timestamp)
+        # Check if we can finalize any completed buckets (same bucket, no recompute)
+        self._finalize_completed_buckets(tick.symbol, interval, bucket_start)
     
-    async def _finalize_completed_buckets(
+    def _finalize_completed_buckets(
         self,
         symbol: str,
         interval: str,
-        current_time: datetime
+        current_bucket: datetime
     ) -> None:
         """
-        Finalize and persist any OHLC bars that are now complete.
+        Finalize any OHLC bars that are now complete and queue them for writing.
         
         A bucket is "complete" when we receive a tick from a NEWER bucket.
         
@@ -167,49 +280,41 @@ class TickResampler:
         Args:
             symbol: Trading symbol
             interval: Time interval
-            current_time: Timestamp of the current tick
+            current_bucket: Bucket start of the current tick (as computed
+                by get_interval_bucket in the caller)
         """
-        current_bucket = self.get_interval_bucket(current_time, interval)
-        
-        # Get all buffered buckets for this symbol/interval
-        symbol_interval_buffers = self.buffers[symbol][interval]
-        
-        # Find buckets that are older than current bucket (i.e., complete)
-        completed_buckets = [
-            bucket_start
-            for bucket_start in symbol_interval_buffers.keys()
-            if bucket_start < current_bucket
-        ]
+        # Open buckets for this symbol/interval, oldest first
+        open_buckets = self._open_buckets.get((symbol, interval))
         
-        # Finalize each completed bucket
-        for bucket_start in completed_buckets:
-            ticks = symbol_interval_buffers[bucket_start]
+        # Finalize buckets older than the current bucket (i.e., complete)
+        while open_buckets and open_buckets[0] < current_bucket:
+            bucket_start = open_buckets.pop(0)
             
-            # Compute OHLC from ticks
-            ohlc = self._compute_ohlc(ticks, symbol, interval, bucket_start)
+            # Remove from buffer (free memory)
+            bar = self.buffers.pop((symbol, interval, bucket_start))
+            
+            # Snapshot the running bar as OHLC
+            ohlc = self._compute_ohlc(bar, symbol, interval, bucket_start)
             
             if ohlc:  # Skip empty intervals
-                # Persist to database
-                await self.db.insert_ohlc(symbol, interval, ohlc)
+                # Queue for the next batched write
+                self._pending_bars.append(ohlc)
                 
                 logger.info(
                     f"Finalized {interval} bar: {symbol} @ {bucket_start.strftime('%H:%M:%S')} "
                     f"(O: ${ohlc.open:.2f}, H: ${ohlc.high:.2f}, L: ${ohlc.low:.2f}, C: ${ohlc.close:.2f}, "
                     f"V: {ohlc.volume:.6f}, Trades: {ohlc.trade_count})"
                 )
-            
-            # Remove from buffer (free memory)
-            del symbol_interval_buffers[bucket_start]
     
     def _compute_ohlc(
         self,
-        ticks: List[TradeData],
+        bar: _BarAccumulator,
         symbol: str,
         interval: str,
         bucket_start: datetime
     ) -> OHLCData:
         """
-        Compute OHLC bar from a list of ticks.
+        Build the OHLC bar of a bucket from its running aggregate.
         
         OHLC definition:
         - Open: First tick's price
@@ -219,8 +324,11 @@ class TickResampler:
         - Volume: Sum of tick sizes
         - Trade count: Number of ticks
         
+        All of these are maintained per tick (_BarAccumulator.add), so this
+        is O(1) whatever the number of trades in the bucket.
+        
         Args:
-            ticks: List of trade data in the interval
+            bar: Running aggregate of the bucket's trades
             symbol: Trading symbol
             interval: Time interval
             bucket_start: Start of the interval bucket
@@ -228,25 +336,19 @@ class TickResampler:
         Returns:
             OHLCData object, or None if no ticks
         """
-        if not ticks:
+        if bar is None or not bar.count:
             return None  # Skip empty intervals
         
-        # Sort ticks by timestamp (should already be sorted, but be safe)
-        sorted_ticks = sorted(ticks, key=lambda t: t.timestamp)
-        
-        # Extract prices for min/max calculation
-        prices = [tick.price for tick in sorted_ticks]
-        
         return OHLCData(
             symbol=symbol,
             interval=interval,
             timestamp=bucket_start,
-            open=sorted_ticks[0].price,      # First tick
-            high=max(prices),                # Highest price
-            low=min(prices),                 # Lowest price
-            close=sorted_ticks[-1].price,    # Last tick
-            volume=sum(tick.size for tick in sorted_ticks),
-            trade_count=len(sorted_ticks)
+            open=bar.open,          # First tick
+            high=bar.high,          # Highest price
+            low=bar.low,            # Lowest price
+            close=bar.close,        # Last tick
+            volume=bar.volume,
+            trade_count=bar.count
         )
     
     async def flush_remaining(self) -> None:
@@ -258,13 +360,42 @@ class TickResampler:
         """
         logger.info("Flushing remaining OHLC buffers...")
         
-        for symbol in self.buffers:
-            for interval in self.buffers[symbol]:
-                for bucket_start, ticks in list(self.buffers[symbol][interval].items()):
-                    ohlc = self._compute_ohlc(ticks, symbol, interval, bucket_start)
-                    
-                    if ohlc:
-                        await self.db.insert_ohlc(symbol, interval, ohlc)
-                        logger.info(f"Flushed final {interval} bar: {symbol} @ {bucket_start}")
+        for (symbol, interval, bucket_start), bar in list(self.buffers.items()):
+            ohlc = self._compute_ohlc(bar, symbol, interval, bucket_start)
+            
+            if ohlc:
+                self._pending_bars.append(ohlc)
+                logger.info(f"Flushed final {interval} bar: {symbol} @ {bucket_start}")
+        
+        await self.flush_bars()
         
         logger.info("OHLC buffer flush complete")
+    
+    async def _maybe_flush_bars(self) -> None:
+        """
+        Write pending bars once OHLC_BATCH_SIZE bars are queued or
+        OHLC_BATCH_TIMEOUT seconds have passed since the last write.
+        """
+        if not self._pending_bars:
+            return
+        
+        if (
+            len(self._pending_bars) >= OHLC_BATCH_SIZE
+            or time.monotonic() - self._last_bar_flush >= OHLC_BATCH_TIMEOUT
+        ):
+            await self.flush_bars()
+    
+    async def flush_bars(self) -> None:
+        """
+        Write all pending finalized bars in a single transaction.
+        
+        Open (incomplete) buckets are left untouched.
+        """
+        self._last_bar_flush = time.monotonic()
+        
+        if not self._pending_bars:
+            return
+        
+        bars = self._pending_bars
+        self._pending_bars = []
+        await self.db.insert_ohlc_many(bars)
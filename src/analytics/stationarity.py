@@ -6,15 +6,18 @@ if a time series is stationary - a critical requirement for mean-reversion
 trading strategies.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import numpy as np
+from statsmodels.tsa.adfvalues import mackinnoncrit, mackinnonp
 from statsmodels.tsa.stattools import adfuller
 
 from ..storage.database import DatabaseManager
-from ..config import MIN_DATA_POINTS_ADF
+from ..config import ADF_FIXED_LAG, MIN_DATA_POINTS_ADF
+from ._kernels import adf_tstat
 from .models import ADFTestResult
 
 logger = logging.getLogger(__name__)
@@ -28,14 +31,48 @@ class StationarityAnalyzer:
     non-stationary (has a unit root, random walk).
     """
     
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, fast: bool = True):
         """
         Initialize stationarity analyzer.
         
         Args:
             db: Database manager instance
+            fast: Fit a single ADF regression at ADF_FIXED_LAG instead of
+                selecting the lag by AIC over maxlag+1 fits
         """
         self.db = db
+        self.fast = fast
+    
+    def _adfuller(self, values: np.ndarray) -> tuple:
+        """
+        Run adfuller() with the lag selection this analyzer is configured for.
+        
+        Args:
+            values: Series to test (float64 array, no NaN)
+        
+        Returns:
+            (test_statistic, p_value, critical_values)
+        """
+        if self.fast:
+            # A small fixed lag: at 50-200 points the Schwert-rule lag
+            # (12·(n/100)^(1/4) ≈ 10) costs most of the test's power.
+            # The single regression runs in the adf_tstat kernel; p-value and
+            # critical values are MacKinnon's, exactly as adfuller() reports
+            test_statistic = adf_tstat(values, ADF_FIXED_LAG)
+            if not np.isfinite(test_statistic):
+                raise ValueError("ADF regression is singular (constant series?)")
+            
+            nobs = len(values) - ADF_FIXED_LAG - 1
+            critical_values = dict(zip(
+                ('1%', '5%', '10%'), mackinnoncrit(N=1, regression='c', nobs=nobs)
+            ))
+            return test_statistic, mackinnonp(test_statistic, regression='c', N=1), critical_values
+        
+        result = adfuller(values, regression='c', autolag='AIC')
+        
+        # The AIC path appends the best information criterion to the tuple
+        test_statistic, p_value, _, _, critical_values = result[:5]
+        return test_statistic, p_value, critical_values
     
     async def adf_test(
         self,
@@ -83,21 +120,21 @@ class StationarityAnalyzer:
             end = datetime.now()
             start = end - timedelta(hours=24)
             
-            bars = await self.db.get_ohlc(symbol, interval, start, end, limit=window)
+            # Close prices as a contiguous float64 column (no per-bar objects)
+            arrays = await self.db.get_ohlc_arrays(
+                symbol, interval, start, end, limit=window, columns=('close',)
+            )
+            prices = arrays['close']
             
-            if len(bars) < MIN_DATA_POINTS_ADF:
+            if prices.size < MIN_DATA_POINTS_ADF:
                 logger.warning(
-                    f"Insufficient data for ADF test: {len(bars)} bars "
+                    f"Insufficient data for ADF test: {prices.size} bars "
                     f"(min: {MIN_DATA_POINTS_ADF})"
                 )
                 return None
             
-            # Extract close prices
-            prices = np.array([bar.close for bar in bars])
-            
-            # Perform ADF test
-            result = adfuller(prices, autolag='AIC')
-            test_statistic, p_value, _, _, critical_values, _ = result
+            # Perform ADF test (CPU-bound: off the event loop)
+            test_statistic, p_value, critical_values = await asyncio.to_thread(self._adfuller, prices)
             
             # Determine stationarity
             is_stationary = p_value < 0.05
@@ -111,7 +148,7 @@ class StationarityAnalyzer:
                 symbol=symbol,
                 test_statistic=test_statistic,
                 p_value=p_value,
-                critical_values={k: float(v) for k, v in critical_values.items()},
+                critical_values=critical_values,
                 is_stationary=is_stationary,
                 interpretation=interpretation,
                 timestamp=datetime.now()
@@ -130,21 +167,37 @@ class StationarityAnalyzer:
     
     async def adf_test_on_values(
         self,
-        values: List[float],
-        label: str = "spread"
+        values: Union[np.ndarray, List[float]],
+        label: str = "spread",
+        now: Optional[datetime] = None
     ) -> Optional[ADFTestResult]:
         """
         Perform ADF test on arbitrary values (e.g., spread).
         
         Use case: Test if trading spread is stationary
         
+        The computation runs in a worker thread (asyncio.to_thread), so the
+        event loop stays responsive while it runs.
+        
         Args:
-            values: List of values to test
+            values: Values to test (array or list)
             label: Description for logging/reporting
+            now: Result timestamp (defaults to datetime.now())
         
         Returns:
             ADFTestResult or None if insufficient data
         """
+        return await asyncio.to_thread(
+            self._adf_test_on_values_sync, values, label, now
+        )
+    
+    def _adf_test_on_values_sync(
+        self,
+        values: Union[np.ndarray, List[float]],
+        label: str = "spread",
+        now: Optional[datetime] = None
+    ) -> Optional[ADFTestResult]:
+        """Synchronous body of adf_test_on_values()."""
         try:
             if len(values) < MIN_DATA_POINTS_ADF:
                 logger.warning(
@@ -153,16 +206,16 @@ class StationarityAnalyzer:
                 )
                 return None
             
-            # Remove NaN values
-            clean_values = [v for v in values if not np.isnan(v)]
+            # Remove NaN/Inf values (vectorized, no per-element Python loop)
+            values = np.asarray(values, dtype=np.float64)
+            clean_values = values[np.isfinite(values)]
             
             if len(clean_values) < MIN_DATA_POINTS_ADF:
                 logger.warning(f"Insufficient non-NaN values for ADF test: {len(clean_values)}")
                 return None
             
             # Perform ADF test
-            result = adfuller(clean_values, autolag='AIC')
-            test_statistic, p_value, _, _, critical_values, _ = result
+            test_statistic, p_value, critical_values = self._adfuller(clean_values)
             
             is_stationary = p_value < 0.05
             
@@ -174,10 +227,10 @@ class StationarityAnalyzer:
                 symbol=label,
                 test_statistic=test_statistic,
                 p_value=p_value,
-                critical_values={k: float(v) for k, v in critical_values.items()},
+                critical_values=critical_values,
                 is_stationary=is_stationary,
                 interpretation=interpretation,
-                timestamp=datetime.now()
+                timestamp=now or datetime.now()
             )
             
             logger.info(
@@ -6,29 +6,36 @@ and other statistical measures for quantitative trading analytics.
 """
 
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Optional, Tuple
 
 import numpy as np
-import pandas as pd
 
 from ..storage.database import DatabaseManager
 from ..config import (
+    CACHE_MAX_AGE,
     DEFAULT_ROLLING_WINDOW,
+    MAX_CACHE_ENTRIES,
     MIN_DATA_POINTS_STATS,
     ZSCORE_WINDOW,
 )
+from ._kernels import price_stats, rolling_zscore
 from .models import PriceStats, VolumeStats
 
 logger = logging.getLogger(__name__)
 
+SymbolStats = Tuple[Optional[PriceStats], Optional[VolumeStats]]
+
 
 class StatisticsCalculator:
     """
     Calculator for descriptive statistics on price and volume data.
     
     Computes rolling statistics from OHLC bars stored in the database.
-    All methods are async and query the database for fresh data.
+    All methods are async and query the database for fresh data, except
+    that price/volume stats are memoized per latest bar timestamp.
     """
     
     def __init__(self, db: DatabaseManager):
@@ -39,6 +46,10 @@ class StatisticsCalculator:
             db: Database manager instance
         """
         self.db = db
+        
+        # Price/volume stats per data version, least recently used first:
+        # {(symbol, interval, window, latest bar ts): (time.monotonic() seconds, stats)}
+        self._stats_memo: OrderedDict[Tuple, Tuple[float, SymbolStats]] = OrderedDict()
     
     async def compute_price_stats(
         self,
@@ -62,49 +73,154 @@ class StatisticsCalculator:
         Returns:
             PriceStats object or None if insufficient data
         """
+        stats, _ = await self.compute_symbol_stats(symbol, interval, window)
+        return stats
+    
+    async def compute_volume_stats(
+        self,
+        symbol: str,
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW
+    ) -> Optional[VolumeStats]:
+        """
+        Compute volume statistics from OHLC bars.
+        
+        Args:
+            symbol: Trading symbol
+            interval: Time interval
+            window: Number of bars to analyze
+        
+        Returns:
+            VolumeStats object or None if insufficient data
+        """
+        _, volume_stats = await self.compute_symbol_stats(symbol, interval, window)
+        return volume_stats
+    
+    async def compute_symbol_stats(
+        self,
+        symbol: str,
+        interval: str = '1m',
+        window: int = DEFAULT_ROLLING_WINDOW,
+        last_bar: Optional[datetime] = None,
+        force_refresh: bool = False,
+        now: Optional[datetime] = None
+    ) -> SymbolStats:
+        """
+        Compute price and volume statistics from a single OHLC read.
+        
+        Closes and volumes are fetched together in one query, after an
+        index-only count has rejected windows with fewer than
+        MIN_DATA_POINTS_STATS bars. Results are
+        memoized by (symbol, interval, window, latest bar timestamp) for up
+        to CACHE_MAX_AGE, so repeated calls skip the read and the fit while
+        no new bar has closed.
+        
+        Args:
+            symbol: Trading symbol
+            interval: Time interval
+            window: Number of bars to analyze
+            last_bar: Latest bar timestamp, if the caller already has it
+                (otherwise looked up with one index query)
+            force_refresh: If True, bypass the memo and recompute
+            now: Reference time for the 24h range and the result timestamps
+                (defaults to datetime.now())
+        
+        Returns:
+            (PriceStats or None, VolumeStats or None)
+        """
         try:
+            if last_bar is None:
+                last_bar = await self.db.get_latest_timestamp(symbol, interval)
+            
+            key = (symbol, interval, window, last_bar)
+            memo = self._stats_memo.get(key)
+            if (
+                not force_refresh
+                and last_bar is not None
+                and memo is not None
+                and time.monotonic() - memo[0] < CACHE_MAX_AGE
+            ):
+                self._stats_memo.move_to_end(key)
+                return memo[1]
+            
             # Get last N OHLC bars
-            end = datetime.now()
-            start = end - timedelta(hours=24)  # Look back 24 hours
+            now = now or datetime.now()
+            start = now - timedelta(hours=24)  # Look back 24 hours
             
-            bars = await self.db.get_ohlc(symbol, interval, start, end, limit=window)
+            # Fail fast on too little data: one index-only count, no rows read
+            count = await self.db.count_ohlc(symbol, interval, start, now, limit=window)
+            if count < MIN_DATA_POINTS_STATS:
+                logger.warning(
+                    f"Insufficient data for stats: {count} bars "
+                    f"(min: {MIN_DATA_POINTS_STATS})"
+                )
+                return None, None
             
-            if len(bars) < MIN_DATA_POINTS_STATS:
+            # Closes and volumes as contiguous float64 arrays (no per-bar objects)
+            prices, volumes = await self.db.get_ohlc_close_volume(
+                symbol, interval, start, now, limit=window
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to compute stats for {symbol}: {e}")
+            return None, None
+        
+        result = (
+            self._price_stats(symbol, interval, prices, now),
+            self._volume_stats(symbol, interval, volumes, now)
+        )
+        
+        if last_bar is not None:
+            self._stats_memo[key] = (time.monotonic(), result)
+            self._stats_memo.move_to_end(key)
+            while len(self._stats_memo) > MAX_CACHE_ENTRIES:
+                self._stats_memo.popitem(last=False)
+        
+        return result
+    
+    def invalidate(self, symbol: str, interval: str) -> None:
+        """Drop the memoized stats of a symbol/interval (e.g. after a backfill)."""
+        for key in [key for key in self._stats_memo if key[:2] == (symbol, interval)]:
+            del self._stats_memo[key]
+    
+    def _price_stats(
+        self,
+        symbol: str,
+        interval: str,
+        prices: np.ndarray,
+        now: datetime
+    ) -> Optional[PriceStats]:
+        """PriceStats for a window of close prices (None if insufficient data)."""
+        try:
+            if prices.size < MIN_DATA_POINTS_STATS:
                 logger.warning(
-                    f"Insufficient data for price stats: {len(bars)} bars "
+                    f"Insufficient data for price stats: {prices.size} bars "
                     f"(min: {MIN_DATA_POINTS_STATS})"
                 )
                 return None
             
-            # Extract close prices
-            prices = np.array([bar.close for bar in bars])
-            
-            # Compute statistics
-            mean_price = float(np.mean(prices))
-            std_price = float(np.std(prices, ddof=1))  # Sample std
-            min_price = float(np.min(prices))
-            max_price = float(np.max(prices))
-            current_price = float(prices[-1])
+            # Compute statistics (one fused pass; sample std via Welford)
+            mean_price, std_price, min_price, max_price, first_price, current_price = price_stats(prices)
             
             # Percent change from first to last
-            change_pct = ((prices[-1] - prices[0]) / prices[0]) * 100 if prices[0] != 0 else 0.0
+            change_pct = ((current_price - first_price) / first_price) * 100 if first_price != 0 else 0.0
             
             result = PriceStats(
                 symbol=symbol,
                 interval=interval,
-                window_size=len(bars),
+                window_size=prices.size,
                 mean=mean_price,
                 std=std_price,
                 min=min_price,
                 max=max_price,
                 current=current_price,
                 change_pct=change_pct,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
             logger.debug(
-                f"Price stats for {symbol}: mean=${mean_price:.2f}, "
-                f"std=${std_price:.2f}, change={change_pct:+.2f}%"
+                "Price stats for %s: mean=$%.2f, std=$%.2f, change=%+.2f%%",
+                symbol, mean_price, std_price, change_pct
             )
             
             return result
@@ -113,58 +229,40 @@ class StatisticsCalculator:
             logger.error(f"Failed to compute price stats for {symbol}: {e}")
             return None
     
-    async def compute_volume_stats(
+    def _volume_stats(
         self,
         symbol: str,
-        interval: str = '1m',
-        window: int = DEFAULT_ROLLING_WINDOW
+        interval: str,
+        volumes: np.ndarray,
+        now: datetime
     ) -> Optional[VolumeStats]:
-        """
-        Compute volume statistics from OHLC bars.
-        
-        Args:
-            symbol: Trading symbol
-            interval: Time interval
-            window: Number of bars to analyze
-        
-        Returns:
-            VolumeStats object or None if insufficient data
-        """
+        """VolumeStats for a window of bar volumes (None if insufficient data)."""
         try:
-            # Get last N OHLC bars
-            end = datetime.now()
-            start = end - timedelta(hours=24)
-            
-            bars = await self.db.get_ohlc(symbol, interval, start, end, limit=window)
-            
-            if len(bars) < MIN_DATA_POINTS_STATS:
+            if volumes.size < MIN_DATA_POINTS_STATS:
                 logger.warning(
-                    f"Insufficient data for volume stats: {len(bars)} bars "
+                    f"Insufficient data for volume stats: {volumes.size} bars "
                     f"(min: {MIN_DATA_POINTS_STATS})"
                 )
                 return None
             
-            # Extract volumes
-            volumes = np.array([bar.volume for bar in bars])
-            
-            # Compute statistics
-            mean_vol = float(np.mean(volumes))
-            std_vol = float(np.std(volumes, ddof=1))
-            total_vol = float(np.sum(volumes))
+            # Compute statistics (vectorized reductions)
+            mean_vol = float(volumes.mean())
+            std_vol = float(volumes.std(ddof=1))
+            total_vol = float(volumes.sum())
             
             result = VolumeStats(
                 symbol=symbol,
                 interval=interval,
-                window_size=len(bars),
+                window_size=volumes.size,
                 mean_volume=mean_vol,
                 std_volume=std_vol,
                 total_volume=total_vol,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
             logger.debug(
-                f"Volume stats for {symbol}: mean={mean_vol:.6f}, "
-                f"total={total_vol:.6f}"
+                "Volume stats for %s: mean=%.6f, total=%.6f",
+                symbol, mean_vol, total_vol
             )
             
             return result
@@ -175,11 +273,11 @@ class StatisticsCalculator:
     
     async def compute_zscore(
         self,
-        values: List[float],
+        values: np.ndarray,
         window: int = ZSCORE_WINDOW
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
-        Compute rolling z-score for a list of values.
+        Compute rolling z-score for an array of values.
         
         Z-score formula: z_i = (value_i - μ_window) / σ_window
         
@@ -193,14 +291,16 @@ class StatisticsCalculator:
         - |z| < 1: Within normal range
         
         Args:
-            values: List of values (e.g., spread prices)
+            values: Values (e.g., spread), float64 array; used in place
+                without a copy when C-contiguous
             window: Rolling window size for mean/std calculation
         
         Returns:
-            List of z-scores (same length as input, with NaN for early values)
+            float64 array of z-scores (same length as input, with NaN for
+            early values)
         
         Example:
-            >>> values = [100, 102, 98, 105, 95, 110, 90]
+            >>> values = np.array([100, 102, 98, 105, 95, 110, 90], dtype=np.float64)
             >>> z_scores = await calc.compute_zscore(values, window=3)
             >>> # First 2 values will be NaN (not enough data)
             >>> # z_scores[2] onwards will have z-score values
@@ -211,28 +311,20 @@ class StatisticsCalculator:
                     f"Insufficient data for z-score: {len(values)} values "
                     f"(window: {window})"
                 )
-                return [np.nan] * len(values)
-            
-            # Convert to pandas Series for efficient rolling operations
-            series = pd.Series(values)
-            
-            # Compute rolling mean and std
-            rolling_mean = series.rolling(window=window).mean()
-            rolling_std = series.rolling(window=window).std(ddof=1)
-            
-            # Compute z-score
-            z_scores = (series - rolling_mean) / rolling_std
+                return np.full(len(values), np.nan)
             
-            # Convert back to list, handling NaN
-            result = z_scores.tolist()
+            # Single-pass rolling mean/std (running sums, no per-window re-aggregation)
+            z_scores = rolling_zscore(np.ascontiguousarray(values, dtype=np.float64), window)
             
-            logger.debug(
-                f"Computed {len([z for z in result if not np.isnan(z)])} "
-                f"z-scores from {len(values)} values"
-            )
+            # Counting the valid z-scores is a pass of its own: only when logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Computed %d z-scores from %d values",
+                    np.count_nonzero(~np.isnan(z_scores)), len(values)
+                )
             
-            return result
+            return z_scores
             
         except Exception as e:
             logger.error(f"Failed to compute z-score: {e}")
-            return [np.nan] * len(values)
+            return np.full(len(values), np.nan)
@@ -8,15 +8,31 @@ Provides endpoints for:
 """
 
 import asyncio
+import io
+import json
 import logging
+import threading
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Optional
 
-from flask import Flask, jsonify, request, send_file
+import numpy as np
+import pandas as pd
+from flask import Flask, Response, request
 from flask_cors import CORS
-import io
-import csv
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401 - enables pandas' engine='pyarrow'
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    PYARROW_AVAILABLE = False
 
 from ..config import (
     DATABASE_PATH,
@@ -33,6 +49,60 @@ CORS(app)  # Enable CORS for dashboard
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# SHARED RESOURCES
+# ============================================================================
+
+# One event loop, database connection and analytics engine for the whole
+# process (opened on first use, closed by close_resources()), so requests
+# skip the connect/schema setup and share the engine's result cache.
+# The loop runs forever on a daemon thread; request threads submit to it.
+_loop = asyncio.new_event_loop()
+_loop_thread = threading.Thread(target=_loop.run_forever, name="api-event-loop", daemon=True)
+_loop_thread.start()
+_db = DatabaseManager(DATABASE_PATH)
+_engine = AnalyticsEngine(_db)
+_db_ready: Optional[asyncio.Future] = None
+
+# Streamed CSV exports are formatted and flushed to the client this many rows at a time
+CSV_CHUNK_ROWS = 5000
+
+
+async def get_db() -> DatabaseManager:
+    """Shared database manager, initialized on first use."""
+    global _db_ready
+    
+    if _db_ready is None:
+        _db_ready = asyncio.ensure_future(_db.initialize())
+    await _db_ready
+    
+    if _db.conn is None:
+        raise RuntimeError(f"Database unavailable: {DATABASE_PATH}")
+    
+    return _db
+
+
+async def get_engine() -> AnalyticsEngine:
+    """Shared analytics engine (on the shared database manager)."""
+    await get_db()
+    return _engine
+
+
+def close_resources() -> None:
+    """
+    Close the shared database connection and event loop.
+    
+    Call once at process exit: the database connection runs on a
+    non-daemon thread that would otherwise keep the interpreter alive.
+    """
+    if _db_ready is not None:
+        asyncio.run_coroutine_threadsafe(_db.close(), _loop).result()
+    
+    _loop.call_soon_threadsafe(_loop.stop)
+    _loop_thread.join()
+    _loop.close()
+
+
 # ============================================================================
 # ASYNC-TO-SYNC WRAPPER
 # ============================================================================
@@ -41,16 +111,13 @@ def async_to_sync(f):
     """
     Decorator to run async functions in Flask routes.
     
-    Creates a new event loop, runs the async function, and returns result.
+    Submits the coroutine to the shared background event loop and blocks
+    the request thread until it completes. Concurrent requests interleave
+    on the loop at their await points instead of queueing for it.
     """
     @wraps(f)
     def wrapper(*args, **kwargs):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(f(*args, **kwargs))
-        finally:
-            loop.close()
+        return asyncio.run_coroutine_threadsafe(f(*args, **kwargs), _loop).result()
     return wrapper
 
 
@@ -58,6 +125,54 @@ def async_to_sync(f):
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _json_default(obj):
+    """Stdlib json fallback for NumPy values (NaN becomes null, as with orjson)."""
+    if isinstance(obj, np.ndarray):
+        return [None if x != x else x for x in obj.tolist()]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """
+    JSON response for API payloads.
+    
+    Encodes with orjson when installed: NumPy arrays and scalars are
+    serialized natively in C, so payloads can carry spread/z-score arrays
+    without per-element float() conversion. Falls back to stdlib json.
+    """
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(payload, default=_json_default)
+    
+    return Response(body, status=status, mimetype='application/json')
+
+
+def read_upload_csv(data: bytes) -> pd.DataFrame:
+    """
+    Parse an uploaded OHLC CSV.
+    
+    Uses pandas' pyarrow engine when pyarrow is installed (multithreaded
+    C++ parsing, several times faster on multi-MB uploads) and the C
+    parser otherwise, or if pyarrow rejects the file, so error handling
+    (e.g. EmptyDataError) is always the C parser's.
+    
+    symbol/interval repeat a handful of values: as categoricals each
+    distinct string is stored once and the summary reads off the codes.
+    """
+    dtype = {'symbol': 'category', 'interval': 'category'}
+    
+    if PYARROW_AVAILABLE:
+        try:
+            return pd.read_csv(io.BytesIO(data), engine='pyarrow', dtype=dtype)
+        except Exception as e:
+            logger.debug("pyarrow CSV parse failed, using the C parser: %s", e)
+    
+    return pd.read_csv(io.BytesIO(data), dtype=dtype)
+
+
 def serialize_ohlc(bars):
     """Serialize OHLC bars to JSON-compatible format."""
     return [
@@ -110,6 +225,14 @@ def serialize_pairs(result):
     reg = result['regression']
     adf = result.get('adf_test')
     corr = result.get('correlation')
+    spread = np.asarray(result['spread'], dtype=np.float64)
+    z_score = np.asarray(result['z_score'], dtype=np.float64)
+    
+    # The plotted tails go out as float32: orjson writes float32's shortest
+    # repr (~40% smaller payload) and 7 digits is plenty for a chart. The
+    # 'latest' values (used for alerts) keep full float64 precision
+    spread_tail = spread[-100:].astype(np.float32)
+    z_score_tail = z_score[-100:].astype(np.float32)
     
     data = {
         "regression": {
@@ -120,12 +243,12 @@ def serialize_pairs(result):
             "timestamp": reg.timestamp.isoformat()
         },
         "spread": {
-            "values": [float(x) for x in result['spread'][-100:]],
-            "latest": float(result['spread'][-1]) if result['spread'] else None
+            "values": spread_tail,
+            "latest": float(spread[-1]) if spread.size else None
         },
         "z_score": {
-            "values": [float(x) if not str(x) == 'nan' else None for x in result['z_score'][-100:]],
-            "latest": float(result['z_score'][-1]) if result['z_score'] and not str(result['z_score'][-1]) == 'nan' else None
+            "values": z_score_tail,
+            "latest": float(z_score[-1]) if z_score.size and not np.isnan(z_score[-1]) else None
         }
     }
     
@@ -143,10 +266,7 @@ def serialize_pairs(result):
         data["correlation"] = {
             "current": float(corr.correlation),
             "rolling_window": corr.rolling_window,
-            "history": [
-                {"timestamp": ts.isoformat(), "value": float(val)}
-                for ts, val in corr.correlation_history[-50:]
-            ],
+            "history": corr.history_payload(50),
             "timestamp": corr.timestamp.isoformat()
         }
     
@@ -162,7 +282,7 @@ def serialize_pairs(result):
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
+    return json_response({
         "status": "healthy",
         "service": "Crypto Analytics API",
         "timestamp": datetime.now().isoformat()
@@ -183,23 +303,19 @@ def get_ohlc(symbol):
     
     @async_to_sync
     async def fetch():
-        db = DatabaseManager(DATABASE_PATH)
-        await db.initialize()
+        db = await get_db()
         
         end = datetime.now()
         start = end - timedelta(hours=24)
         
-        bars = await db.get_ohlc(symbol, interval, start, end, limit=limit)
-        await db.close()
-        
-        return bars
+        return await db.get_ohlc(symbol, interval, start, end, limit=limit)
     
     bars = fetch()
     
     if not bars:
-        return jsonify({"error": f"No data available for {symbol}"}), 404
+        return json_response({"error": f"No data available for {symbol}"}, 404)
     
-    return jsonify({
+    return json_response({
         "symbol": symbol,
         "interval": interval,
         "count": len(bars),
@@ -223,21 +339,15 @@ def get_statistics(symbol):
     
     @async_to_sync
     async def fetch():
-        db = DatabaseManager(DATABASE_PATH)
-        await db.initialize()
-        engine = AnalyticsEngine(db)
-        
-        result = await engine.get_symbol_analytics(symbol, interval, force_refresh)
-        await db.close()
-        
-        return result
+        engine = await get_engine()
+        return await engine.get_symbol_analytics(symbol, interval, force_refresh)
     
     result = fetch()
     
     if not result:
-        return jsonify({"error": f"Insufficient data for {symbol}"}), 404
+        return json_response({"error": f"Insufficient data for {symbol}"}, 404)
     
-    return jsonify(serialize_stats(result))
+    return json_response(serialize_stats(result))
 
 
 @app.route('/api/pairs', methods=['GET'])
@@ -256,7 +366,7 @@ def get_pairs_analytics():
     symbol_y = request.args.get('symbol_y')
     
     if not symbol_x or not symbol_y:
-        return jsonify({"error": "symbol_x and symbol_y are required"}), 400
+        return json_response({"error": "symbol_x and symbol_y are required"}, 400)
     
     interval = request.args.get('interval', '1m')
     window = int(request.args.get('window', 60))
@@ -264,23 +374,17 @@ def get_pairs_analytics():
     
     @async_to_sync
     async def fetch():
-        db = DatabaseManager(DATABASE_PATH)
-        await db.initialize()
-        engine = AnalyticsEngine(db)
-        
-        result = await engine.get_pairs_analytics(
+        engine = await get_engine()
+        return await engine.get_pairs_analytics(
             symbol_x, symbol_y, interval, force_refresh
         )
-        await db.close()
-        
-        return result
     
     result = fetch()
     
     if not result:
-        return jsonify({"error": "Insufficient data for pairs analysis"}), 404
+        return json_response({"error": "Insufficient data for pairs analysis"}, 404)
     
-    return jsonify({
+    return json_response({
         "symbol_x": symbol_x,
         "symbol_y": symbol_y,
         "interval": interval,
@@ -289,12 +393,49 @@ def get_pairs_analytics():
     })
 
 
+@app.route('/api/data-version', methods=['GET'])
+def get_data_version():
+    """
+    Get the latest bar timestamp per symbol.
+    
+    Cheap to poll (one indexed lookup per symbol); the dashboard re-runs
+    its analytics callbacks only when this changes.
+    
+    Query params:
+    - symbols: Comma-separated symbols (required)
+    - interval: Bar interval [default: 1m]
+    """
+    symbols = [symbol for symbol in request.args.get('symbols', '').split(',') if symbol]
+    
+    if not symbols:
+        return json_response({"error": "symbols is required"}, 400)
+    
+    interval = request.args.get('interval', '1m')
+    
+    @async_to_sync
+    async def fetch():
+        db = await get_db()
+        return await asyncio.gather(*(
+            db.get_latest_timestamp(symbol, interval) for symbol in symbols
+        ))
+    
+    latest = fetch()
+    
+    return json_response({
+        "interval": interval,
+        "latest": {
+            symbol: ts.isoformat() if ts else None
+            for symbol, ts in zip(symbols, latest)
+        }
+    })
+
+
 @app.route('/api/symbols', methods=['GET'])
 def get_symbols():
     """Get list of available symbols."""
     from ..config import SYMBOLS
     
-    return jsonify({
+    return json_response({
         "symbols": SYMBOLS,
         "pairs": [[x, y] for x, y in DEFAULT_SYMBOL_PAIRS]
     })
@@ -314,103 +455,102 @@ def upload_ohlc():
     try:
         # Check if file was uploaded
         if 'file' not in request.files:
-            return jsonify({"error": "No file provided"}), 400
+            return json_response({"error": "No file provided"}, 400)
         
         file = request.files['file']
         
         if file.filename == '':
-            return jsonify({"error": "No file selected"}), 400
+            return json_response({"error": "No file selected"}, 400)
         
         if not file.filename.endswith('.csv'):
-            return jsonify({"error": "Only CSV files are supported"}), 400
+            return json_response({"error": "Only CSV files are supported"}, 400)
         
-        # Read CSV content
-        content = file.read().decode('utf-8')
-        lines = content.strip().split('\n')
+        # Parse CSV (columns are converted whole below)
+        try:
+            df = read_upload_csv(file.stream.read())
+        except pd.errors.EmptyDataError:
+            return json_response({"error": "CSV file is empty"}, 400)
         
-        if len(lines) < 2:
-            return jsonify({"error": "CSV file is empty"}), 400
+        if df.empty:
+            return json_response({"error": "CSV file is empty"}, 400)
         
-        # Parse header
-        header = lines[0].strip().split(',')
         required_fields = ['timestamp', 'symbol', 'interval', 'open', 'high', 'low', 'close', 'volume']
         
-        if not all(field in header for field in required_fields):
-            return jsonify({"error": f"CSV must contain fields: {', '.join(required_fields)}"}), 400
+        if not all(field in df.columns for field in required_fields):
+            return json_response({"error": f"CSV must contain fields: {', '.join(required_fields)}"}, 400)
+        
+        # Unparseable values become NaN/NaT; rows with any of them are skipped
+        timestamps = pd.to_datetime(df['timestamp'], errors='coerce', format='ISO8601')
+        values = df[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric, errors='coerce')
+        if 'trade_count' in df.columns:
+            trade_counts = pd.to_numeric(df['trade_count'], errors='coerce').fillna(0)
+        else:
+            trade_counts = pd.Series(0, index=df.index)
+        
+        valid = (
+            timestamps.notna()
+            & values.notna().all(axis=1)
+            & df['symbol'].notna()
+            & df['interval'].notna()
+        )
+        
+        skipped = int((~valid).sum())
+        if skipped:
+            logger.warning(f"Skipping {skipped} invalid CSV rows")
         
-        # Parse data rows
-        from ..analytics.models import OHLCData
-        ohlc_bars = []
+        if not valid.any():
+            return json_response({"error": "No valid OHLC data found in file"}, 400)
         
-        for line_num, line in enumerate(lines[1:], start=2):
-            try:
-                values = line.strip().split(',')
-                if len(values) < len(required_fields):
-                    continue
-                
-                row = dict(zip(header, values))
-                
-                # Parse timestamp
-                timestamp = datetime.fromisoformat(row['timestamp'].replace('Z', '+00:00'))
-                
-                # Create OHLC object
-                ohlc = OHLCData(
-                    timestamp=timestamp,
-                    symbol=row['symbol'],
-                    interval=row['interval'],
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=float(row['volume']),
-                    trade_count=int(row.get('trade_count', 0))
-                )
-                ohlc_bars.append(ohlc)
-                
-            except Exception as e:
-                logger.warning(f"Skipping line {line_num}: {e}")
-                continue
+        symbols = df['symbol'][valid]
+        intervals = df['interval'][valid]
+        timestamps = timestamps[valid].map(pd.Timestamp.isoformat).tolist()
+        values = values[valid]
         
-        if not ohlc_bars:
-            return jsonify({"error": "No valid OHLC data found in file"}), 400
+        rows = list(zip(
+            symbols.tolist(),
+            intervals.tolist(),
+            timestamps,
+            values['open'].tolist(),
+            values['high'].tolist(),
+            values['low'].tolist(),
+            values['close'].tolist(),
+            values['volume'].tolist(),
+            trade_counts[valid].astype(np.int64).tolist()
+        ))
         
-        # Insert into database
+        # Insert into database (one executemany, one transaction)
         @async_to_sync
         async def insert_data():
-            db = DatabaseManager(DATABASE_PATH)
-            await db.initialize()
+            db = await get_db()
+            await db.insert_ohlc_rows(rows)
             
-            inserted = 0
-            for bar in ohlc_bars:
-                await db.insert_ohlc(bar)
-                inserted += 1
+            # Backfilled bars land before the latest ones, where the
+            # engine's incremental state never looks
+            engine = await get_engine()
+            for symbol, interval in set(zip(symbols.tolist(), intervals.tolist())):
+                engine.invalidate(symbol, interval)
             
-            await db.close()
-            return inserted
+            return len(rows)
         
         inserted_count = insert_data()
         
-        # Get summary
-        symbols = list(set(bar.symbol for bar in ohlc_bars))
-        intervals = list(set(bar.interval for bar in ohlc_bars))
-        
-        return jsonify({
+        return json_response({
             "success": True,
             "message": f"Successfully uploaded {inserted_count} OHLC bars",
             "summary": {
                 "total_bars": inserted_count,
-                "symbols": symbols,
-                "intervals": intervals,
+                "symbols": symbols.unique().tolist(),
+                "intervals": intervals.unique().tolist(),
                 "time_range": {
-                    "start": ohlc_bars[0].timestamp.isoformat() if ohlc_bars else None,
-                    "end": ohlc_bars[-1].timestamp.isoformat() if ohlc_bars else None
+                    "start": timestamps[0],
+                    "end": timestamps[-1]
                 }
             }
         })
         
     except Exception as e:
         logger.error(f"Upload error: {e}")
-        return jsonify({"error": f"Upload failed: {str(e)}"}), 500
+        return json_response({"error": f"Upload failed: {str(e)}"}, 500)
 
 
 @app.route('/api/export/csv/<symbol_x>/<symbol_y>', methods=['GET'])
@@ -425,73 +565,61 @@ def export_analytics_csv(symbol_x, symbol_y):
     
     @async_to_sync
     async def fetch():
-        db = DatabaseManager(DATABASE_PATH)
-        await db.initialize()
-        engine = AnalyticsEngine(db)
-        
-        result = await engine.get_pairs_analytics(symbol_x, symbol_y, interval, force_refresh=True)
-        await db.close()
-        
-        return result
+        engine = await get_engine()
+        # Cached/versioned path: the result cache is invalidated on backfills,
+        # and force_refresh would throw away the engine's incremental state
+        return await engine.get_pairs_analytics(symbol_x, symbol_y, interval)
     
     result = fetch()
     
     if not result:
-        return jsonify({"error": "No data to export"}), 404
-    
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Headers
-    writer.writerow([
-        'index', 'spread', 'z_score', 'hedge_ratio', 'r_squared', 
-        'is_stationary', 'correlation'
-    ])
+        return json_response({"error": "No data to export"}, 404)
     
-    # Data rows
     reg = result['regression']
     adf = result.get('adf_test')
     corr = result.get('correlation')
     
-    for i, (spread, zscore) in enumerate(zip(result['spread'], result['z_score'])):
-        writer.writerow([
-            i,
-            float(spread),
-            float(zscore) if not str(zscore) == 'nan' else '',
-            float(reg.hedge_ratio),
-            float(reg.r_squared),
-            bool(adf.is_stationary) if adf else '',
-            float(corr.correlation) if corr else ''
-        ])
-    
-    # Prepare file
-    output.seek(0)
-    mem_file = io.BytesIO()
-    mem_file.write(output.getvalue().encode('utf-8'))
-    mem_file.seek(0)
+    # One frame for the whole export; pandas' C writer formats it in bulk.
+    # NaN z-scores (warm-up) become empty cells, as do the ADF/correlation
+    # columns when those results are missing
+    frame = pd.DataFrame({
+        'spread': result['spread'],
+        'z_score': result['z_score'],
+        'hedge_ratio': float(reg.hedge_ratio),
+        'r_squared': float(reg.r_squared),
+        'is_stationary': bool(adf.is_stationary) if adf else '',
+        'correlation': float(corr.correlation) if corr else ''
+    })
+    
+    def generate():
+        """Yield the CSV in slices of rows instead of building it all in memory."""
+        for start in range(0, max(len(frame), 1), CSV_CHUNK_ROWS):
+            yield frame.iloc[start:start + CSV_CHUNK_ROWS].to_csv(
+                header=start == 0,
+                index_label='index',
+                lineterminator='\r\n'
+            )
     
     filename = f"analytics_{symbol_x}_{symbol_y}_{interval}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     
-    return send_file(
-        mem_file,
+    return Response(
+        generate(),
         mimetype='text/csv',
-        as_attachment=True,
-        download_name=filename
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 
 @app.errorhandler(404)
 def not_found(error):
     """404 error handler."""
-    return jsonify({"error": "Endpoint not found"}), 404
+    return json_response({"error": "Endpoint not found"}, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """500 error handler."""
     logger.error(f"Internal error: {error}")
-    return jsonify({"error": "Internal server error"}), 500
+    return json_response({"error": "Internal server error"}, 500)
 
 
 if __name__ == '__main__':
@@ -500,8 +628,11 @@ if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
     logger.info(f"Starting Flask API on {FLASK_HOST}:{FLASK_PORT}")
     
-    app.run(
-        host=FLASK_HOST,
-        port=FLASK_PORT,
-        debug=FLASK_DEBUG
-    )
+    try:
+        app.run(
+            host=FLASK_HOST,
+            port=FLASK_PORT,
+            debug=FLASK_DEBUG
+        )
+    finally:
+        close_resources()
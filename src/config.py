@@ -73,6 +73,9 @@ LOG_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
 # Default log level
 LOG_LEVEL: str = "INFO"
 
+# Level for the per-tick "TICK" trace logger (set to "DEBUG" to print every tick)
+TICK_LOG_LEVEL: str = "INFO"
+
 # ============================================================================
 # DATABASE CONFIGURATION
 # ============================================================================
@@ -87,6 +90,14 @@ DATABASE_PATH: str = "data/crypto_analytics.db"
 TICK_BATCH_SIZE: int = 100          # Flush after N ticks
 TICK_BATCH_TIMEOUT: float = 1.0     # Flush after N seconds (whichever comes first)
 
+# Ingest micro-batching (ticks drained from the fan-in queue per DB transaction)
+INGEST_BATCH_MAX_TICKS: int = 1000  # Max ticks per batch
+INGEST_BATCH_MAX_DELAY: float = 0.05  # Max seconds spent draining one batch
+
+# Finalized OHLC bars written per DB transaction
+OHLC_BATCH_SIZE: int = 64           # Flush after N bars
+OHLC_BATCH_TIMEOUT: float = 0.5     # Flush after N seconds (whichever comes first)
+
 # ============================================================================
 # RESAMPLING CONFIGURATION
 # ============================================================================
@@ -112,12 +123,22 @@ MIN_DATA_POINTS_REGRESSION: int = 30    # OLS regression
 MIN_DATA_POINTS_ADF: int = 50           # ADF stationarity test
 MIN_DATA_POINTS_CORRELATION: int = 20   # Correlation analysis
 
+# Fixed ADF lag for the fast stationarity test (single regression, no AIC search)
+ADF_FIXED_LAG: int = 1
+
 # Cache TTL (time-to-live) in seconds
 CACHE_TTL_STATS: float = 5.0            # Price/volume statistics
 CACHE_TTL_REGRESSION: float = 10.0      # Regression results
 CACHE_TTL_ADF: float = 60.0             # ADF test (expensive)
 CACHE_TTL_CORRELATION: float = 10.0     # Correlation metrics
 
+# After its TTL, a cached result is still reused while no new bar has arrived
+# (checked via the latest bar timestamp), up to this age in seconds
+CACHE_MAX_AGE: float = 300.0
+
+# Maximum number of cached analytics results (least recently used evicted first)
+MAX_CACHE_ENTRIES: int = 512
+
 # Pairs trading configuration
 DEFAULT_SYMBOL_PAIRS: List[Tuple[str, str]] = [
     ("BTCUSDT", "ETHUSDT"),
@@ -7,15 +7,54 @@ Provides interactive charts and controls for real-time analytics.
 import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output, State
+from flask import Response
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import requests
+import time
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from ..config import FLASK_HOST, FLASK_PORT, DASHBOARD_UPDATE_INTERVAL, SYMBOLS
+
+class CachedLayoutDash(dash.Dash):
+    """
+    Dash app that serves /_dash-layout from bytes serialized once.
+    
+    The layout is static, so re-encoding the tree on every page load is
+    wasted work: the first response of Dash's own serve_layout() (layout
+    hooks included, so the bytes are exactly what Dash would send) is kept
+    and reused. Assigning app.layout drops the cached bytes, and a layout
+    function (which may differ per request) is always served by Dash.
+    """
+    
+    _layout_json: Optional[bytes] = None
+    
+    @dash.Dash.layout.setter
+    def layout(self, value):
+        dash.Dash.layout.fset(self, value)
+        self._layout_json = None
+    
+    def serve_layout(self):
+        """Serve the cached layout bytes, serializing them on first use."""
+        if callable(self.layout):
+            return super().serve_layout()
+        
+        if self._layout_json is None:
+            self._layout_json = super().serve_layout().get_data()
+        return Response(self._layout_json, mimetype='application/json')
 
-from ..config import FLASK_HOST, FLASK_PORT, DASHBOARD_UPDATE_INTERVAL
 
 # Initialize Dash app with dark theme
-app = dash.Dash(
+app = CachedLayoutDash(
     __name__,
     external_stylesheets=[dbc.themes.CYBORG],
     suppress_callback_exceptions=True
@@ -24,160 +63,363 @@ app = dash.Dash(
 # Flask API base URL
 API_BASE = f"http://{FLASK_HOST}:{FLASK_PORT}/api"
 
+# Alerts kept in the alert log (newest first)
+MAX_ALERTS = 20
+
+# ============================================================================
+# DROPDOWN OPTIONS
+# ============================================================================
+
+# Icons for the known base assets; anything else gets a neutral bullet
+_SYMBOL_ICONS = {'BTC': '🪙', 'ETH': '💎'}
+_QUOTE_ASSETS = ('USDT', 'USDC', 'BUSD', 'BTC')
+
+
+def _symbol_label(symbol: str) -> str:
+    """Format a symbol like "BTCUSDT" as "🪙 BTC/USDT"."""
+    for quote in _QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            base = symbol[:-len(quote)]
+            return f"{_SYMBOL_ICONS.get(base, '•')} {base}/{quote}"
+    return symbol
+
+
+@lru_cache(maxsize=8)
+def _symbol_options(symbols: FrozenSet[str]) -> List[Dict[str, str]]:
+    """Sorted dropdown options for a deduplicated symbol set (memoized)."""
+    return [{'label': _symbol_label(symbol), 'value': symbol} for symbol in sorted(symbols)]
+
+
+def build_symbol_options(symbols: Iterable[str]) -> List[Dict[str, str]]:
+    """
+    Build symbol dropdown options.
+    
+    Symbols are upper-cased and deduplicated through a set, then sorted, so
+    the same universe always yields the same (cached) list however it is
+    ordered or repeated.
+    
+    Args:
+        symbols: Symbols in any case (e.g., config.SYMBOLS)
+    
+    Returns:
+        List of {'label', 'value'} dicts sorted by symbol; callers must not
+        mutate it since it is shared
+    """
+    return _symbol_options(frozenset(symbol.upper() for symbol in symbols))
+
+
+# Built once at import; both symbol dropdowns share the same list
+_SYMBOL_OPTIONS = build_symbol_options(SYMBOLS)
+
+_INTERVAL_OPTIONS = [
+    {'label': '⚡ 1 Second', 'value': '1s'},
+    {'label': '📊 1 Minute', 'value': '1m'},
+    {'label': '📈 5 Minutes', 'value': '5m'},
+]
+
+# ============================================================================
+# STYLES
+# ============================================================================
+
+# Static style dicts, allocated once at import and shared by the builders
+
+# Header
+_STYLE_TITLE_ICON = {
+    'fontSize': '24px',
+    'marginRight': '12px'
+}
+
+_STYLE_TITLE = {
+    'background': 'linear-gradient(135deg, #00d4ff 0%, #00ff88 100%)',
+    'WebkitBackgroundClip': 'text',
+    'WebkitTextFillColor': 'transparent',
+    'fontWeight': '800',
+    'letterSpacing': '2px',
+    'margin': '0',
+    'fontSize': '20px'
+}
+
+_STYLE_TITLE_ROW = {
+    'display': 'flex',
+    'alignItems': 'center'
+}
+
+_STYLE_STATUS_DOT = {
+    'fontSize': '12px',
+    'marginRight': '6px',
+    'color': '#00ff88'
+}
+
+_STYLE_STATUS_TEXT = {
+    'fontSize': '11px',
+    'fontWeight': '700',
+    'letterSpacing': '1px'
+}
+
+_STYLE_STATUS_ROW = {
+    'display': 'flex',
+    'alignItems': 'center',
+    'justifyContent': 'flex-end'
+}
+
+_STYLE_HEADER = {
+    'padding': '12px 0',  # Reduced from 24px
+    'marginBottom': '12px',  # Reduced from 24px
+    'borderBottom': '1px solid rgba(0, 212, 255, 0.2)'
+}
+
+# Control panel
+_STYLE_PANEL_TITLE = {
+    'margin': '0',
+    'fontSize': '14px',
+    'fontWeight': '700',
+    'letterSpacing': '1px',
+    'color': '#00d4ff'
+}
+
+_STYLE_PANEL_HEADER = {
+    'backgroundColor': 'rgba(0, 212, 255, 0.05)',
+    'borderBottom': '2px solid rgba(0, 212, 255, 0.3)',
+    'padding': '16px'
+}
+
+_STYLE_LABEL = {
+    'fontSize': '11px',
+    'fontWeight': '700',
+    'letterSpacing': '1px',
+    'color': '#00d4ff',
+    'marginBottom': '8px',
+    'display': 'block'
+}
+
+_STYLE_LABEL_FIRST = {**_STYLE_LABEL, 'marginTop': '12px'}
+
+_STYLE_LABEL_SLIDER = {**_STYLE_LABEL, 'marginBottom': '12px'}
+
+_STYLE_DROPDOWN = {
+    'marginBottom': '16px',
+    'fontSize': '13px'
+}
+
+_STYLE_RADIO = {'marginBottom': '20px', 'fontSize': '13px'}
+
+_STYLE_BUTTON = {
+    'fontWeight': '700',
+    'fontSize': '11px',
+    'letterSpacing': '1px'
+}
+
+_STYLE_BUTTON_REFRESH = {
+    'width': '48%',
+    'backgroundColor': 'rgba(0, 212, 255, 0.2)',
+    'border': '1px solid #00d4ff',
+    'color': '#00d4ff',
+    **_STYLE_BUTTON
+}
+
+_STYLE_BUTTON_EXPORT = {
+    'width': '48%',
+    'backgroundColor': 'rgba(0, 255, 136, 0.2)',
+    'border': '1px solid #00ff88',
+    'color': '#00ff88',
+    **_STYLE_BUTTON
+}
+
+_STYLE_BUTTON_ADF = {
+    'width': '100%',
+    'backgroundColor': 'rgba(255, 193, 7, 0.2)',
+    'border': '1px solid #ffc107',
+    'color': '#ffc107',
+    **_STYLE_BUTTON,
+    'marginBottom': '12px'
+}
+
+_STYLE_BUTTON_ROW = {'display': 'flex', 'gap': '4%', 'marginBottom': '12px'}
+
+_STYLE_DIVIDER = {'borderColor': 'rgba(0, 212, 255, 0.2)', 'margin': '16px 0'}
+
+_STYLE_UPLOAD_LABEL = {**_STYLE_LABEL, 'fontSize': '10px', 'color': '#a855f7'}
+
+_STYLE_UPLOAD = {
+    'width': '100%',
+    'border': '2px dashed rgba(168, 85, 247, 0.4)',
+    'borderRadius': '8px',
+    'backgroundColor': 'rgba(168, 85, 247, 0.05)',
+    'cursor': 'pointer',
+    'transition': 'all 0.3s'
+}
+
+_STYLE_UPLOAD_ICON = {'fontSize': '20px', 'marginBottom': '4px'}
+_STYLE_UPLOAD_TITLE = {'fontSize': '10px', 'fontWeight': '700'}
+_STYLE_UPLOAD_HINT = {'fontSize': '9px', 'color': '#6c757d'}
+_STYLE_UPLOAD_AREA = {'textAlign': 'center', 'padding': '20px'}
+_STYLE_UPLOAD_STATUS = {'marginTop': '8px', 'fontSize': '11px'}
+
+_STYLE_PANEL_BODY = {'padding': '20px'}
+
+_STYLE_PANEL = {
+    'height': '100%',
+    'backgroundColor': 'rgba(13, 17, 23, 0.7)',
+    'border': '1px solid rgba(0, 212, 255, 0.2)',
+    'borderRadius': '12px',
+    'backdropFilter': 'blur(10px)'
+}
+
+# Stats cards (compact status badges)
+_CARD_STYLE = {
+    'backgroundColor': 'rgba(13, 17, 23, 0.7)',
+    'border': '1px solid rgba(255, 255, 255, 0.1)',
+    'borderRadius': '8px',
+    'backdropFilter': 'blur(10px)',
+    'height': '100%',
+    'padding': '0',
+    'overflow': 'hidden',
+    'boxShadow': '0 2px 4px rgba(0,0,0,0.2)'
+}
+
+_HEADER_STYLE = {
+    'fontSize': '10px',
+    'fontWeight': '700',
+    'letterSpacing': '1px',
+    'padding': '6px 10px',  # Reduced padding
+    'margin': '0',
+    'textTransform': 'uppercase',
+    'borderBottom': '1px solid rgba(255, 255, 255, 0.05)'
+}
+
+_BODY_STYLE = {
+    'padding': '8px 10px',  # Compact padding
+    'display': 'flex',
+    'flexDirection': 'column',
+    'justifyContent': 'center',
+    'minHeight': '50px'     # Fixed minimal height
+}
+
+_HEADER_PRICE = {**_HEADER_STYLE, 'color': '#00d4ff', 'backgroundColor': 'rgba(0, 212, 255, 0.05)'}
+_HEADER_REGRESSION = {**_HEADER_STYLE, 'color': '#00ff88', 'backgroundColor': 'rgba(0, 255, 136, 0.05)'}
+_HEADER_STATIONARITY = {**_HEADER_STYLE, 'color': '#a855f7', 'backgroundColor': 'rgba(168, 85, 247, 0.05)'}
+_HEADER_ALERTS = {**_HEADER_STYLE, 'color': '#ffc107', 'backgroundColor': 'rgba(255, 193, 7, 0.05)'}
+
+_STYLE_ZSCORE_INPUT = {
+    'width': '60px',
+    'padding': '3px 6px',
+    'backgroundColor': 'rgba(255, 193, 7, 0.1)',
+    'border': '1px solid rgba(255, 193, 7, 0.3)',
+    'borderRadius': '4px',
+    'color': '#ffc107',
+    'fontSize': '11px',
+    'fontWeight': '700'
+}
+
+_STYLE_ZSCORE_UNIT = {'fontSize': '10px', 'color': '#6c757d', 'marginLeft': '4px'}
+_STYLE_ZSCORE_ROW = {'display': 'flex', 'alignItems': 'center', 'marginBottom': '6px'}
+_STYLE_ALERT_LOG = {'overflowY': 'auto', 'maxHeight': '60px', 'fontSize': '10px'}
+
+_STYLE_ALERT_ITEM = {
+    'fontSize': '10px',
+    'padding': '2px 0',
+    'borderBottom': '1px solid rgba(255,255,255,0.05)',
+    'color': '#ffc107',
+    'whiteSpace': 'nowrap',
+    'overflow': 'hidden',
+    'textOverflow': 'ellipsis'
+}
+
+_STYLE_NO_ALERTS = {'fontSize': '10px', 'color': '#6c757d'}
+_STYLE_STATS_ROW = {'marginBottom': '12px'}
+
+# Chart tabs
+_STYLE_TAB = {'fontSize': '12px', 'fontWeight': '700'}
+
+_STYLE_TABS_HEADER = {
+    'backgroundColor': 'rgba(13, 17, 23, 0.5)',
+    'border': 'none',
+    'padding': '12px 16px'
+}
+
+_STYLE_TAB_CONTENT = {"minHeight": "500px"}
+
+_STYLE_PANE_SHOWN = {'display': 'block'}
+_STYLE_PANE_HIDDEN = {'display': 'none'}
+
+_STYLE_CHARTS_CARD = {
+    'backgroundColor': 'rgba(13, 17, 23, 0.7)',
+    'border': '1px solid rgba(0, 212, 255, 0.2)',
+    'borderRadius': '12px',
+    'backdropFilter': 'blur(10px)',
+    'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.3)'
+}
+
+
 # ============================================================================
 # LAYOUT COMPONENTS
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def create_header():
     """Create compact application header."""
     return dbc.Row([
         dbc.Col([
             html.Div([
                 # Icon
-                html.Span("⚡", style={
-                    'fontSize': '24px',
-                    'marginRight': '12px'
-                }),
+                html.Span("⚡", style=_STYLE_TITLE_ICON),
                 # Title - Simplified
-                html.H4("QUANT ANALYSIS", style={
-                    'background': 'linear-gradient(135deg, #00d4ff 0%, #00ff88 100%)',
-                    'WebkitBackgroundClip': 'text',
-                    'WebkitTextFillColor': 'transparent',
-                    'fontWeight': '800',
-                    'letterSpacing': '2px',
-                    'margin': '0',
-                    'fontSize': '20px'
-                })
-            ], style={
-                'display': 'flex',
-                'alignItems': 'center'
-            })
+                html.H4("QUANT ANALYSIS", style=_STYLE_TITLE)
+            ], style=_STYLE_TITLE_ROW)
         ], width=8),
         
         # Status indicator
         dbc.Col([
             html.Div([
-                html.Span("●", id="status-indicator", style={
-                    'fontSize': '12px',
-                    'marginRight': '6px',
-                    'color': '#00ff88'
-                }),
-                html.Span(id="status-text", children="Initializing", style={
-                    'fontSize': '11px',
-                    'fontWeight': '700',
-                    'letterSpacing': '1px'
-                }, className="text-success")
-            ], style={
-                'display': 'flex',
-                'alignItems': 'center',
-                'justifyContent': 'flex-end'
-            })
+                html.Span("●", id="status-indicator", style=_STYLE_STATUS_DOT),
+                html.Span(id="status-text", children="Initializing", style=_STYLE_STATUS_TEXT,
+                          className="text-success")
+            ], style=_STYLE_STATUS_ROW)
         ], width=4)
-    ], style={
-        'padding': '12px 0',  # Reduced from 24px
-        'marginBottom': '12px',  # Reduced from 24px
-        'borderBottom': '1px solid rgba(0, 212, 255, 0.2)'
-    })
+    ], style=_STYLE_HEADER)
 
 
+@lru_cache(maxsize=1)
 def create_controls_sidebar():
     """Create control panel sidebar."""
     return dbc.Card([
         dbc.CardHeader(
-            html.H4("⚙️ CONTROL PANEL", style={
-                'margin': '0',
-                'fontSize': '14px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#00d4ff'
-            }),
-            style={
-                'backgroundColor': 'rgba(0, 212, 255, 0.05)',
-                'borderBottom': '2px solid rgba(0, 212, 255, 0.3)',
-                'padding': '16px'
-            }
+            html.H4("⚙️ CONTROL PANEL", style=_STYLE_PANEL_TITLE),
+            style=_STYLE_PANEL_HEADER
         ),
         dbc.CardBody([
             # Symbol X Selection
-            html.Label("SYMBOL X", style={
-                'fontSize': '11px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#00d4ff',
-                'marginTop': '12px',
-                'marginBottom': '8px',
-                'display': 'block'
-            }),
+            html.Label("SYMBOL X", style=_STYLE_LABEL_FIRST),
             dcc.Dropdown(
-               id='symbol-x-dropdown',
-                options=[
-                    {'label': '🪙 BTC/USDT', 'value': 'BTCUSDT'},
-                    {'label': '💎 ETH/USDT', 'value': 'ETHUSDT'},
-                ],
+                id='symbol-x-dropdown',
+                options=_SYMBOL_OPTIONS,
                 value='BTCUSDT',
                 clearable=False,
-                style={
-                    'marginBottom': '16px',
-                    'fontSize': '13px'
-                }
+                style=_STYLE_DROPDOWN
             ),
             
             # Symbol Y Selection
-            html.Label("SYMBOL Y", style={
-                'fontSize': '11px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#00d4ff',
-                'marginBottom': '8px',
-                'display': 'block'
-            }),
+            html.Label("SYMBOL Y", style=_STYLE_LABEL),
             dcc.Dropdown(
                 id='symbol-y-dropdown',
-                options=[
-                    {'label': '💎 ETH/USDT', 'value': 'ETHUSDT'},
-                    {'label': '🪙 BTC/USDT', 'value': 'BTCUSDT'},
-                ],
+                options=_SYMBOL_OPTIONS,
                 value='ETHUSDT',
                 clearable=False,
-                style={
-                    'marginBottom': '16px',
-                    'fontSize': '13px'
-                }
+                style=_STYLE_DROPDOWN
             ),
             
             # Timeframe Selection
-            html.Label("TIMEFRAME", style={
-                'fontSize': '11px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#00d4ff',
-                'marginBottom': '8px',
-                'display': 'block'
-            }),
+            html.Label("TIMEFRAME", style=_STYLE_LABEL),
             dcc.Dropdown(
                 id='interval-dropdown',
-                options=[
-                    {'label': '⚡ 1 Second', 'value': '1s'},
-                    {'label': '📊 1 Minute', 'value': '1m'},
-                    {'label': '📈 5 Minutes', 'value': '5m'},
-                ],
+                options=_INTERVAL_OPTIONS,
                 value='1m',
                 clearable=False,
-                style={
-                    'marginBottom': '16px',
-                    'fontSize': '13px'
-                }
+                style=_STYLE_DROPDOWN
             ),
             
             # Rolling Window Slider
-            html.Label("ROLLING WINDOW", style={
-                'fontSize': '11px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#00d4ff',
-                'marginBottom': '12px',
-                'display': 'block'
-            }),
+            html.Label("ROLLING WINDOW", style=_STYLE_LABEL_SLIDER),
             dcc.Slider(
                 id='window-slider',
                 min=10,
@@ -190,152 +432,85 @@ def create_controls_sidebar():
             ),
             
             # Regression Type
-            html.Label("REGRESSION TYPE", style={
-                'fontSize': '11px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#00d4ff',
-                'marginBottom': '8px',
-                'display': 'block'
-            }),
+            html.Label("REGRESSION TYPE", style=_STYLE_LABEL),
             dcc.RadioItems(
                 id='regression-type',
                 options=[
                     {'label': '  OLS (Ordinary Least Squares)', 'value': 'ols'},
                 ],
                 value='ols',
-                style={'marginBottom': '20px', 'fontSize': '13px'}
+                style=_STYLE_RADIO
             ),
             
             # Action Buttons
             html.Div([
-                dbc.Button("🔄 REFRESH", id="refresh-btn", style={
-                    'width': '48%',
-                    'backgroundColor': 'rgba(0, 212, 255, 0.2)',
-                    'border': '1px solid #00d4ff',
-                    'color': '#00d4ff',
-                    'fontWeight': '700',
-                    'fontSize': '11px',
-                    'letterSpacing': '1px'
-                }),
-                dbc.Button("📥 EXPORT", id="export-btn", style={
-                    'width': '48%',
-                    'backgroundColor': 'rgba(0, 255, 136, 0.2)',
-                    'border': '1px solid #00ff88',
-                    'color': '#00ff88',
-                    'fontWeight': '700',
-                    'fontSize': '11px',
-                    'letterSpacing': '1px'
-                }),
-            ], style={'display': 'flex', 'gap': '4%', 'marginBottom': '12px'}),
+                dbc.Button("🔄 REFRESH", id="refresh-btn", style=_STYLE_BUTTON_REFRESH),
+                dbc.Button("📥 EXPORT", id="export-btn", style=_STYLE_BUTTON_EXPORT),
+            ], style=_STYLE_BUTTON_ROW),
             
-            dbc.Button("🧪 RUN ADF TEST", id="adf-btn", style={
-                'width': '100%',
-                'backgroundColor': 'rgba(255, 193, 7, 0.2)',
-                'border': '1px solid #ffc107',
-                'color': '#ffc107',
-                'fontWeight': '700',
-                'fontSize': '11px',
-                'letterSpacing': '1px',
-                'marginBottom': '12px'
-            }),
+            dbc.Button("🧪 RUN ADF TEST", id="adf-btn", style=_STYLE_BUTTON_ADF),
             
             # Upload OHLC Data
-            html.Hr(style={'borderColor': 'rgba(0, 212, 255, 0.2)', 'margin': '16px 0'}),
-            html.Label("UPLOAD HISTORICAL DATA", style={
-                'fontSize': '10px',
-                'fontWeight': '700',
-                'letterSpacing': '1px',
-                'color': '#a855f7',
-                'marginBottom': '8px',
-                'display': 'block'
-            }),
+            html.Hr(style=_STYLE_DIVIDER),
+            html.Label("UPLOAD HISTORICAL DATA", style=_STYLE_UPLOAD_LABEL),
             dcc.Upload(
                 id='upload-ohlc',
                 children=html.Div([
-                    html.Div('📤', style={'fontSize': '20px', 'marginBottom': '4px'}),
-                    html.Div('DRAG & DROP', style={'fontSize': '10px', 'fontWeight': '700'}),
-                    html.Div('or click to browse', style={'fontSize': '9px', 'color': '#6c757d'})
-                ], style={'textAlign': 'center', 'padding': '20px'}),
-                style={
-                    'width': '100%',
-                    'border': '2px dashed rgba(168, 85, 247, 0.4)',
-                    'borderRadius': '8px',
-                    'backgroundColor': 'rgba(168, 85, 247, 0.05)',
-                    'cursor': 'pointer',
-                    'transition': 'all 0.3s'
-                },
+                    html.Div('📤', style=_STYLE_UPLOAD_ICON),
+                    html.Div('DRAG & DROP', style=_STYLE_UPLOAD_TITLE),
+                    html.Div('or click to browse', style=_STYLE_UPLOAD_HINT)
+                ], style=_STYLE_UPLOAD_AREA),
+                style=_STYLE_UPLOAD,
                 multiple=False,
                 accept='.csv'
             ),
-            html.Div(id='upload-status', style={'marginTop': '8px', 'fontSize': '11px'}),
+            html.Div(id='upload-status', style=_STYLE_UPLOAD_STATUS),
             
             # Download component (hidden)
             dcc.Download(id="download-csv"),
-        ], style={'padding': '20px'})
-    ], style={
-        'height': '100%',
-        'backgroundColor': 'rgba(13, 17, 23, 0.7)',
-        'border': '1px solid rgba(0, 212, 255, 0.2)',
-        'borderRadius': '12px',
-        'backdropFilter': 'blur(10px)'
-    })
+        ], style=_STYLE_PANEL_BODY)
+    ], style=_STYLE_PANEL)
 
 
-def create_stats_cards():
-    """Create compact summary statistics cards (Status Badges)."""
-    # Compact style for all cards
-    card_style = {
-        'backgroundColor': 'rgba(13, 17, 23, 0.7)',
-        'border': '1px solid rgba(255, 255, 255, 0.1)',
-        'borderRadius': '8px',
-        'backdropFilter': 'blur(10px)',
-        'height': '100%',
-        'padding': '0',
-        'overflow': 'hidden',
-        'boxShadow': '0 2px 4px rgba(0,0,0,0.2)'
-    }
+def build_stats_row(price, regression, stationarity, alert_items):
+    """
+    Build the row of four compact stats cards (Status Badges).
     
-    header_style = {
-        'fontSize': '10px',
-        'fontWeight': '700',
-        'letterSpacing': '1px',
-        'padding': '6px 10px',  # Reduced padding
-        'margin': '0',
-        'textTransform': 'uppercase',
-        'borderBottom': '1px solid rgba(255, 255, 255, 0.05)'
-    }
+    The row is the single `stats-bundle` callback target; update_stats
+    patches the card bodies in place (see stats_patch()), so keep the card
+    structure in sync with _stats_body().
     
-    body_style = {
-        'padding': '8px 10px',  # Compact padding
-        'display': 'flex',
-        'flexDirection': 'column',
-        'justifyContent': 'center',
-        'minHeight': '50px'     # Fixed minimal height
-    }
-
+    Args:
+        price: Price stats card body
+        regression: Regression card body
+        stationarity: Stationarity card body
+        alert_items: Alert log children
+    
+    Returns:
+        dbc.Row with the four cards
+    """
     return dbc.Row([
         # Price Stats
         dbc.Col(dbc.Card([
-            html.Div("📊 Price Stats", style={**header_style, 'color': '#00d4ff', 'backgroundColor': 'rgba(0, 212, 255, 0.05)'}),
-            html.Div(id="price-stats-card", children="Loading...", style=body_style)
-        ], style=card_style), width=3),
+            html.Div("📊 Price Stats", style=_HEADER_PRICE),
+            html.Div(id="price-stats-card", children=price, style=_BODY_STYLE)
+        ], style=_CARD_STYLE), width=3),
         
         # Regression
         dbc.Col(dbc.Card([
-            html.Div("📈 Regression", style={**header_style, 'color': '#00ff88', 'backgroundColor': 'rgba(0, 255, 136, 0.05)'}),
-            html.Div(id="regression-stats-card", children="Loading...", style=body_style)
-        ], style=card_style), width=3),
+            html.Div("📈 Regression", style=_HEADER_REGRESSION),
+            html.Div(id="regression-stats-card", children=regression, style=_BODY_STYLE)
+        ], style=_CARD_STYLE), width=3),
         
         # Stationarity
         dbc.Col(dbc.Card([
-            html.Div("🔬 Stationarity", style={**header_style, 'color': '#a855f7', 'backgroundColor': 'rgba(168, 85, 247, 0.05)'}),
-            html.Div(id="stationarity-card", children="Loading...", style=body_style)
-        ], style=card_style), width=3),
+            html.Div("🔬 Stationarity", style=_HEADER_STATIONARITY),
+            html.Div(id="stationarity-card", children=stationarity, style=_BODY_STYLE)
+        ], style=_CARD_STYLE), width=3),
         
         # Alerts (with compact Z-Score input inside)
         dbc.Col(dbc.Card([
-            html.Div("⚠️ Alerts", style={**header_style, 'color': '#ffc107', 'backgroundColor': 'rgba(255, 193, 7, 0.05)'}),
+            html.Div("⚠️ Alerts", style=_HEADER_ALERTS),
             html.Div([
                 # Compact Z-Score threshold input
                 html.Div([
@@ -345,116 +520,257 @@ def create_stats_cards():
                         value=2.0,
                         step=0.1,
                         placeholder="Threshold",
-                        style={
-                            'width': '60px',
-                            'padding': '3px 6px',
-                            'backgroundColor': 'rgba(255, 193, 7, 0.1)',
-                            'border': '1px solid rgba(255, 193, 7, 0.3)',
-                            'borderRadius': '4px',
-                            'color': '#ffc107',
-                            'fontSize': '11px',
-                            'fontWeight': '700'
-                        }
+                        style=_STYLE_ZSCORE_INPUT
                     ),
-                    html.Span(" σ", style={'fontSize': '10px', 'color': '#6c757d', 'marginLeft': '4px'})
-                ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '6px'}),
+                    html.Span(" σ", style=_STYLE_ZSCORE_UNIT)
+                ], style=_STYLE_ZSCORE_ROW),
                 # Alerts list
-                html.Div(id="alert-log", children="No alerts", style={'overflowY': 'auto', 'maxHeight': '60px', 'fontSize': '10px'})
-            ], style=body_style)
-        ], style=card_style), width=3),
+                html.Div(id="alert-log", children=alert_items, style=_STYLE_ALERT_LOG)
+            ], style=_BODY_STYLE)
+        ], style=_CARD_STYLE), width=3),
         
-    ], className="g-2", style={'marginBottom': '12px'})  # g-2 for tight gutter, minimal bottom margin
+    ], className="g-2", style=_STYLE_STATS_ROW)  # g-2 for tight gutter, minimal bottom margin
+
+
+@lru_cache(maxsize=1)
+def create_stats_cards():
+    """Create compact summary statistics cards (Status Badges)."""
+    return html.Div(
+        build_stats_row("Loading...", "Loading...", "Loading...", "No alerts"),
+        id="stats-bundle"
+    )
+
 
+# One persistent pane per chart tab ("tab-<name>" shows "pane-<name>")
+_CHART_PANES = ('price', 'spread', 'correlation', 'heatmap')
 
+
+@lru_cache(maxsize=1)
 def create_charts_tabs():
-    """Create tabbed chart interface."""
+    """
+    Create tabbed chart interface.
+    
+    Each tab has its own pane, mounted once and shown or hidden by a
+    clientside callback, so flipping tabs does not rebuild figures.
+    """
     return dbc.Card([
         dbc.CardHeader(
             dbc.Tabs(
                 id="chart-tabs",
                 active_tab="tab-price",
                 children=[
-                    dbc.Tab(label="📈 PRICE", tab_id="tab-price", style={'fontSize': '12px', 'fontWeight': '700'}),
-                    dbc.Tab(label="📊 SPREAD", tab_id="tab-spread", style={'fontSize': '12px', 'fontWeight': '700'}),
-                    dbc.Tab(label="🔗 CORRELATION", tab_id="tab-correlation", style={'fontSize': '12px', 'fontWeight': '700'}),
-                    dbc.Tab(label="🗺️ HEATMAP", tab_id="tab-heatmap", style={'fontSize': '12px', 'fontWeight': '700'}),
+                    dbc.Tab(label="📈 PRICE", tab_id="tab-price", style=_STYLE_TAB),
+                    dbc.Tab(label="📊 SPREAD", tab_id="tab-spread", style=_STYLE_TAB),
+                    dbc.Tab(label="🔗 CORRELATION", tab_id="tab-correlation", style=_STYLE_TAB),
+                    dbc.Tab(label="🗺️ HEATMAP", tab_id="tab-heatmap", style=_STYLE_TAB),
                 ]
             ),
-            style={
-                'backgroundColor': 'rgba(13, 17, 23, 0.5)',
-                'border': 'none',
-                'padding': '12px 16px'
-            }
+            style=_STYLE_TABS_HEADER
         ),
         dbc.CardBody(
-            html.Div(id="tab-content", style={"minHeight": "500px"})
+            html.Div([
+                html.Div(
+                    id=f"pane-{name}",
+                    style=_STYLE_PANE_SHOWN if name == 'price' else _STYLE_PANE_HIDDEN
+                )
+                for name in _CHART_PANES
+            ] + [
+                # Inputs/data version each pane was last rendered for
+                dcc.Store(id=f"pane-{name}-key")
+                for name in _CHART_PANES
+            ], id="tab-content", style=_STYLE_TAB_CONTENT)
         )
-    ], style={
-        'backgroundColor': 'rgba(13, 17, 23, 0.7)',
-        'border': '1px solid rgba(0, 212, 255, 0.2)',
-        'borderRadius': '12px',
-        'backdropFilter': 'blur(10px)',
-        'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.3)'
-    })
+    ], style=_STYLE_CHARTS_CARD)
 
 
 # ============================================================================
 # MAIN LAYOUT
 # ============================================================================
 
-app.layout = dbc.Container([
-    # Header
-    create_header(),
+@lru_cache(maxsize=1)
+def _build_layout():
+    """
+    Build the full page layout once.
     
-    # Live Status Info Banner (Trust Layer)
-    dbc.Row([
-        dbc.Col([
-            html.Div(id='status-info-banner', children=[
-                html.Span("⏳ Initializing...", style={'color': '#6c757d', 'fontSize': '13px'})
-            ], style={
-                'padding': '12px 20px',
-                'backgroundColor': 'rgba(0, 212, 255, 0.05)',
-                'border': '1px solid rgba(0, 212, 255, 0.2)',
-                'borderRadius': '8px',
-                'marginBottom': '20px',
-                'display': 'flex',
-                'alignItems': 'center',
-                'gap': '20px',
-                'flexWrap': 'wrap'
-            })
-        ])
-    ]),
-    
-    # Main Content Row
-    dbc.Row([
-        # Control Panel (Sidebar)
-        dbc.Col(create_controls_sidebar(), width=3),
+    The builders above are memoized and return static trees, so the layout
+    is assembled a single time per process and never mutated afterwards.
+    """
+    return dbc.Container([
+        # Header
+        create_header(),
         
-        # Charts Area
-        dbc.Col([
-            # Stats Cards
-            create_stats_cards(),
+        # Live Status Info Banner (Trust Layer)
+        dbc.Row([
+            dbc.Col([
+                html.Div(id='status-info-banner', children=[
+                    html.Span("⏳ Initializing...", style={'color': '#6c757d', 'fontSize': '13px'})
+                ], style={
+                    'padding': '12px 20px',
+                    'backgroundColor': 'rgba(0, 212, 255, 0.05)',
+                    'border': '1px solid rgba(0, 212, 255, 0.2)',
+                    'borderRadius': '8px',
+                    'marginBottom': '20px',
+                    'display': 'flex',
+                    'alignItems': 'center',
+                    'gap': '20px',
+                    'flexWrap': 'wrap'
+                })
+            ])
+        ]),
+        
+        # Main Content Row
+        dbc.Row([
+            # Control Panel (Sidebar)
+            dbc.Col(create_controls_sidebar(), width=3),
             
-            # Charts Tabs
-            create_charts_tabs()
-        ], width=9)
-    ]),
+            # Charts Area
+            dbc.Col([
+                # Stats Cards
+                create_stats_cards(),
+                
+                # Charts Tabs
+                create_charts_tabs()
+            ], width=9)
+        ]),
+        
+        # Auto-refresh heartbeat: only polls the data version (see poll_data_version)
+        dcc.Interval(
+            id='interval-component',
+            interval=DASHBOARD_UPDATE_INTERVAL,
+            n_intervals=0
+        ),
+        
+        # Latest bar timestamps; analytics callbacks fire only when this changes
+        dcc.Store(id='data-version'),
+        
+        # Store for alerts
+        dcc.Store(id='alerts-store', data=[]),
+        
+        # Latest API status from update_stats; rendered in the header client-side
+        dcc.Store(id='status-store')
+        
+    ], fluid=True, style={
+        'padding': '24px',
+        'backgroundColor': '#0d1117',
+        'minHeight': '100vh'
+    })
+
+
+app.layout = _build_layout()
+
+# Serialize the layout at import rather than on the first page load
+with app.server.test_request_context():
+    app.serve_layout()
+
+
+# ============================================================================
+# DATA FETCHING
+# ============================================================================
+
+def decode_json(response):
+    """
+    Parse an API response body.
+    
+    Uses orjson when installed (several times faster than stdlib json on
+    the OHLC and spread/z-score arrays); falls back to response.json().
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _status(text, level):
+    """`status-store` value: header text, Bootstrap level and server time (ms)."""
+    return {'text': text, 'level': level, 'ts': time.time() * 1000}
+
+
+def _stats_body(patch, col):
+    """Patch handle on the props of stats card `col`'s body (Row > Col > Card > body)."""
+    return patch['props']['children'][col]['props']['children']['props']['children'][1]['props']
+
+
+def _alert_log(patch):
+    """Patch handle on the props of the alert log (second child of the alerts card body)."""
+    return _stats_body(patch, 3)['children'][1]['props']
+
+
+def _alert_item(alert):
+    """One compact alert log line."""
+    return html.Div(alert, style=_STYLE_ALERT_ITEM)
+
+
+def stats_patch(price, regression, stationarity):
+    """
+    Patch for `stats-bundle` replacing the three stats card bodies.
+    
+    Only the bodies are sent and re-rendered; the card frames, the alert log
+    and the Z-score threshold input are left in place.
+    """
+    patch = dash.Patch()
+    for col, body in enumerate((price, regression, stationarity)):
+        _stats_body(patch, col)['children'] = body
+    return patch
+
+
+def _version_key(data_version):
+    """Hashable key for a `data-version` store value (latest bar per symbol)."""
+    latest = (data_version or {}).get('latest')
+    return tuple(sorted(latest.items())) if latest else None
+
+
+def _request_pairs(symbol_x, symbol_y, interval, window, force_refresh=False):
+    """GET /api/pairs; returns (status_code, parsed JSON for a 200 or None)."""
+    params = {
+        'symbol_x': symbol_x,
+        'symbol_y': symbol_y,
+        'interval': interval,
+        'window': window
+    }
+    if force_refresh:
+        params['force_refresh'] = 'true'
+    
+    response = requests.get(f"{API_BASE}/pairs", params=params, timeout=10)
+    
+    return response.status_code, decode_json(response) if response.status_code == 200 else None
+
+
+@lru_cache(maxsize=32)
+def _request_pairs_versioned(symbol_x, symbol_y, interval, window, version_key):
+    """_request_pairs() memoized per data version."""
+    return _request_pairs(symbol_x, symbol_y, interval, window)
+
+
+def fetch_pairs_analytics(symbol_x, symbol_y, interval, window, version_key, force_refresh=False):
+    """
+    Fetch /api/pairs, memoized on the inputs and the data version.
     
-    # Auto-refresh interval
-    dcc.Interval(
-        id='interval-component',
-        interval=DASHBOARD_UPDATE_INTERVAL,
-        n_intervals=0
-    ),
+    The stats cards and the spread/correlation tabs all need the same
+    pairs payload; within one data version it is fetched once and shared.
+    A new bar changes version_key, but bars backfilled before the latest
+    one do not: force_refresh (the REFRESH button) clears the memo and
+    has the API recompute from the database. Without a known version
+    (None) every call goes to the API. Timeouts and connection errors
+    raise and are not cached.
     
-    # Store for alerts
-    dcc.Store(id='alerts-store', data=[])
+    Args:
+        symbol_x: First symbol
+        symbol_y: Second symbol
+        interval: Bar interval
+        window: Rolling window
+        version_key: _version_key() of the current `data-version`
+        force_refresh: If True, bypass the memo and the API's caches
     
-], fluid=True, style={
-    'padding': '24px',
-    'backgroundColor': '#0d1117',
-    'minHeight': '100vh'
-})
+    Returns:
+        (status_code, payload); payload is the parsed JSON for a 200
+        response (shared, do not mutate) and None otherwise
+    """
+    if force_refresh:
+        # Later fetches (e.g. the chart tabs) must not get pre-refresh payloads
+        _request_pairs_versioned.cache_clear()
+        return _request_pairs(symbol_x, symbol_y, interval, window, force_refresh=True)
+    if version_key is None:
+        return _request_pairs(symbol_x, symbol_y, interval, window)
+    return _request_pairs_versioned(symbol_x, symbol_y, interval, window, version_key)
 
 
 # ============================================================================
@@ -462,24 +778,89 @@ app.layout = dbc.Container([
 # ============================================================================
 
 @app.callback(
-    [Output('price-stats-card', 'children'),
-     Output('regression-stats-card', 'children'),
-     Output('stationarity-card', 'children'),
-     Output('alert-log', 'children'),
+    Output('data-version', 'data'),
+    [Input('interval-component', 'n_intervals'),
+     Input('symbol-x-dropdown', 'value'),
+     Input('symbol-y-dropdown', 'value'),
+     Input('interval-dropdown', 'value')],
+    [State('data-version', 'data')]
+)
+def poll_data_version(n_intervals, symbol_x, symbol_y, interval, current):
+    """
+    Poll the latest bar timestamps and publish them only when they change.
+    
+    This is the only callback on the interval tick. The analytics
+    callbacks listen to the `data-version` store instead, so idle ticks
+    (no new bars) no longer re-fetch analytics and re-render every card
+    and chart.
+    """
+    try:
+        response = requests.get(
+            f"{API_BASE}/data-version",
+            params={'symbols': f"{symbol_x},{symbol_y}", 'interval': interval},
+            timeout=5
+        )
+        latest = decode_json(response).get('latest') if response.status_code == 200 else None
+    except Exception:
+        latest = None
+    
+    # An unreachable API is a version too: the cards show the error once
+    version = {'symbols': [symbol_x, symbol_y], 'interval': interval, 'latest': latest}
+    
+    if version == current:
+        return dash.no_update
+    return version
+
+
+# Header status (text, class and dot colour) is rendered in the browser on
+# every tick: no server round trip, and data that stops arriving shows as
+# "Stale" once nothing new came in for two bars plus one poll
+app.clientside_callback(
+    """
+    function(n, status, interval, pollMs, dotStyle) {
+        if (!status) {
+            return window.dash_clientside.no_update;
+        }
+        var colors = {success: '#00ff88', warning: '#ffc107', danger: '#ff4444'};
+        var barMs = {'1s': 1000, '1m': 60000, '5m': 300000}[interval] || 60000;
+        var stale = status.level === 'success' && Date.now() - status.ts > 2 * barMs + pollMs;
+        var level = stale ? 'warning' : status.level;
+        return [
+            Object.assign({}, dotStyle, {color: colors[level]}),
+            stale ? 'Stale' : status.text,
+            'text-' + level
+        ];
+    }
+    """,
+    [Output('status-indicator', 'style'),
      Output('status-text', 'children'),
-     Output('status-text', 'className'),
+     Output('status-text', 'className')],
+    [Input('interval-component', 'n_intervals'),
+     Input('status-store', 'data')],
+    [State('interval-dropdown', 'value'),
+     State('interval-component', 'interval'),
+     State('status-indicator', 'style')]
+)
+
+
+@app.callback(
+    [Output('stats-bundle', 'children'),
+     Output('status-store', 'data'),
      Output('alerts-store', 'data'),
      Output('status-info-banner', 'children')],  # NEW: Status info banner
-    [Input('interval-component', 'n_intervals'),
+    [Input('data-version', 'data'),
      Input('refresh-btn', 'n_clicks'),
-     Input('symbol-x-dropdown', 'value'),
-     Input('symbol-y-dropdown', 'value'),
-     Input('interval-dropdown', 'value'),
      Input('window-slider', 'value'),
      Input('zscore-threshold', 'value')],
-    [State('alerts-store', 'data')]
+    # Symbol/interval changes arrive through `data-version` (poll_data_version
+    # publishes a new version for them); as Inputs here too they would run
+    # this callback twice, once still with the previous version
+    [State('symbol-x-dropdown', 'value'),
+     State('symbol-y-dropdown', 'value'),
+     State('interval-dropdown', 'value'),
+     State('alerts-store', 'data')]
 )
-def update_stats(n_intervals, n_clicks, symbol_x, symbol_y, interval, window, threshold, alerts):
+def update_stats(data_version, n_clicks, window, threshold, symbol_x, symbol_y, interval, alerts):
     """Update all statistics cards."""
     
     # Helper function to create status banner
@@ -581,60 +962,52 @@ def update_stats(n_intervals, n_clicks, symbol_x, symbol_y, interval, window, th
         ]
     
     try:
-        # Fetch pairs analytics
-        response = requests.get(
-            f"{API_BASE}/pairs",
-            params={
-                'symbol_x': symbol_x,
-                'symbol_y': symbol_y,
-                'interval': interval,
-                'window': window
-            },
-            timeout=10
+        # Fetch pairs analytics (shared with the chart tabs)
+        status_code, data = fetch_pairs_analytics(
+            symbol_x, symbol_y, interval, window, _version_key(data_version),
+            force_refresh=dash.ctx.triggered_id == 'refresh-btn'
         )
         
-        if response.status_code == 404:
+        if status_code == 404:
             # Not enough data yet
             status_banner = create_status_banner(None, "warning")
             return [
-                html.P("⏳ Collecting data...", className="text-warning"),
-                html.P("⏳ Collecting data...", className="text-warning"),
-                html.P("⏳ Collecting data...", className="text-warning"),
-                [html.P("No alerts yet", className="text-muted small")],
-                "Waiting for data",
-                "text-warning",
+                stats_patch(
+                    html.P("⏳ Collecting data...", className="text-warning"),
+                    html.P("⏳ Collecting data...", className="text-warning"),
+                    html.P("⏳ Collecting data...", className="text-warning")
+                ),
+                _status("Waiting for data", "warning"),
                 alerts if alerts else [],
                 status_banner
             ]
         
-        if response.status_code != 200:
+        if status_code != 200:
             status_banner = create_status_banner(None, "warning")
             return [
-                html.Div([
-                    html.P("❌ API Error", className="text-danger"),
-                    html.P(f"Status: {response.status_code}", className="small text-muted")
-                ]),
-                html.P(f"Status {response.status_code}", className="text-danger"),
-                html.P(f"Status {response.status_code}", className="text-danger"),
-                [],
-                "API Error",
-                "text-danger",
+                stats_patch(
+                    html.Div([
+                        html.P("❌ API Error", className="text-danger"),
+                        html.P(f"Status: {status_code}", className="small text-muted")
+                    ]),
+                    html.P(f"Status {status_code}", className="text-danger"),
+                    html.P(f"Status {status_code}", className="text-danger")
+                ),
+                _status("API Error", "danger"),
                 alerts if alerts else [],
                 status_banner
             ]
         
-        data = response.json()
-        
         # Check if we have required data
         if 'regression' not in data:
             status_banner = create_status_banner(None, "warning")
             return [
-                html.P("⏳ Computing analytics...", className="text-warning"),
-                html.P("⏳ Computing analytics...", className="text-warning"),
-                html.P("⏳ Computing analytics...", className="text-warning"),
-                [html.P("Waiting for sufficient data", className="text-muted small")],
-                "Computing",
-                "text-warning",
+                stats_patch(
+                    html.P("⏳ Computing analytics...", className="text-warning"),
+                    html.P("⏳ Computing analytics...", className="text-warning"),
+                    html.P("⏳ Computing analytics...", className="text-warning")
+                ),
+                _status("Computing", "warning"),
                 alerts if alerts else [],
                 status_banner
             ]
@@ -699,75 +1072,166 @@ def update_stats(n_intervals, n_clicks, symbol_x, symbol_y, interval, window, th
             # Compact alert message
             alert_msg = f"[{timestamp}] Z:{latest_z:.2f} > {threshold}"
             alerts.insert(0, alert_msg)
-            alerts = alerts[:20]  # Keep last 20
+        else:
+            alert_msg = None
         
-        # Compact Alerts List
-        alert_items = [
-            html.Div(alert, style={
-                'fontSize': '10px', 
-                'padding': '2px 0', 
-                'borderBottom': '1px solid rgba(255,255,255,0.05)',
-                'color': '#ffc107',
-                'whiteSpace': 'nowrap',
-                'overflow': 'hidden',
-                'textOverflow': 'ellipsis'
-            }) for alert in alerts
-        ] if alerts else [html.Div("No active alerts", style={'fontSize': '10px', 'color': '#6c757d'})]
+        stats_update = stats_patch(price_card, reg_card, stat_card)
+        
+        # Alert log mirrors alerts-store: prepend the new line (and drop the
+        # oldest past MAX_ALERTS) instead of re-sending the whole list
+        alert_log = _alert_log(stats_update)
+        if alert_msg is None:
+            if not alerts:
+                alert_log['children'] = [html.Div("No active alerts", style=_STYLE_NO_ALERTS)]
+        elif len(alerts) == 1:
+            alert_log['children'] = [_alert_item(alert_msg)]
+        else:
+            alert_log['children'].prepend(_alert_item(alert_msg))
+            if len(alerts) > MAX_ALERTS:
+                del alert_log['children'][MAX_ALERTS]
+                alerts = alerts[:MAX_ALERTS]
         
         # Create status banner with successful data
         last_update_timestamp = data.get('last_update')
         status_banner = create_status_banner(last_update_timestamp, "success")
         
-        return [price_card, reg_card, stat_card, alert_items, "Connected", "text-success", alerts, status_banner]
+        return [stats_update, _status("Connected", "success"), alerts, status_banner]
         
     except requests.Timeout:
         status_banner = create_status_banner(None, "warning")
         error_content = html.Div("⏱️ Timeout", style={'fontSize': '11px', 'color': '#ffc107'})
-        return [error_content, error_content, error_content, [], "Timeout", "text-warning", alerts if alerts else [], status_banner]
+        return [stats_patch(error_content, error_content, error_content), _status("Timeout", "warning"), alerts if alerts else [], status_banner]
     except requests.ConnectionError:
         status_banner = create_status_banner(None, "warning")
         error_content = html.Div("🔌 Error", style={'fontSize': '11px', 'color': '#ff4444'})
-        return [error_content, error_content, error_content, [], "Connection Error", "text-danger", alerts if alerts else [], status_banner]
+        return [stats_patch(error_content, error_content, error_content), _status("Connection Error", "danger"), alerts if alerts else [], status_banner]
     except Exception as e:
         status_banner = create_status_banner(None, "warning")
         error_details = str(e)[:100]
         return [
-            html.Div([
-                html.P("❌ Error", className="text-danger"),
-                html.P(error_details, className="small text-muted")
-            ]),
-            html.P(f"Error: {error_details}", className="text-danger small"),
-            html.P("See console for details", className="text-danger small"),
-            [],
-            "Error",
-            "text-danger",
+            stats_patch(
+                html.Div([
+                    html.P("❌ Error", className="text-danger"),
+                    html.P(error_details, className="small text-muted")
+                ]),
+                html.P(f"Error: {error_details}", className="text-danger small"),
+                html.P("See console for details", className="text-danger small")
+            ),
+            _status("Error", "danger"),
             alerts if alerts else [],
             status_banner
         ]
 
 
-@app.callback(
-    Output('tab-content', 'children'),
-    [Input('chart-tabs', 'active_tab'),
-     Input('interval-component', 'n_intervals'),
-     Input('symbol-x-dropdown', 'value'),
-     Input('symbol-y-dropdown', 'value'),
-     Input('interval-dropdown', 'value'),
-     Input('window-slider', 'value')]
+# Show the active pane and hide the rest in the browser: switching tabs
+# never waits for the server
+app.clientside_callback(
+    """
+    function(activeTab) {
+        return ['tab-price', 'tab-spread', 'tab-correlation', 'tab-heatmap'].map(
+            function(tab) { return {display: tab === activeTab ? 'block' : 'none'}; }
+        );
+    }
+    """,
+    [Output(f'pane-{name}', 'style') for name in _CHART_PANES],
+    Input('chart-tabs', 'active_tab')
 )
-def render_tab_content(active_tab, n_intervals, symbol_x, symbol_y, interval, window):
-    """Render the selected tab's chart."""
+
+
+_PANE_INPUTS = [
+    Input('chart-tabs', 'active_tab'),
+    Input('data-version', 'data'),
+    Input('window-slider', 'value')
+]
+
+# Symbol/interval changes arrive through `data-version` (see update_stats)
+_PANE_STATES = [
+    State('symbol-x-dropdown', 'value'),
+    State('symbol-y-dropdown', 'value'),
+    State('interval-dropdown', 'value')
+]
+
+
+def _render_pane(tab_id, render, active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key):
+    """
+    Render one chart pane lazily.
+    
+    A pane is built only while its tab is active, and only if the inputs or
+    the data version changed since it was last built. Switching back to an
+    up-to-date tab is then just the clientside display toggle: the existing
+    figure stays mounted instead of being rebuilt.
+    
+    Args:
+        tab_id: Tab this pane belongs to (e.g., "tab-price")
+        render: Zero-argument function building the pane's children
+        active_tab: Currently selected tab
+        data_version: `data-version` store value
+        window, symbol_x, symbol_y, interval: Control panel values
+        rendered_key: Key the pane was last built for (pane key store)
     
-    if active_tab == "tab-price":
-        return create_price_chart(symbol_x, symbol_y, interval)
-    elif active_tab == "tab-spread":
-        return create_spread_chart(symbol_x, symbol_y, interval, window)
-    elif active_tab == "tab-correlation":
-        return create_correlation_chart(symbol_x, symbol_y, interval, window)
-    elif active_tab == "tab-heatmap":
-        return create_heatmap_chart(interval, window)
+    Returns:
+        (children, key) for the pane's outputs, or no_update for both
+    """
+    key = [symbol_x, symbol_y, interval, window, (data_version or {}).get('latest')]
     
-    return html.P("Select a tab", className="text-muted")
+    if active_tab != tab_id or key == rendered_key:
+        return dash.no_update, dash.no_update
+    
+    return render(), key
+
+
+@app.callback(
+    [Output('pane-price', 'children'), Output('pane-price-key', 'data')],
+    _PANE_INPUTS,
+    _PANE_STATES + [State('pane-price-key', 'data')]
+)
+def render_price_pane(active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key):
+    """Render the price comparison pane."""
+    return _render_pane(
+        'tab-price', lambda: create_price_chart(symbol_x, symbol_y, interval),
+        active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key
+    )
+
+
+@app.callback(
+    [Output('pane-spread', 'children'), Output('pane-spread-key', 'data')],
+    _PANE_INPUTS,
+    _PANE_STATES + [State('pane-spread-key', 'data')]
+)
+def render_spread_pane(active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key):
+    """Render the spread & z-score pane."""
+    return _render_pane(
+        'tab-spread',
+        lambda: create_spread_chart(symbol_x, symbol_y, interval, window, _version_key(data_version)),
+        active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key
+    )
+
+
+@app.callback(
+    [Output('pane-correlation', 'children'), Output('pane-correlation-key', 'data')],
+    _PANE_INPUTS,
+    _PANE_STATES + [State('pane-correlation-key', 'data')]
+)
+def render_correlation_pane(active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key):
+    """Render the rolling correlation pane."""
+    return _render_pane(
+        'tab-correlation',
+        lambda: create_correlation_chart(symbol_x, symbol_y, interval, window, _version_key(data_version)),
+        active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key
+    )
+
+
+@app.callback(
+    [Output('pane-heatmap', 'children'), Output('pane-heatmap-key', 'data')],
+    _PANE_INPUTS,
+    _PANE_STATES + [State('pane-heatmap-key', 'data')]
+)
+def render_heatmap_pane(active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key):
+    """Render the correlation heatmap pane."""
+    return _render_pane(
+        'tab-heatmap', lambda: create_heatmap_chart(interval, window),
+        active_tab, data_version, window, symbol_x, symbol_y, interval, rendered_key
+    )
 
 
 def create_price_chart(symbol_x, symbol_y, interval):
@@ -784,8 +1248,8 @@ def create_price_chart(symbol_x, symbol_y, interval):
                 html.P("Please wait 60 seconds for initial data collection", className="text-muted text-center")
             ])
         
-        data_x = resp_x.json()
-        data_y = resp_y.json()
+        data_x = decode_json(resp_x)
+        data_y = decode_json(resp_y)
         
         # Check if bars exist and have data
         if 'bars' not in data_x or not data_x['bars']:
@@ -856,23 +1320,17 @@ def create_price_chart(symbol_x, symbol_y, interval):
         ])
 
 
-def create_spread_chart(symbol_x, symbol_y, interval, window):
+def create_spread_chart(symbol_x, symbol_y, interval, window, version_key=None):
     """Create spread & z-score chart."""
     try:
-        response = requests.get(
-            f"{API_BASE}/pairs",
-            params={'symbol_x': symbol_x, 'symbol_y': symbol_y, 'interval': interval, 'window': window},
-            timeout=5
-        )
+        status_code, data = fetch_pairs_analytics(symbol_x, symbol_y, interval, window, version_key)
         
-        if response.status_code != 200:
+        if status_code != 200:
             return html.Div([
                 html.P("⏳ Waiting for pairs analytics...", className="text-warning text-center mt-5"),
                 html.P(f"Need at least 30 aligned {interval} bars for {symbol_x} and {symbol_y}", className="text-muted text-center")
             ])
         
-        data = response.json()
-        
         # Check if we have spread data
         if 'spread' not in data or not data['spread'].get('values'):
             return html.Div([
@@ -937,16 +1395,12 @@ def create_spread_chart(symbol_x, symbol_y, interval, window):
         ])
 
 
-def create_correlation_chart(symbol_x, symbol_y, interval, window):
+def create_correlation_chart(symbol_x, symbol_y, interval, window, version_key=None):
     """Create rolling correlation chart."""
     try:
-        response = requests.get(
-            f"{API_BASE}/pairs",
-            params={'symbol_x': symbol_x, 'symbol_y': symbol_y, 'interval': interval, 'window': window}
-        )
-        data = response.json()
+        _, data = fetch_pairs_analytics(symbol_x, symbol_y, interval, window, version_key)
         
-        corr_data = data.get('correlation', {})
+        corr_data = (data or {}).get('correlation', {})
         if not corr_data:
             return html.P("No correlation data available", className="text-muted")
         
@@ -1032,7 +1486,7 @@ def handle_upload(contents, filename):
         response = requests.post(f"{API_BASE}/upload/ohlc", files=files, timeout=30)
         
         if response.status_code == 200:
-            data = response.json()
+            data = decode_json(response)
             summary = data.get('summary', {})
             
             return html.Div([
@@ -1041,7 +1495,7 @@ def handle_upload(contents, filename):
                 html.Div(f"Symbols: {', '.join(summary.get('symbols', []))}", style={'color': '#6c757d', 'fontSize': '10px'}),
             ])
         else:
-            error = response.json().get('error', 'Unknown error')
+            error = decode_json(response).get('error', 'Unknown error')
             return html.Div([
                 html.Div("❌ Upload Failed", style={'color': '#ff4444', 'fontWeight': '700', 'marginBottom': '4px'}),
                 html.Div(error, style={'color': '#ff4444', 'fontSize': '10px'})
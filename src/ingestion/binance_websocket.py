@@ -14,8 +14,9 @@ import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict
 
+import numpy as np
 import websockets
 from websockets.exceptions import WebSocketException
 
@@ -63,13 +64,17 @@ class BinanceWebSocketClient:
     
     This client manages multiple concurrent WebSocket connections,
     one per trading symbol, with automatic reconnection and error handling.
+    Each symbol's connection task is a producer that pushes normalized
+    trades into a single fan-in queue; consumers read `fanin` directly and
+    wake up once per tick regardless of how many symbols are subscribed.
     
     Attributes:
         symbols: List of trading symbols to monitor
-        queues: Dictionary mapping symbols to their data queues
-        tasks: Active asyncio tasks for each symbol
+        fanin: Shared queue receiving trades from every symbol stream
+        tasks: Active producer task for each symbol
         running: Flag indicating if client is active
-        tick_counts: Counter for received ticks per symbol
+        _idx: Fixed index of each symbol into the tick counter array
+        _counts: Received ticks per symbol (int64, indexed by _idx)
     """
 
     def __init__(self, symbols: list[str]):
@@ -80,14 +85,16 @@ class BinanceWebSocketClient:
             symbols: List of trading symbols to monitor (e.g., ["btcusdt", "ethusdt"])
         """
         self.symbols = [s.lower() for s in symbols]
-        self.queues: Dict[str, asyncio.Queue] = {}
         self.tasks: Dict[str, asyncio.Task] = {}
         self.running = False
-        self.tick_counts: Dict[str, int] = {symbol: 0 for symbol in self.symbols}
         
-        # Initialize queues for each symbol
-        for symbol in self.symbols:
-            self.queues[symbol] = asyncio.Queue(maxsize=BUFFER_SIZE)
+        # Tick counters: one array slot per symbol, fixed at construction
+        self._idx: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._counts = np.zeros(len(self.symbols), dtype=np.int64)
+        self._symbols_upper = [symbol.upper() for symbol in self.symbols]
+        
+        # Single fan-in queue shared by all symbol streams
+        self.fanin: asyncio.Queue = asyncio.Queue(maxsize=BUFFER_SIZE * len(self.symbols))
 
     async def _connect_and_consume(self, symbol: str) -> None:
         """
@@ -175,10 +182,10 @@ class BinanceWebSocketClient:
                 size=float(data["q"])
             )
             
-            # Add to queue (non-blocking, will drop if full)
+            # Add to fan-in queue (non-blocking, will drop if full)
             try:
-                self.queues[symbol].put_nowait(trade)
-                self.tick_counts[symbol] += 1
+                self.fanin.put_nowait(trade)
+                self._counts[self._idx[symbol]] += 1
             except asyncio.QueueFull:
                 logger.warning(f"Queue full for {symbol.upper()}, dropping tick")
                 
@@ -189,7 +196,8 @@ class BinanceWebSocketClient:
         """
         Start WebSocket connections for all configured symbols.
         
-        Creates an async task for each symbol's WebSocket connection.
+        Creates a producer task for each symbol's WebSocket connection;
+        trades are pushed into `fanin` as they arrive.
         """
         self.running = True
         
@@ -217,30 +225,23 @@ class BinanceWebSocketClient:
         
         logger.info("WebSocket client stopped")
 
-    async def get_next_tick(self, symbol: str, timeout: Optional[float] = None) -> Optional[TradeData]:
+    def get_tick_counts(self) -> Dict[str, int]:
         """
-        Get the next trade tick for a symbol.
+        Get the number of ticks received per symbol.
         
-        Args:
-            symbol: Trading symbol
-            timeout: Maximum time to wait for a tick (None = wait forever)
-            
         Returns:
-            TradeData object or None if timeout
+            Dictionary mapping symbols to tick counts
         """
-        try:
-            return await asyncio.wait_for(
-                self.queues[symbol].get(),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            return None
+        return dict(zip(self.symbols, self._counts.tolist()))
 
-    def get_tick_counts(self) -> Dict[str, int]:
+    def format_status(self) -> str:
         """
-        Get the number of ticks received per symbol.
+        Build the periodic status line from the tick counters.
         
         Returns:
-            Dictionary mapping symbols to tick counts
+            String like "Status - BTCUSDT: 120 ticks, ETHUSDT: 95 ticks"
         """
-        return self.tick_counts.copy()
+        return "Status - " + ", ".join(
+            f"{symbol}: {count} ticks"
+            for symbol, count in zip(self._symbols_upper, self._counts.tolist())
+        )
@@ -5,13 +5,16 @@ This module provides async database operations with SQLite,
 including tick storage, OHLC persistence, and batch insert optimization.
 """
 
+import asyncio
 import logging
 import os
+from itertools import chain
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import aiosqlite
+import numpy as np
 
 from ..ingestion.binance_websocket import TradeData
 from ..analytics.models import OHLCData
@@ -19,6 +22,62 @@ from ..config import TICK_BATCH_SIZE, TICK_BATCH_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# Applied to every connection at open time
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",   # 256 MB memory-mapped I/O
+    "PRAGMA cache_size=-65536",     # 64 MB page cache (negative = KiB)
+    "PRAGMA busy_timeout=5000",     # 5 s
+)
+
+# Subset that is valid on a read-only connection (no journal/sync changes)
+SQLITE_READ_ONLY_PRAGMAS = SQLITE_PRAGMAS[2:]
+
+# Prepared statements kept per connection (sqlite3 default: 128). Query
+# texts are fixed (LIMIT is a bound parameter), so repeated reads reuse
+# the compiled statement instead of re-parsing and re-planning it.
+SQLITE_CACHED_STATEMENTS = 256
+
+# Column dtypes for columnar OHLC reads (get_ohlc_arrays)
+OHLC_COLUMN_DTYPES = {
+    'timestamp': 'datetime64[us]',
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+    'trade_count': np.int32,
+}
+
+
+def select_ohlc_window(
+    timestamps: np.ndarray,
+    *columns: np.ndarray,
+    start: datetime,
+    limit: Optional[int] = None
+) -> Tuple[np.ndarray, ...]:
+    """
+    In-memory equivalent of the range + LIMIT selection used by the OHLC reads.
+    
+    Applies `timestamp >= start ORDER BY timestamp ASC LIMIT limit` to
+    columnar arrays that are already sorted by timestamp (e.g. a wider
+    price panel fetched once and shared by several analyses).
+    
+    Args:
+        timestamps: Bar timestamps (datetime64, ascending)
+        *columns: Arrays aligned with timestamps (e.g. closes)
+        start: First timestamp to keep (inclusive)
+        limit: Maximum number of bars to keep (optional)
+    
+    Returns:
+        (timestamps, *columns) sliced to the selection (views, no copies)
+    """
+    i = int(np.searchsorted(timestamps, np.datetime64(start, 'us'), side='left'))
+    j = None if limit is None else i + limit
+    return (timestamps[i:j],) + tuple(column[i:j] for column in columns)
+
 
 class DatabaseManager:
     """
@@ -28,25 +87,40 @@ class DatabaseManager:
     for ticks and OHLC data, and implements batch insert buffering for
     high-throughput write performance.
     
+    A background writer task owns tick persistence on the ingest path:
+    producers call enqueue_tick() (no await, no thread hop) and the writer
+    coalesces everything queued into one executemany per transaction.
+    
+    A read-only manager (read_only=True) opens the file with mode=ro, skips
+    schema creation and the writer task, and is meant for analytics workers
+    reading alongside the ingest process under WAL.
+    
     Attributes:
         db_path: Path to SQLite database file
+        read_only: Open the database read-only (query methods only)
         conn: Active database connection (None when closed)
         tick_buffer: In-memory buffer for batching tick inserts
         last_flush: Timestamp of last batch flush
     """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, read_only: bool = False):
         """
         Initialize database manager.
         
         Args:
             db_path: Path to SQLite database file (created if doesn't exist)
+            read_only: Open an existing database read-only (no writes, no writer task)
         """
         self.db_path = db_path
+        self.read_only = read_only
         self.conn: Optional[aiosqlite.Connection] = None
         self.tick_buffer: List[TradeData] = []
         self.last_flush: datetime = datetime.now()
         
+        # Background writer (started in initialize)
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
         # Ensure data directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     
@@ -58,14 +132,37 @@ class DatabaseManager:
         Safe to call multiple times (idempotent).
         """
         try:
-            self.conn = await aiosqlite.connect(self.db_path)
+            if self.read_only:
+                # Reader alongside the ingest writer: WAL lets it see committed
+                # data without ever taking the write lock
+                uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+                self.conn = await aiosqlite.connect(
+                    uri, uri=True, cached_statements=SQLITE_CACHED_STATEMENTS
+                )
+                for pragma in SQLITE_READ_ONLY_PRAGMAS:
+                    await self.conn.execute(pragma)
+                
+                logger.info(f"Database opened read-only: {self.db_path}")
+                return
+            
+            self.conn = await aiosqlite.connect(
+                self.db_path, cached_statements=SQLITE_CACHED_STATEMENTS
+            )
             
-            # Enable WAL mode for better concurrent access
-            await self.conn.execute("PRAGMA journal_mode=WAL")
+            # Connection tuning (must run before any writes)
+            # - WAL: readers (analytics, API) proceed concurrently with the writer
+            # - synchronous=NORMAL: safe with WAL, fsync only at checkpoints
+            # - busy_timeout: wait for locks instead of failing with SQLITE_BUSY
+            for pragma in SQLITE_PRAGMAS:
+                await self.conn.execute(pragma)
             
             # Create tables
             await self._create_tables()
             
+            # Start background tick writer
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer_loop())
+            
             logger.info(f"Database initialized: {self.db_path}")
             
         except Exception as e:
@@ -144,6 +241,75 @@ class DatabaseManager:
         if buffer_full or timeout_reached:
             await self._flush_ticks()
     
+    def enqueue_tick(self, tick: TradeData) -> None:
+        """
+        Queue a tick for the background writer.
+        
+        Non-blocking: the tick is persisted with whatever else is queued
+        in the writer's next transaction.
+        
+        Args:
+            tick: Trade data to insert
+        """
+        self._write_queue.put_nowait(tick)
+    
+    async def _writer_loop(self) -> None:
+        """
+        Drain the write queue, persisting each burst in one transaction.
+        
+        Waits for the first tick, then coalesces every tick already queued
+        so the aiosqlite thread hop is paid once per burst, not per tick.
+        A None item (sent by close()) stops the loop after a final write.
+        """
+        while True:
+            tick = await self._write_queue.get()
+            if tick is None:
+                return
+            
+            batch = [tick]
+            stop = False
+            while True:
+                try:
+                    item = self._write_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            await self.insert_ticks_batch(batch)
+            
+            if stop:
+                return
+    
+    async def insert_ticks_batch(self, ticks: List[TradeData]) -> None:
+        """
+        Insert a batch of ticks in a single transaction.
+        
+        Bypasses the insert_tick buffer - the caller has already batched.
+        
+        Args:
+            ticks: Trade data to insert
+        """
+        if not ticks:
+            return
+        
+        try:
+            await self.conn.executemany(
+                "INSERT INTO ticks (symbol, timestamp, price, size) VALUES (?, ?, ?, ?)",
+                [
+                    (tick.symbol, tick.timestamp.isoformat(), tick.price, tick.size)
+                    for tick in ticks
+                ]
+            )
+            await self.conn.commit()
+            
+            logger.debug("Inserted batch of %d ticks", len(ticks))
+            
+        except Exception as e:
+            logger.error(f"Failed to insert tick batch: {e}")
+    
     async def _flush_ticks(self) -> None:
         """Flush buffered ticks to database in a single transaction."""
         if not self.tick_buffer:
@@ -163,7 +329,7 @@ class DatabaseManager:
             )
             await self.conn.commit()
             
-            logger.debug(f"Flushed {len(self.tick_buffer)} ticks to database")
+            logger.debug("Flushed %d ticks to database", len(self.tick_buffer))
             
             # Clear buffer
             self.tick_buffer.clear()
@@ -206,11 +372,66 @@ class DatabaseManager:
             )
             await self.conn.commit()
             
-            logger.debug(f"Inserted OHLC: {symbol} {interval} @ {ohlc.timestamp}")
+            logger.debug("Inserted OHLC: %s %s @ %s", symbol, interval, ohlc.timestamp)
             
         except Exception as e:
             logger.error(f"Failed to insert OHLC: {e}")
     
+    async def insert_ohlc_many(self, bars: List[OHLCData]) -> None:
+        """
+        Insert many OHLC bars in a single transaction.
+        
+        Uses one executemany() and one commit instead of a commit per bar,
+        which is where most of the per-bar write cost goes.
+        
+        Args:
+            bars: OHLC bars to insert (symbol/interval taken from each bar)
+        """
+        await self.insert_ohlc_rows([
+            (
+                bar.symbol,
+                bar.interval,
+                bar.timestamp.isoformat(),
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.volume,
+                bar.trade_count
+            )
+            for bar in bars
+        ])
+    
+    async def insert_ohlc_rows(self, rows: Sequence[Tuple]) -> None:
+        """
+        Insert many OHLC rows, given as plain tuples, in a single transaction.
+        
+        For bulk loads that already have column data (e.g. a parsed CSV)
+        and need no OHLCData objects.
+        
+        Args:
+            rows: (symbol, interval, timestamp ISO string, open, high, low,
+                close, volume, trade_count) tuples
+        """
+        if not rows:
+            return
+        
+        try:
+            await self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO ohlc 
+                (symbol, interval, timestamp, open, high, low, close, volume, trade_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            await self.conn.commit()
+            
+            logger.debug("Inserted %d OHLC bars", len(rows))
+            
+        except Exception as e:
+            logger.error(f"Failed to insert OHLC batch: {e}")
+    
     async def get_ticks(
         self,
         symbol: str,
@@ -238,13 +459,12 @@ class DatabaseManager:
                 ORDER BY timestamp ASC
             """
             
+            params = (symbol, start.isoformat(), end.isoformat())
             if limit:
-                query += f" LIMIT {limit}"
+                query += " LIMIT ?"
+                params += (limit,)
             
-            async with self.conn.execute(
-                query,
-                (symbol, start.isoformat(), end.isoformat())
-            ) as cursor:
+            async with self.conn.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
             
             # Convert to TradeData objects
@@ -293,13 +513,12 @@ class DatabaseManager:
                 ORDER BY timestamp ASC
             """
             
+            params = (symbol, interval, start.isoformat(), end.isoformat())
             if limit:
-                query += f" LIMIT {limit}"
+                query += " LIMIT ?"
+                params += (limit,)
             
-            async with self.conn.execute(
-                query,
-                (symbol, interval, start.isoformat(), end.isoformat())
-            ) as cursor:
+            async with self.conn.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
             
             # Convert to OHLCData objects
@@ -324,6 +543,271 @@ class DatabaseManager:
             logger.error(f"Failed to query OHLC: {e}")
             return []
     
+    async def get_ohlc_arrays(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        limit: Optional[int] = None,
+        columns: Sequence[str] = ('timestamp', 'close', 'volume')
+    ) -> Dict[str, np.ndarray]:
+        """
+        Query OHLC bars as contiguous NumPy columns (structure-of-arrays).
+        
+        Same selection as get_ohlc(), but skips building an OHLCData object
+        per row: only the requested columns are read, and each is converted
+        once into a typed array ready for vectorized reductions.
+        
+        Args:
+            symbol: Trading symbol to query
+            interval: Time interval (e.g., '1s', '1m', '5m')
+            start: Start of time range (inclusive)
+            end: End of time range (inclusive)
+            limit: Maximum number of bars to return (optional)
+            columns: Columns to fetch, any of OHLC_COLUMN_DTYPES
+                ('timestamp' is datetime64[us], 'trade_count' is int32,
+                prices/volume are float64)
+        
+        Returns:
+            Dictionary mapping each requested column to its array, ordered
+            by timestamp ascending. Arrays are empty if no bars match or
+            the query fails.
+        
+        Raises:
+            ValueError: If an unknown column is requested
+        """
+        unknown = [c for c in columns if c not in OHLC_COLUMN_DTYPES]
+        if unknown:
+            raise ValueError(f"Unknown OHLC columns: {unknown}")
+        
+        try:
+            query = f"""
+                SELECT {', '.join(columns)}
+                FROM ohlc
+                WHERE symbol = ? AND interval = ? AND timestamp BETWEEN ? AND ?
+                ORDER BY timestamp ASC
+            """
+            
+            params = (symbol, interval, start.isoformat(), end.isoformat())
+            if limit:
+                query += " LIMIT ?"
+                params += (limit,)
+            
+            async with self.conn.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Failed to query OHLC arrays: {e}")
+            rows = []
+        
+        # Transpose rows into columns in C, then convert each column once
+        # (fromiter with an exact count fills a preallocated buffer)
+        values = zip(*rows) if rows else [()] * len(columns)
+        
+        return {
+            column: np.fromiter(column_values, dtype=OHLC_COLUMN_DTYPES[column], count=len(rows))
+            for column, column_values in zip(columns, values)
+        }
+    
+    async def get_ohlc_closes(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Query bar timestamps and close prices as two aligned arrays.
+        
+        Convenience wrapper over get_ohlc_arrays() for the common
+        "price series" read used by correlation/regression.
+        
+        Args:
+            symbol: Trading symbol to query
+            interval: Time interval (e.g., '1s', '1m', '5m')
+            start: Start of time range (inclusive)
+            end: End of time range (inclusive)
+            limit: Maximum number of bars to return (optional)
+        
+        Returns:
+            (timestamps datetime64[us], closes float64), ordered by
+            timestamp ascending; both empty if no bars match
+        """
+        arrays = await self.get_ohlc_arrays(
+            symbol, interval, start, end, limit=limit, columns=('timestamp', 'close')
+        )
+        return arrays['timestamp'], arrays['close']
+    
+    async def get_ohlc_close_volume(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Query bar close prices and volumes as two aligned float64 arrays.
+        
+        Same selection as get_ohlc(). Both numeric columns are read in one
+        query and decoded with a single np.fromiter pass over the flattened
+        rows (no per-row objects, no per-column transpose).
+        
+        Args:
+            symbol: Trading symbol to query
+            interval: Time interval (e.g., '1s', '1m', '5m')
+            start: Start of time range (inclusive)
+            end: End of time range (inclusive)
+            limit: Maximum number of bars to return (optional)
+        
+        Returns:
+            (closes float64, volumes float64), ordered by timestamp
+            ascending; both empty if no bars match or the query fails
+        """
+        try:
+            query = """
+                SELECT close, volume
+                FROM ohlc
+                WHERE symbol = ? AND interval = ? AND timestamp BETWEEN ? AND ?
+                ORDER BY timestamp ASC
+            """
+            
+            params = (symbol, interval, start.isoformat(), end.isoformat())
+            if limit:
+                query += " LIMIT ?"
+                params += (limit,)
+            
+            async with self.conn.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Failed to query OHLC close/volume: {e}")
+            rows = []
+        
+        values = np.fromiter(
+            chain.from_iterable(rows), dtype=np.float64, count=2 * len(rows)
+        ).reshape(-1, 2)
+        
+        # Contiguous columns for the vectorized reductions downstream
+        return np.ascontiguousarray(values[:, 0]), np.ascontiguousarray(values[:, 1])
+    
+    async def count_ohlc(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Count the bars get_ohlc() would return, without reading them.
+        
+        Answered from idx_ohlc_symbol_interval_timestamp alone, so callers
+        can reject too-short windows before fetching any rows.
+        
+        Args:
+            symbol: Trading symbol to query
+            interval: Time interval (e.g., '1s', '1m', '5m')
+            start: Start of time range (inclusive)
+            end: End of time range (inclusive)
+            limit: Stop counting at this many bars (optional)
+        
+        Returns:
+            Number of matching bars (at most limit), or 0 if the query fails
+        """
+        try:
+            query = """
+                SELECT 1
+                FROM ohlc
+                WHERE symbol = ? AND interval = ? AND timestamp BETWEEN ? AND ?
+            """
+            
+            params = (symbol, interval, start.isoformat(), end.isoformat())
+            if limit:
+                query += " LIMIT ?"
+                params += (limit,)
+            
+            async with self.conn.execute(f"SELECT COUNT(*) FROM ({query})", params) as cursor:
+                row = await cursor.fetchone()
+            
+            return row[0] if row else 0
+            
+        except Exception as e:
+            logger.error(f"Failed to count OHLC bars: {e}")
+            return 0
+    
+    async def get_ohlc_multi(
+        self,
+        symbols: Sequence[str],
+        interval: str,
+        start: datetime,
+        end: datetime,
+        columns: Sequence[str] = tuple(OHLC_COLUMN_DTYPES)
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Query OHLC columns for several symbols in a single round trip.
+        
+        Issues one `symbol IN (...)` query ordered by symbol, timestamp and
+        partitions the rows per symbol in one pass.
+        
+        Args:
+            symbols: Trading symbols to query
+            interval: Time interval (e.g., '1s', '1m', '5m')
+            start: Start of time range (inclusive)
+            end: End of time range (inclusive)
+            columns: Columns to fetch (see get_ohlc_arrays)
+        
+        Returns:
+            {symbol: {column: array}} for every requested symbol, with the
+            same dtypes as get_ohlc_arrays(). Arrays are empty for symbols
+            without bars (or if the query fails).
+        
+        Raises:
+            ValueError: If an unknown column is requested
+        """
+        unknown = [c for c in columns if c not in OHLC_COLUMN_DTYPES]
+        if unknown:
+            raise ValueError(f"Unknown OHLC columns: {unknown}")
+        
+        symbols = list(symbols)
+        rows_by_symbol: Dict[str, List[tuple]] = {symbol: [] for symbol in symbols}
+        
+        if symbols:
+            try:
+                placeholders = ', '.join('?' * len(symbols))
+                query = f"""
+                    SELECT symbol, {', '.join(columns)}
+                    FROM ohlc
+                    WHERE interval = ? AND symbol IN ({placeholders})
+                      AND timestamp BETWEEN ? AND ?
+                    ORDER BY symbol, timestamp ASC
+                """
+                
+                async with self.conn.execute(
+                    query,
+                    (interval, *symbols, start.isoformat(), end.isoformat())
+                ) as cursor:
+                    rows = await cursor.fetchall()
+                
+                # Partition rows per symbol (single pass)
+                for row in rows:
+                    rows_by_symbol[row[0]].append(row[1:])
+                
+            except Exception as e:
+                logger.error(f"Failed to query OHLC for {symbols}: {e}")
+        
+        result: Dict[str, Dict[str, np.ndarray]] = {}
+        for symbol, rows in rows_by_symbol.items():
+            values = zip(*rows) if rows else [()] * len(columns)
+            result[symbol] = {
+                column: np.fromiter(column_values, dtype=OHLC_COLUMN_DTYPES[column], count=len(rows))
+                for column, column_values in zip(columns, values)
+            }
+        
+        return result
+    
     async def get_latest_price(self, symbol: str) -> Optional[float]:
         """
         Get the most recent tick price for a symbol.
@@ -349,16 +833,50 @@ class DatabaseManager:
             logger.error(f"Failed to get latest price: {e}")
             return None
     
+    async def get_latest_timestamp(self, symbol: str, interval: str) -> Optional[datetime]:
+        """
+        Get the timestamp of the most recent OHLC bar for a symbol/interval.
+        
+        Single index lookup (idx_ohlc_symbol_interval_timestamp); used as a
+        cheap "has new data arrived?" check by the analytics cache.
+        
+        Args:
+            symbol: Trading symbol
+            interval: Time interval (e.g., '1m')
+        
+        Returns:
+            Latest bar timestamp, or None if no bars exist
+        """
+        try:
+            async with self.conn.execute(
+                "SELECT MAX(timestamp) FROM ohlc WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            ) as cursor:
+                row = await cursor.fetchone()
+            
+            return datetime.fromisoformat(row[0]) if row and row[0] else None
+            
+        except Exception as e:
+            logger.error(f"Failed to get latest timestamp: {e}")
+            return None
+    
     async def close(self) -> None:
         """
         Close database connection.
         
-        Flushes any remaining buffered ticks before closing.
+        Flushes any remaining buffered ticks and drains the background
+        writer before closing.
         """
         try:
             # Flush remaining ticks
             await self._flush_ticks()
             
+            # Stop writer after it drains everything queued so far
+            if self._writer_task:
+                self._write_queue.put_nowait(None)
+                await self._writer_task
+                self._writer_task = None
+            
             # Close connection
             if self.conn:
                 await self.conn.close()